@@ -0,0 +1,103 @@
+"""
+Token authentication with a cached token-to-user lookup.
+
+DRF's TokenAuthentication joins Token and User on every request. Here the
+resolved user is cached in the 'shared' cache alias for AUTH_TOKEN_CACHE_TTL
+seconds under a hash of the key, so most API calls authenticate without
+touching the database. Every login issues a token for that client (see
+ExpiringToken), and logout and rotation only replace the presented token, so
+other devices stay signed in. Tokens expire AUTH_TOKEN_TTL_HOURS after issue;
+logout, rotation and any save of the user drop the cached entry in every
+worker.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from collection.caching import VERSION_CACHE_ALIAS
+
+from .models import ExpiringToken
+
+# Oldest tokens beyond this are revoked when a user signs in on another client
+MAX_TOKENS_PER_USER = 20
+
+
+def _cache():
+    # Shared by every worker, so a revoked key stops working everywhere at once
+    return caches[VERSION_CACHE_ALIAS]
+
+
+def _cache_key(key):
+    return f'auth-token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def invalidate_token(key):
+    _cache().delete(_cache_key(key))
+
+
+def invalidate_user_tokens(user_id):
+    for key in ExpiringToken.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+def revoke_token(token):
+    invalidate_token(token.key)
+    token.delete()
+
+
+def issue_token(user):
+    """A new token for one client, dropping the user's expired and surplus tokens"""
+    token = ExpiringToken.objects.create(user=user)
+    expired_before = timezone.now() - timedelta(hours=settings.AUTH_TOKEN_TTL_HOURS)
+    stale = ExpiringToken.objects.filter(user=user, created__lte=expired_before).values_list('key', flat=True)
+    surplus = (
+        ExpiringToken.objects.filter(user=user).order_by('-created')
+        .values_list('key', flat=True)[MAX_TOKENS_PER_USER:]
+    )
+    for key in {*stale, *surplus}:
+        invalidate_token(key)
+        ExpiringToken.objects.filter(key=key).delete()
+    return token
+
+
+def rotate_token(key):
+    """Replace the presented token with a new one for the same client"""
+    token = ExpiringToken.objects.select_related('user').get(key=key)
+    revoke_token(token)
+    return ExpiringToken.objects.create(user=token.user)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    model = ExpiringToken
+
+    def authenticate_credentials(self, key):
+        cache_key = _cache_key(key)
+        cached = _cache().get(cache_key)
+        if cached is not None:
+            user, expires_at = cached
+            if expires_at > timezone.now():
+                return (user, key)
+            _cache().delete(cache_key)
+
+        try:
+            token = self.get_model().objects.select_related('user').get(key=key)
+        except self.get_model().DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        if token.is_expired:
+            token.delete()
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+
+        remaining = int((token.expires_at - timezone.now()).total_seconds())
+        _cache().set(cache_key, (token.user, token.expires_at), max(1, min(settings.AUTH_TOKEN_CACHE_TTL, remaining)))
+        # request.auth is the key rather than the Token instance, so cache hits and misses look the same
+        return (token.user, key)
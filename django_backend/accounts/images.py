@@ -0,0 +1,125 @@
+"""
+Profile picture processing.
+
+An upload is decoded once with Pillow, rotated upright from its EXIF
+orientation and re-encoded without any metadata. The result is stored as a
+bounded-size JPEG plus fixed-size square WebP and JPEG thumbnails. All files
+are named after the hash of the uploaded bytes, so their URLs never change
+content and can be cached forever (see tcg_backend.urls). Files from previous
+uploads are deleted once the new set is stored.
+"""
+import hashlib
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+PROFILE_PICTURE_DIR = 'profile_pictures'
+MAX_ORIGINAL_SIZE = 1024
+THUMBNAIL_SIZES = {
+    'small': 64,
+    'medium': 256,
+}
+# format -> (Pillow format, file extension, encoder options)
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+
+class ProfilePictureError(ValueError):
+    pass
+
+
+def user_directory(user_id):
+    return f'{PROFILE_PICTURE_DIR}/user_{user_id}'
+
+
+def _encode(image, image_format):
+    pillow_format, _, options = FORMATS[image_format]
+    buffer = BytesIO()
+    # No exif/icc arguments: the encoded file carries no metadata
+    image.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def _store(name, content):
+    # Content-addressed, so an existing file already has these bytes
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    return name
+
+
+def _open(upload):
+    try:
+        image = Image.open(upload)
+        image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ProfilePictureError('Upload a valid image file.') from e
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        # JPEG has no alpha channel: flatten onto white
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image.convert('RGBA'), mask=image.convert('RGBA').getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def process_profile_picture(user, upload):
+    """
+    Store `upload` for `user` and return (original name, thumbnails dict) where
+    thumbnails maps size -> format -> storage name. Does not save the user.
+    """
+    hasher = hashlib.sha256()
+    for chunk in upload.chunks():
+        hasher.update(chunk)
+    digest = hasher.hexdigest()[:20]
+    upload.seek(0)
+
+    image = _open(upload)
+    directory = user_directory(user.pk)
+
+    original = image.copy()
+    original.thumbnail((MAX_ORIGINAL_SIZE, MAX_ORIGINAL_SIZE), Image.LANCZOS)
+    original_name = _store(f'{directory}/{digest}.jpg', _encode(original, 'jpeg'))
+
+    thumbnails = {}
+    for size_name, size in THUMBNAIL_SIZES.items():
+        square = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        thumbnails[size_name] = {
+            image_format: _store(f'{directory}/{digest}_{size}.{extension}', _encode(square, image_format))
+            for image_format, (_, extension, _) in FORMATS.items()
+        }
+
+    return original_name, thumbnails
+
+
+def collect_garbage(user, keep):
+    """Delete the user's stored pictures other than the names in `keep`"""
+    directory = user_directory(user.pk)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    for filename in files:
+        name = posixpath.join(directory, filename)
+        if name not in keep:
+            default_storage.delete(name)
+            removed += 1
+    return removed
+
+
+def thumbnail_urls(user, request=None):
+    """Public URLs of the user's thumbnails: {size: {format: url}}"""
+    def url(name):
+        location = default_storage.url(name)
+        return request.build_absolute_uri(location) if request is not None else location
+
+    return {
+        size_name: {image_format: url(name) for image_format, name in formats.items()}
+        for size_name, formats in (user.profile_thumbnails or {}).items()
+    }
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_profile_picture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='shared_snapshot_max_age',
+            field=models.PositiveIntegerField(default=60),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_tokens(apps, schema_editor):
+    # Issued tokens keep working after the switch from DRF's one-per-user table
+    Token = apps.get_model('authtoken', 'Token')
+    ExpiringToken = apps.get_model('accounts', 'ExpiringToken')
+    tokens = list(Token.objects.values_list('key', 'user_id', 'created'))
+    ExpiringToken.objects.bulk_create(ExpiringToken(key=key, user_id=user_id) for key, user_id, _ in tokens)
+    # auto_now_add overwrote `created` on insert; restore it so expiry still counts from issue
+    for key, _, created in tokens:
+        ExpiringToken.objects.filter(key=key).update(created=created)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authtoken', '0003_tokenproxy'),
+        ('accounts', '0005_user_profile_thumbnails'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='ExpiringToken',
+        ),
+        migrations.CreateModel(
+            name='ExpiringToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'created'], name='token_user_created_idx')],
+            },
+        ),
+        migrations.RunPython(copy_tokens, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,13 @@
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.utils import timezone
+
+# Longest a user may let public dashboard snapshots go stale (seconds)
+SHARED_SNAPSHOT_MAX_AGE_LIMIT = 60 * 60 * 24
 
 def user_profile_picture_path(instance, filename):
     # File will be uploaded to MEDIA_ROOT/profile_pictures/user_<id>/<filename>
@@ -15,6 +23,10 @@ class User(AbstractUser):
         blank=True,
         default=None
     )
+    # Processed thumbnails, {size: {format: storage name}}; see accounts.images
+    profile_thumbnails = models.JSONField(default=dict, blank=True)
+    # Seconds a public shared-dashboard snapshot is served without revalidation
+    shared_snapshot_max_age = models.PositiveIntegerField(default=60)
     
     # Add custom related_name to avoid clashes
     groups = models.ManyToManyField(
@@ -38,3 +50,37 @@ class User(AbstractUser):
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
+
+
+class ExpiringToken(models.Model):
+    """
+    API token for one signed-in client; a user holds one per login, so logging
+    out or rotating on one device leaves the others signed in. Expires
+    AUTH_TOKEN_TTL_HOURS after it was issued.
+    """
+    key = models.CharField(max_length=40, primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='api_tokens')
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'created'], name='token_user_created_idx')]
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = self.generate_key()
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def generate_key():
+        return secrets.token_hex(20)
+
+    @property
+    def expires_at(self):
+        return self.created + timedelta(hours=settings.AUTH_TOKEN_TTL_HOURS)
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def __str__(self):
+        return f"{self.user.email} - {self.key[:8]}"
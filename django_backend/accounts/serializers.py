@@ -2,7 +2,8 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from accounts.models import User
+from accounts.models import SHARED_SNAPSHOT_MAX_AGE_LIMIT, User
+from accounts.images import ProfilePictureError, collect_garbage, process_profile_picture, thumbnail_urls
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -56,6 +57,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(read_only=True)
     date_joined = serializers.DateTimeField(read_only=True)
     profile_picture = serializers.ImageField(required=False, allow_null=True)
+    profile_thumbnails = serializers.SerializerMethodField()
+    shared_snapshot_max_age = serializers.IntegerField(
+        required=False, min_value=0, max_value=SHARED_SNAPSHOT_MAX_AGE_LIMIT,
+    )
     
     class Meta:
         model = User
@@ -67,6 +72,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'date_joined',
             'is_active',
             'profile_picture',
+            'profile_thumbnails',
+            'shared_snapshot_max_age',
         ]
         read_only_fields = ['id', 'email', 'date_joined', 'is_active']
     
@@ -74,11 +81,17 @@ class UserProfileSerializer(serializers.ModelSerializer):
         # Handle profile picture separately as it comes from request.FILES
         profile_picture = self.context['request'].FILES.get('profile_picture')
         if profile_picture:
-            instance.profile_picture = profile_picture
+            try:
+                original_name, thumbnails = process_profile_picture(instance, profile_picture)
+            except ProfilePictureError as e:
+                raise serializers.ValidationError({'profile_picture': [str(e)]})
+            instance.profile_picture.name = original_name
+            instance.profile_thumbnails = thumbnails
         
         # Update the basic user fields
         instance.first_name = validated_data.get('first_name', instance.first_name)
         instance.last_name = validated_data.get('last_name', instance.last_name)
+        instance.shared_snapshot_max_age = validated_data.get('shared_snapshot_max_age', instance.shared_snapshot_max_age)
         
         # Handle password change if provided
         password = validated_data.get('password')
@@ -86,4 +99,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
             instance.set_password(password)
         
         instance.save()
+        if profile_picture:
+            keep = {original_name, *(name for formats in thumbnails.values() for name in formats.values())}
+            collect_garbage(instance, keep)
         return instance
+
+    def get_profile_thumbnails(self, obj):
+        return thumbnail_urls(obj, self.context.get('request'))
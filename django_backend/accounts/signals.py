@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from collection.caching import bump_user_cache_version
+
+from .authentication import invalidate_user_tokens
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, raw=False, **kwargs):
+    # Cached authentication holds a copy of the user; drop it after profile,
+    # password or is_active changes
+    if not created and not raw:
+        invalidate_user_tokens(instance.pk)
+        # Dashboards embed the user's name and thumbnails
+        bump_user_cache_version(instance.pk)
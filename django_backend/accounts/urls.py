@@ -5,7 +5,8 @@ from .views import (
     LoginView, 
     RegisterView, 
     ProfileView,
-    LogoutView
+    LogoutView,
+    TokenRefreshView
 )
 
 urlpatterns = [
@@ -13,4 +14,5 @@ urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('profile/', ProfileView.as_view(), name='profile'),
     path('logout/', LogoutView.as_view(), name='logout'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
 ]
@@ -1,13 +1,12 @@
 from rest_framework import status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.authtoken.models import Token
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication, issue_token, revoke_token, rotate_token
 from django.contrib.auth import authenticate, login, logout
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from .serializers import UserSerializer, LoginSerializer, UserProfileSerializer, RegisterSerializer
-from .models import User
+from .models import ExpiringToken, User
 
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -17,9 +16,10 @@ class RegisterView(APIView):
         if serializer.is_valid():
             user = serializer.save()
             if user:
-                token, created = Token.objects.get_or_create(user=user)
+                token = issue_token(user)
                 return Response({
                     'token': token.key,
+                    'expires_at': token.expires_at,
                     'user': UserSerializer(user).data
                 }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -35,10 +35,13 @@ class LoginView(APIView):
                 password=serializer.validated_data['password']
             )
             if user:
-                token, created = Token.objects.get_or_create(user=user)
-                login(request, user)
+                token = issue_token(user)
+                # Token clients don't need a session; browsers using the admin can ask for one
+                if settings.AUTH_LOGIN_CREATES_SESSION or request.data.get('session'):
+                    login(request, user)
                 return Response({
                     'token': token.key,
+                    'expires_at': token.expires_at,
                     'user': UserSerializer(user).data
                 }, status=status.HTTP_200_OK)
         return Response(
@@ -49,7 +52,7 @@ class LoginView(APIView):
 from rest_framework.parsers import MultiPartParser, JSONParser
 
 class ProfileView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, JSONParser]
     
@@ -75,14 +78,29 @@ class ProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class LogoutView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
-        # Delete the token to force a new login
-        request.user.auth_token.delete()
-        logout(request)
+        # Delete the token (and its cached lookup) to force a new login
+        token = ExpiringToken.objects.filter(key=request.auth).first()
+        if token is not None:
+            revoke_token(token)
+        if request.session.session_key:
+            logout(request)
         return Response(
             {'message': 'Successfully logged out'}, 
             status=status.HTTP_200_OK
         )
+
+class TokenRefreshView(APIView):
+    """Exchange the presented token for a new one; the old key stops working immediately"""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        token = rotate_token(request.auth)
+        return Response({
+            'token': token.key,
+            'expires_at': token.expires_at,
+        }, status=status.HTTP_200_OK)
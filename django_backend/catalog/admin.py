@@ -0,0 +1,33 @@
+from django.contrib import admin
+from .models import Serie, CardSet, Card, CardPrice, CardImage
+
+@admin.register(Serie)
+class SerieAdmin(admin.ModelAdmin):
+    list_display = ['serie_id', 'language', 'name']
+    list_filter = ['language']
+    search_fields = ['serie_id', 'name']
+
+@admin.register(CardSet)
+class CardSetAdmin(admin.ModelAdmin):
+    list_display = ['set_id', 'language', 'name', 'card_count_total', 'release_date']
+    list_filter = ['language']
+    search_fields = ['set_id', 'name']
+
+@admin.register(Card)
+class CardAdmin(admin.ModelAdmin):
+    list_display = ['card_id', 'language', 'name', 'rarity', 'category']
+    list_filter = ['language', 'category']
+    search_fields = ['card_id', 'name']
+    raw_id_fields = ['card_set']
+
+@admin.register(CardPrice)
+class CardPriceAdmin(admin.ModelAdmin):
+    list_display = ['card_id', 'variant', 'condition', 'language', 'date', 'price', 'currency']
+    list_filter = ['currency', 'variant', 'condition', 'date']
+    search_fields = ['card_id']
+
+@admin.register(CardImage)
+class CardImageAdmin(admin.ModelAdmin):
+    list_display = ['card_id', 'language', 'digest', 'fetched_at']
+    list_filter = ['language']
+    search_fields = ['card_id', 'digest']
@@ -0,0 +1,43 @@
+"""
+Batch card lookup for list pages.
+
+`?expand=card` on collection, wishlist and note lists embeds each row's
+catalog card, and `catalog/cards/batch/?ids=` returns many cards at once.
+Both resolve every id on the page with one query against the local catalog,
+preferring the requested language and falling back to the default one.
+"""
+from django.conf import settings
+
+from .models import Card
+from .serializers import CardSerializer
+
+MAX_BATCH_IDS = 250
+
+
+def expand_requested(request, field='card'):
+    return field in request.query_params.get('expand', '').split(',')
+
+
+def hydrate_cards(card_ids, language=None):
+    """Serialized cards keyed by card id; ids missing from the catalog are absent"""
+    card_ids = list(dict.fromkeys(card_id for card_id in card_ids if card_id))[:MAX_BATCH_IDS]
+    if not card_ids:
+        return {}
+    languages = {settings.CATALOG_DEFAULT_LANGUAGE, language or settings.CATALOG_DEFAULT_LANGUAGE}
+    cards = {}
+    for card in Card.objects.filter(card_id__in=card_ids, language__in=languages).select_related('card_set__serie'):
+        if card.card_id not in cards or card.language == language:
+            cards[card.card_id] = card
+    return {card_id: CardSerializer(card).data for card_id, card in cards.items()}
+
+
+def embed_cards(request, rows):
+    """
+    Add a `card` key to each serialized row (None when the card is not in the
+    catalog). ?card_language= picks the card language, since `language` may
+    already filter the rows themselves.
+    """
+    cards = hydrate_cards([row['card_id'] for row in rows], request.query_params.get('card_language'))
+    for row in rows:
+        row['card'] = cards.get(row['card_id'])
+    return rows
@@ -0,0 +1,152 @@
+"""
+Card image cache.
+
+The first request for a card's artwork downloads TCGdex's high-resolution
+PNG once, stores it under the hash of its bytes and writes resized WebP
+variants next to it. The CardImage row remembers the names, so later
+requests are served from MEDIA_ROOT without touching TCGdex. Names never
+change content, so media URLs under card_images/ are cached forever (see
+tcg_backend.views.is_immutable_media).
+"""
+import hashlib
+import json
+from io import BytesIO
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, UnidentifiedImageError
+
+from . import tcgdex
+from .models import Card, CardImage
+
+CARD_IMAGE_DIR = 'card_images'
+SOURCE_QUALITY = 'high.png'
+# size -> target width; TCGdex high.png is 600px wide
+CARD_IMAGE_WIDTHS = {
+    'small': 200,
+    'medium': 400,
+    'large': 600,
+}
+WEBP_OPTIONS = {'quality': 82, 'method': 6}
+
+_flight = tcgdex.SingleFlight()
+
+
+class CardImageError(Exception):
+    pass
+
+
+class CardImageNotFound(CardImageError):
+    pass
+
+
+def _directory(digest):
+    return f'{CARD_IMAGE_DIR}/{digest[:2]}/{digest[2:4]}'
+
+
+def _store(name, content):
+    # Content-addressed, so an existing file already has these bytes
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    return name
+
+
+def _resize(image, width):
+    if image.width > width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    buffer = BytesIO()
+    image.save(buffer, 'WEBP', **WEBP_OPTIONS)
+    return buffer.getvalue()
+
+
+def source_url(card_id, language):
+    """TCGdex asset base for the card, from the local catalog or the TCGdex proxy"""
+    if not tcgdex.is_proxied_path(f'{language}/cards/{card_id}'):
+        raise CardImageNotFound(card_id)
+    image = (
+        Card.objects.filter(card_id=card_id, language=language).values_list('image', flat=True).first()
+    )
+    if not image:
+        try:
+            entry, _ = tcgdex.get(f'{language}/cards/{card_id}')
+        except tcgdex.UpstreamError as e:
+            raise CardImageError(str(e)) from e
+        if entry.status != 200:
+            raise CardImageNotFound(card_id)
+        image = json.loads(entry.body).get('image')
+    if not image:
+        raise CardImageNotFound(card_id)
+    return f'{image.rstrip("/")}/{SOURCE_QUALITY}'
+
+
+def build_variants(original_bytes, digest):
+    try:
+        image = Image.open(BytesIO(original_bytes))
+        image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise CardImageError('TCGdex returned an invalid image') from e
+    image = image.convert('RGBA') if 'A' in image.getbands() or 'transparency' in image.info else image.convert('RGB')
+    directory = _directory(digest)
+    return {
+        size: _store(f'{directory}/{digest}_{width}.webp', _resize(image, width))
+        for size, width in CARD_IMAGE_WIDTHS.items()
+    }
+
+
+def _download(card_id, language):
+    url = source_url(card_id, language)
+    try:
+        response = tcgdex.get_session().get(url, timeout=settings.TCGDEX_TIMEOUT)
+    except requests.RequestException as e:
+        raise CardImageError(f'Image download failed: {e}') from e
+    if response.status_code == 404:
+        raise CardImageNotFound(card_id)
+    if response.status_code != 200:
+        raise CardImageError(f'Image download answered {response.status_code}')
+
+    digest = hashlib.sha256(response.content).hexdigest()
+    original = _store(f'{_directory(digest)}/{digest}.png', response.content)
+    card_image, _ = CardImage.objects.update_or_create(
+        card_id=card_id, language=language,
+        defaults={
+            'source_url': url,
+            'digest': digest,
+            'original': original,
+            'variants': build_variants(response.content, digest),
+        },
+    )
+    return card_image
+
+
+def _rebuild(card_image):
+    """Recreate lost files (e.g. a fresh MEDIA_ROOT), from the stored original when present"""
+    if not default_storage.exists(card_image.original):
+        return _download(card_image.card_id, card_image.language)
+    with default_storage.open(card_image.original) as fh:
+        card_image.variants = build_variants(fh.read(), card_image.digest)
+    card_image.save(update_fields=['variants', 'fetched_at'])
+    return card_image
+
+
+def get_card_image(card_id, language):
+    """The card's CardImage, downloading and resizing the artwork on first use"""
+    card_image = CardImage.objects.filter(card_id=card_id, language=language).first()
+    if card_image is None:
+        # Concurrent first requests for one card share a single download
+        card_image = _flight.do((card_id, language), lambda: _download(card_id, language))
+    return card_image
+
+
+def variant_name(card_id, language, size):
+    """Storage name of one resized variant, creating it if needed"""
+    if size not in CARD_IMAGE_WIDTHS:
+        raise CardImageNotFound(size)
+    card_image = get_card_image(card_id, language)
+    name = card_image.variants.get(size)
+    if name is None or not default_storage.exists(name):
+        card_image = _flight.do((card_id, language), lambda: _rebuild(card_image))
+        name = card_image.variants[size]
+    return name
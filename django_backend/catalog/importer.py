@@ -0,0 +1,171 @@
+"""
+Bulk loader for TCGdex-format JSON dumps.
+
+A dump is any mix of JSON files holding series, sets or cards exactly as the
+TCGdex REST API returns them (a single object or a list of objects). Sets
+embed brief cards, full card objects embed a brief set, so a directory of
+`sets/*.json` alone is enough to populate the catalog.
+"""
+import json
+from pathlib import Path
+
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .models import Serie, CardSet, Card, normalize_search_text
+
+SERIE_FIELDS = ['name', 'logo']
+SET_FIELDS = [
+    'serie', 'name', 'logo', 'symbol', 'card_count_total',
+    'card_count_official', 'release_date', 'tcg_online',
+]
+CARD_FIELDS = [
+    'card_set', 'local_id', 'number', 'name', 'search_name', 'category',
+    'rarity', 'image', 'variants', 'data',
+]
+
+
+def iter_dump_files(paths):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(path.rglob('*.json'))
+        else:
+            yield path
+
+
+def _card_number(local_id):
+    return int(local_id) if local_id and local_id.isdigit() else None
+
+
+class CatalogImporter:
+    """Collects objects from dump files, then upserts them in a few bulk statements"""
+
+    def __init__(self, language, batch_size=1000):
+        self.language = language
+        self.batch_size = batch_size
+        self.series = {}
+        self.sets = {}
+        self.cards = {}
+
+    def load_file(self, path):
+        with open(path, encoding='utf-8') as fh:
+            payload = json.load(fh)
+        for obj in payload if isinstance(payload, list) else [payload]:
+            self.add_object(obj)
+
+    def add_object(self, obj):
+        if not isinstance(obj, dict) or 'id' not in obj:
+            return
+        if 'localId' in obj:
+            self.add_card(obj)
+        elif 'cardCount' in obj or 'cards' in obj:
+            self.add_set(obj)
+        elif 'sets' in obj:
+            self.add_serie(obj)
+            for brief_set in obj['sets']:
+                self.add_set(brief_set, serie_id=obj['id'])
+
+    def add_serie(self, serie):
+        entry = self.series.setdefault(serie['id'], {})
+        entry['name'] = serie.get('name') or entry.get('name', '')
+        entry['logo'] = serie.get('logo') or entry.get('logo', '')
+
+    def add_set(self, card_set, serie_id=None):
+        serie = card_set.get('serie')
+        if isinstance(serie, dict) and serie.get('id'):
+            self.add_serie(serie)
+            serie_id = serie['id']
+
+        entry = self.sets.setdefault(card_set['id'], {})
+        card_count = card_set.get('cardCount') or {}
+        entry.update({k: v for k, v in {
+            'serie_id': serie_id,
+            'name': card_set.get('name'),
+            'logo': card_set.get('logo'),
+            'symbol': card_set.get('symbol'),
+            'card_count_total': card_count.get('total'),
+            'card_count_official': card_count.get('official'),
+            'release_date': parse_date(card_set['releaseDate']) if card_set.get('releaseDate') else None,
+            'tcg_online': card_set.get('tcgOnline'),
+        }.items() if v is not None})
+
+        for brief_card in card_set.get('cards') or []:
+            self.add_card(brief_card, set_id=card_set['id'], full=False)
+
+    def add_card(self, card, set_id=None, full=True):
+        brief_set = card.get('set')
+        if isinstance(brief_set, dict) and brief_set.get('id'):
+            set_id = brief_set['id']
+            if brief_set['id'] not in self.sets:
+                self.add_set({k: v for k, v in brief_set.items() if k != 'cards'})
+
+        entry = self.cards.setdefault(card['id'], {'set_id': set_id, 'data': {}})
+        entry['set_id'] = set_id or entry['set_id']
+        # A full card object always wins over the brief copy embedded in its set
+        if full:
+            entry['data'] = {**entry['data'], **card}
+        else:
+            entry['data'] = {**card, **entry['data']}
+
+    @transaction.atomic
+    def save(self):
+        language = self.language
+
+        Serie.objects.bulk_create(
+            [Serie(serie_id=serie_id, language=language, name=values.get('name', ''), logo=values.get('logo', ''))
+             for serie_id, values in self.series.items()],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['serie_id', 'language'],
+            update_fields=SERIE_FIELDS,
+        )
+        serie_pks = dict(Serie.objects.filter(language=language).values_list('serie_id', 'id'))
+
+        CardSet.objects.bulk_create(
+            [CardSet(
+                set_id=set_id,
+                language=language,
+                serie_id=serie_pks.get(values.get('serie_id')),
+                name=values.get('name', ''),
+                logo=values.get('logo', ''),
+                symbol=values.get('symbol', ''),
+                card_count_total=values.get('card_count_total', 0),
+                card_count_official=values.get('card_count_official', 0),
+                release_date=values.get('release_date'),
+                tcg_online=values.get('tcg_online', ''),
+            ) for set_id, values in self.sets.items()],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['set_id', 'language'],
+            update_fields=SET_FIELDS,
+        )
+        set_pks = dict(CardSet.objects.filter(language=language).values_list('set_id', 'id'))
+
+        cards = []
+        for card_id, values in self.cards.items():
+            data = values['data']
+            local_id = str(data.get('localId', ''))
+            cards.append(Card(
+                card_id=card_id,
+                language=language,
+                card_set_id=set_pks.get(values['set_id']),
+                local_id=local_id,
+                number=_card_number(local_id),
+                name=data.get('name', ''),
+                search_name=normalize_search_text(data.get('name', '')),
+                category=data.get('category') or '',
+                rarity=data.get('rarity') or '',
+                image=data.get('image') or '',
+                variants=data.get('variants') or {},
+                data=data,
+            ))
+        Card.objects.bulk_create(
+            cards,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['card_id', 'language'],
+            update_fields=CARD_FIELDS,
+        )
+
+        return {'series': len(self.series), 'sets': len(self.sets), 'cards': len(cards)}
@@ -0,0 +1,128 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+
+from catalog.models import Card, CardSet, normalize_search_text
+from catalog.search import build_index
+
+BENCHMARK_LANGUAGE = 'en'
+SEED_BATCH_SIZE = 5000
+SYLLABLES = ['pi', 'ka', 'chu', 'char', 'iz', 'ard', 'bul', 'ba', 'saur', 'squir', 'tle', 'mew', 'two', 'gar',
+             'do', 'eev', 'ee', 'lu', 'cario', 'gen', 'gar', 'ra', 'ichu', 'dra', 'go', 'nite', 'sy', 'lv', 'eon']
+PREFIXES = ['', '', '', 'Dark ', 'Mega ', 'Alolan ', 'Galarian ', "Team Rocket's "]
+SUFFIXES = ['', '', '', ' ex', ' V', ' VMAX', ' GX', ' δ']
+
+
+class Rollback(Exception):
+    pass
+
+
+def synthetic_names(count, rng):
+    """Pokémon-like names with the usual share of repeated names across sets"""
+    bases = sorted({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+                    for _ in range(count // 4)})
+    return [rng.choice(PREFIXES) + rng.choice(bases) + rng.choice(SUFFIXES) for _ in range(count)]
+
+
+def typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + rng.choice('aeiourstn') + word[i + 1:]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure /api/search/suggest latency. With --cards N (default 20000), first seeds a synthetic '
+        'catalog inside a transaction that is rolled back afterwards; with --cards 0 uses the existing '
+        'catalog. Fails if the p99 index lookup exceeds --budget-ms.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=20000)
+        parser.add_argument('--queries', type=int, default=2000)
+        parser.add_argument('--language', default=BENCHMARK_LANGUAGE)
+        parser.add_argument('--budget-ms', type=float, default=10.0)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        language = options['language']
+        report = {}
+        try:
+            with transaction.atomic():
+                if options['cards']:
+                    self.seed(options['cards'], language, rng)
+                report = self.run(language, options['queries'], rng)
+                raise Rollback
+        except Rollback:
+            pass
+
+        p99 = report['index'][2]
+        if p99 > options['budget_ms']:
+            raise CommandError(f"p99 {p99:.3f} ms exceeds the {options['budget_ms']} ms budget")
+        self.stdout.write(self.style.SUCCESS(f"p99 {p99:.3f} ms is within the {options['budget_ms']} ms budget"))
+
+    def seed(self, count, language, rng):
+        self.stdout.write(f'Seeding {count} cards...')
+        sets = CardSet.objects.bulk_create([
+            CardSet(set_id=f'bench{i}', language=language, name=f'Benchmark {rng.choice(SYLLABLES).capitalize()} {i}')
+            for i in range(max(count // 150, 1))
+        ])
+        names = synthetic_names(count, rng)
+        for offset in range(0, count, SEED_BATCH_SIZE):
+            Card.objects.bulk_create([
+                Card(
+                    card_id=f'bench-{i}', language=language, card_set=sets[i % len(sets)],
+                    local_id=str(i), name=names[i], search_name=normalize_search_text(names[i]),
+                )
+                for i in range(offset, min(offset + SEED_BATCH_SIZE, count))
+            ])
+
+    def run(self, language, query_count, rng):
+        started = time.perf_counter()
+        index = build_index(language)
+        build_ms = (time.perf_counter() - started) * 1000
+        if not len(index):
+            raise CommandError(f'The {language} catalog is empty; seed it with --cards N')
+        self.stdout.write(f'Index: {len(index)} names, built in {build_ms:.0f} ms')
+
+        words = [term.key for term in index.terms]
+        queries = []
+        for _ in range(query_count):
+            word = rng.choice(words)
+            kind = rng.random()
+            if kind < 0.6:
+                queries.append(word[:rng.randint(1, min(len(word), 8))])  # typing a prefix
+            elif kind < 0.9:
+                queries.append(typo(word[:rng.randint(4, max(len(word), 4))], rng))  # a typo
+            else:
+                queries.append(word)
+
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.suggest(query)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        # The full request path (DRF, serialization) on a sample, index already loaded
+        client = Client()
+        request_timings = []
+        for query in queries[:200]:
+            started = time.perf_counter()
+            client.get('/api/search/suggest/', {'q': query, 'language': language})
+            request_timings.append((time.perf_counter() - started) * 1000)
+
+        report = {'index': self.summary(timings), 'request': self.summary(request_timings)}
+        for label, (p50, p95, p99, worst) in report.items():
+            self.stdout.write(f'{label:>8}: p50 {p50:.3f} ms  p95 {p95:.3f} ms  p99 {p99:.3f} ms  max {worst:.3f} ms')
+        return report
+
+    @staticmethod
+    def summary(timings):
+        cuts = statistics.quantiles(timings, n=100)
+        return cuts[49], cuts[94], cuts[98], max(timings)
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.importer import iter_dump_files
+
+BRIEF_CARD_FIELDS = ('id', 'localId', 'name', 'image')
+BRIEF_SET_FIELDS = ('id', 'name', 'logo', 'symbol', 'cardCount')
+
+
+def index_dump(paths):
+    """{'series'|'sets'|'cards': {id: object}} from TCGdex-format dump files"""
+    index = {'series': {}, 'sets': {}, 'cards': {}}
+
+    def add(obj):
+        if not isinstance(obj, dict) or 'id' not in obj:
+            return
+        if 'localId' in obj:
+            index['cards'][obj['id']] = {**index['cards'].get(obj['id'], {}), **obj}
+        elif 'cardCount' in obj or 'cards' in obj:
+            index['sets'][obj['id']] = {**index['sets'].get(obj['id'], {}), **obj}
+            for brief in obj.get('cards') or []:
+                index['cards'].setdefault(brief['id'], brief)
+        elif 'sets' in obj:
+            index['series'][obj['id']] = obj
+
+    for path in iter_dump_files(paths):
+        with open(path, encoding='utf-8') as fh:
+            payload = json.load(fh)
+        for obj in payload if isinstance(payload, list) else [payload]:
+            add(obj)
+    return index
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve TCGdex-format dump files over HTTP like api.tcgdex.net/v2, for exercising the '
+        '/api/tcg/ proxy locally (point TCGDEX_API_BASE at http://127.0.0.1:<port>). '
+        'Every language path serves the same dump.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Dump files or directories')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0, help='Seconds to wait before each answer')
+
+    def handle(self, *args, **options):
+        index = index_dump(options['paths'])
+        if not any(index.values()):
+            raise CommandError('No TCGdex objects found in the given paths')
+        latency = options['latency']
+        stdout = self.stdout
+        counter = {'requests': 0}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    counter['requests'] += 1
+                    count = counter['requests']
+                if latency:
+                    time.sleep(latency)
+                status, payload = route(index, self.path.split('?', 1)[0])
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                stdout.write(f'#{count} {status} {self.path}')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), Handler)
+        self.stdout.write(
+            f"Serving {len(index['cards'])} cards, {len(index['sets'])} sets, {len(index['series'])} series "
+            f"on http://127.0.0.1:{options['port']}"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def route(index, path):
+    parts = [part for part in path.split('/') if part]
+    # /<lang>/<resource>[/<id>[/<localId>]]
+    if len(parts) < 2 or parts[1] not in index:
+        return 404, {'error': 'Not found'}
+    objects = index[parts[1]]
+    if len(parts) == 2:
+        fields = BRIEF_CARD_FIELDS if parts[1] == 'cards' else BRIEF_SET_FIELDS
+        return 200, [{k: obj[k] for k in fields if k in obj} for obj in objects.values()]
+    if parts[1] == 'sets' and len(parts) == 4:
+        card = next((c for c in index['cards'].values()
+                     if c.get('localId') == parts[3] and (c.get('set') or {}).get('id') == parts[2]), None)
+        return (200, card) if card else (404, {'error': 'Not found'})
+    obj = objects.get(parts[2]) if len(parts) == 3 else None
+    return (200, obj) if obj else (404, {'error': 'Not found'})
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from collection.models import Collection
+from catalog.importer import CatalogImporter, iter_dump_files
+from catalog.search import bump_index_version
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import series, sets and cards from TCGdex-format JSON dumps'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='JSON files or directories to scan for *.json')
+        parser.add_argument('--language', default='en', help='Catalog language of the dump (default: en)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        language = options['language']
+        if language not in dict(Collection.LANGUAGE_CHOICES):
+            raise CommandError(f'Unsupported language "{language}"')
+
+        importer = CatalogImporter(language, batch_size=options['batch_size'])
+        files = 0
+        for path in iter_dump_files(options['paths']):
+            try:
+                importer.load_file(path)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read {path}: {e}')
+            files += 1
+
+        counts = importer.save()
+        bump_index_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {counts['series']} series, {counts['sets']} sets and {counts['cards']} cards "
+            f"({language}) from {files} file(s)"
+        ))
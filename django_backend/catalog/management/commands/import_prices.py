@@ -0,0 +1,109 @@
+import csv
+import json
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from catalog.importer import iter_dump_files
+from catalog.models import CardPrice
+from collection.caching import bump_user_cache_version
+from collection.models import Collection, CollectionValueSnapshot
+from collection.valuation import compute_snapshot
+
+PRICE_FIELDS = ['card_id', 'variant', 'condition', 'language', 'date', 'price', 'currency', 'source']
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as fh:
+        if path.suffix.lower() == '.csv':
+            yield from csv.DictReader(fh)
+        elif path.suffix.lower() in ('.ndjson', '.jsonl'):
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            payload = json.load(fh)
+            yield from payload if isinstance(payload, list) else [payload]
+
+
+class Command(BaseCommand):
+    help = 'Bulk-load card prices from CSV, JSON or NDJSON files (columns: ' + ', '.join(PRICE_FIELDS) + ')'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+')
+        parser.add_argument('--date', help='Default date for rows without one (YYYY-MM-DD)')
+        parser.add_argument('--source', default='', help='Default source label for rows without one')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        default_date = parse_date(options['date']) if options['date'] else None
+        valid = {
+            'variant': dict(Collection.VARIANT_CHOICES),
+            'condition': dict(Collection.CONDITION_CHOICES),
+            'language': dict(Collection.LANGUAGE_CHOICES),
+        }
+
+        prices = {}
+        for path in iter_dump_files(options['paths']):
+            for line, row in enumerate(read_rows(path), start=1):
+                try:
+                    price = CardPrice(
+                        card_id=row['card_id'].strip(),
+                        variant=(row.get('variant') or '').strip(),
+                        condition=(row.get('condition') or '').strip(),
+                        language=(row.get('language') or '').strip(),
+                        date=parse_date(str(row['date'])) if row.get('date') else default_date,
+                        price=Decimal(str(row['price'])),
+                        currency=(row.get('currency') or 'USD').strip().upper(),
+                        source=(row.get('source') or options['source']).strip(),
+                    )
+                except (KeyError, ValueError, InvalidOperation) as e:
+                    raise CommandError(f'{path}:{line}: invalid row ({e})')
+                if price.date is None:
+                    raise CommandError(f'{path}:{line}: missing date (pass --date)')
+                for field, choices in valid.items():
+                    if getattr(price, field) and getattr(price, field) not in choices:
+                        raise CommandError(f'{path}:{line}: unknown {field} "{getattr(price, field)}"')
+                key = (price.card_id, price.variant, price.condition, price.language, price.date, price.currency)
+                prices[key] = price
+
+        CardPrice.objects.bulk_create(
+            list(prices.values()),
+            batch_size=options['batch_size'],
+            update_conflicts=True,
+            unique_fields=['card_id', 'variant', 'condition', 'language', 'date', 'currency'],
+            update_fields=['price', 'source'],
+        )
+
+        recomputed = self.recompute_snapshots(prices, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Imported {len(prices)} price(s), recomputed {recomputed} snapshot(s)'))
+
+    def recompute_snapshots(self, prices, batch_size):
+        """
+        Re-value the stored snapshots the import changed: those of users owning
+        an imported card, dated on or after that card's earliest imported price.
+        """
+        earliest = {}
+        for card_id, _, _, _, date, _ in prices:
+            earliest[card_id] = min(date, earliest.get(card_id, date))
+        cards_by_date = defaultdict(list)
+        for card_id, date in earliest.items():
+            cards_by_date[date].append(card_id)
+
+        stale = set()
+        for date, card_ids in cards_by_date.items():
+            for offset in range(0, len(card_ids), batch_size):
+                owners = Collection.objects.filter(card_id__in=card_ids[offset:offset + batch_size]).values('user_id')
+                stale.update(
+                    CollectionValueSnapshot.objects.filter(user_id__in=owners, date__gte=date)
+                    .values_list('user_id', 'date')
+                )
+
+        for user_id, date in sorted(stale):
+            compute_snapshot(user_id, date)
+        # Cached valuation/history responses embed the old values
+        for user_id in {user_id for user_id, _ in stale}:
+            bump_user_cache_version(user_id)
+        return len(stale)
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Serie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serie_id', models.CharField(max_length=50)),
+                ('language', models.CharField(choices=[('en', 'English (EN)'), ('ja', 'Japanese (JA)'), ('de', 'German (DE)'), ('fr', 'French (FR)'), ('es', 'Spanish (ES)'), ('it', 'Italian (IT)'), ('pt', 'Portuguese (PT)'), ('ko', 'Korean (KO)'), ('zh', 'Chinese (ZH)')], default='en', max_length=5)),
+                ('name', models.CharField(max_length=200)),
+                ('logo', models.URLField(blank=True)),
+            ],
+            options={
+                'unique_together': {('serie_id', 'language')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CardSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('set_id', models.CharField(max_length=50)),
+                ('language', models.CharField(choices=[('en', 'English (EN)'), ('ja', 'Japanese (JA)'), ('de', 'German (DE)'), ('fr', 'French (FR)'), ('es', 'Spanish (ES)'), ('it', 'Italian (IT)'), ('pt', 'Portuguese (PT)'), ('ko', 'Korean (KO)'), ('zh', 'Chinese (ZH)')], default='en', max_length=5)),
+                ('name', models.CharField(max_length=200)),
+                ('logo', models.URLField(blank=True)),
+                ('symbol', models.URLField(blank=True)),
+                ('card_count_total', models.PositiveIntegerField(default=0)),
+                ('card_count_official', models.PositiveIntegerField(default=0)),
+                ('release_date', models.DateField(blank=True, null=True)),
+                ('tcg_online', models.CharField(blank=True, max_length=20)),
+                ('serie', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sets', to='catalog.serie')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Card',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_id', models.CharField(max_length=100)),
+                ('language', models.CharField(choices=[('en', 'English (EN)'), ('ja', 'Japanese (JA)'), ('de', 'German (DE)'), ('fr', 'French (FR)'), ('es', 'Spanish (ES)'), ('it', 'Italian (IT)'), ('pt', 'Portuguese (PT)'), ('ko', 'Korean (KO)'), ('zh', 'Chinese (ZH)')], default='en', max_length=5)),
+                ('local_id', models.CharField(max_length=20)),
+                ('number', models.PositiveIntegerField(blank=True, null=True)),
+                ('name', models.CharField(max_length=200)),
+                ('search_name', models.CharField(max_length=200)),
+                ('category', models.CharField(blank=True, max_length=20)),
+                ('rarity', models.CharField(blank=True, max_length=50)),
+                ('image', models.URLField(blank=True)),
+                ('variants', models.JSONField(blank=True, default=dict)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('card_set', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cards', to='catalog.cardset')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='cardset',
+            index=models.Index(fields=['language', '-release_date'], name='catalog_set_lang_release_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='cardset',
+            unique_together={('set_id', 'language')},
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['language', 'search_name'], name='catalog_card_lang_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['card_set', 'number', 'local_id'], name='catalog_card_set_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['language', 'local_id'], name='catalog_card_lang_local_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='card',
+            unique_together={('card_id', 'language')},
+        ),
+    ]
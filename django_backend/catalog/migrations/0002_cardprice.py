@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_id', models.CharField(max_length=100)),
+                ('variant', models.CharField(blank=True, choices=[('normal', 'Normal'), ('reverse_holo', 'Reverse Holo'), ('holo', 'Holo'), ('first_edition', 'First Edition'), ('shadowless', 'Shadowless')], max_length=20)),
+                ('condition', models.CharField(blank=True, choices=[('mint', 'Mint'), ('near_mint', 'Near Mint'), ('excellent', 'Excellent'), ('good', 'Good'), ('light_played', 'Light Played'), ('played', 'Played'), ('poor', 'Poor'), ('unspecified', 'Unspecified')], max_length=20)),
+                ('language', models.CharField(blank=True, choices=[('en', 'English (EN)'), ('ja', 'Japanese (JA)'), ('de', 'German (DE)'), ('fr', 'French (FR)'), ('es', 'Spanish (ES)'), ('it', 'Italian (IT)'), ('pt', 'Portuguese (PT)'), ('ko', 'Korean (KO)'), ('zh', 'Chinese (ZH)')], max_length=5)),
+                ('date', models.DateField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(default='USD', max_length=3)),
+                ('source', models.CharField(blank=True, max_length=50)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['card_id', 'variant', 'condition', '-date'], name='catalog_price_lookup_idx')],
+                'unique_together': {('card_id', 'variant', 'condition', 'language', 'date', 'currency')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_cardprice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_id', models.CharField(max_length=100)),
+                ('language', models.CharField(choices=[('en', 'English (EN)'), ('ja', 'Japanese (JA)'), ('de', 'German (DE)'), ('fr', 'French (FR)'), ('es', 'Spanish (ES)'), ('it', 'Italian (IT)'), ('pt', 'Portuguese (PT)'), ('ko', 'Korean (KO)'), ('zh', 'Chinese (ZH)')], default='en', max_length=5)),
+                ('source_url', models.URLField(max_length=500)),
+                ('digest', models.CharField(max_length=64)),
+                ('original', models.CharField(max_length=255)),
+                ('variants', models.JSONField(default=dict)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('card_id', 'language')},
+            },
+        ),
+    ]
@@ -0,0 +1,120 @@
+import unicodedata
+
+from django.db import models
+from collection.models import Collection
+
+
+def normalize_search_text(value):
+    """Lowercase and strip accents so 'Pokémon' and 'pokemon' index the same"""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+class Serie(models.Model):
+    """TCGdex serie (e.g. Sword & Shield), stored per language"""
+    serie_id = models.CharField(max_length=50)  # TCGdex serie ID
+    language = models.CharField(max_length=5, choices=Collection.LANGUAGE_CHOICES, default='en')
+    name = models.CharField(max_length=200)
+    logo = models.URLField(blank=True)
+
+    class Meta:
+        unique_together = ['serie_id', 'language']
+
+    def __str__(self):
+        return f"{self.serie_id} ({self.language})"
+
+
+class CardSet(models.Model):
+    """TCGdex set, stored per language"""
+    set_id = models.CharField(max_length=50)  # TCGdex set ID (e.g. "base3")
+    language = models.CharField(max_length=5, choices=Collection.LANGUAGE_CHOICES, default='en')
+    serie = models.ForeignKey(Serie, on_delete=models.SET_NULL, null=True, blank=True, related_name='sets')
+    name = models.CharField(max_length=200)
+    logo = models.URLField(blank=True)
+    symbol = models.URLField(blank=True)
+    card_count_total = models.PositiveIntegerField(default=0)
+    card_count_official = models.PositiveIntegerField(default=0)
+    release_date = models.DateField(null=True, blank=True)
+    tcg_online = models.CharField(max_length=20, blank=True)
+
+    class Meta:
+        unique_together = ['set_id', 'language']
+        indexes = [
+            models.Index(fields=['language', '-release_date'], name='catalog_set_lang_release_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.set_id} ({self.language})"
+
+
+class Card(models.Model):
+    """TCGdex card, stored per language"""
+    card_id = models.CharField(max_length=100)  # TCGdex card ID (e.g. "base3-1")
+    language = models.CharField(max_length=5, choices=Collection.LANGUAGE_CHOICES, default='en')
+    card_set = models.ForeignKey(CardSet, on_delete=models.CASCADE, null=True, blank=True, related_name='cards')
+    local_id = models.CharField(max_length=20)  # Number inside the set, may be non-numeric (e.g. "TG01")
+    number = models.PositiveIntegerField(null=True, blank=True)  # Numeric local_id, used for sorting
+    name = models.CharField(max_length=200)
+    search_name = models.CharField(max_length=200)  # normalize_search_text(name)
+    category = models.CharField(max_length=20, blank=True)  # Pokemon / Trainer / Energy
+    rarity = models.CharField(max_length=50, blank=True)
+    image = models.URLField(blank=True)
+    variants = models.JSONField(default=dict, blank=True)
+    data = models.JSONField(default=dict, blank=True)  # Raw TCGdex payload
+
+    class Meta:
+        unique_together = ['card_id', 'language']
+        indexes = [
+            models.Index(fields=['language', 'search_name'], name='catalog_card_lang_name_idx'),
+            models.Index(fields=['card_set', 'number', 'local_id'], name='catalog_card_set_number_idx'),
+            models.Index(fields=['language', 'local_id'], name='catalog_card_lang_local_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.card_id} ({self.language}) - {self.name}"
+
+
+class CardPrice(models.Model):
+    """
+    Market price observation. Blank variant/condition/language mean the price
+    applies to any value of that field; the valuation engine then scales it
+    with the configured variant and condition multipliers.
+    """
+    card_id = models.CharField(max_length=100)  # TCGdex card ID
+    variant = models.CharField(max_length=20, choices=Collection.VARIANT_CHOICES, blank=True)
+    condition = models.CharField(max_length=20, choices=Collection.CONDITION_CHOICES, blank=True)
+    language = models.CharField(max_length=5, choices=Collection.LANGUAGE_CHOICES, blank=True)
+    date = models.DateField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3, default='USD')
+    source = models.CharField(max_length=50, blank=True)
+
+    class Meta:
+        unique_together = ['card_id', 'variant', 'condition', 'language', 'date', 'currency']
+        indexes = [
+            models.Index(fields=['card_id', 'variant', 'condition', '-date'], name='catalog_price_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.card_id} {self.variant or '*'}/{self.condition or '*'} {self.date}: {self.price} {self.currency}"
+
+
+class CardImage(models.Model):
+    """
+    Locally stored copy of a card's TCGdex artwork. `digest` names the
+    content-addressed original and `variants` maps size -> storage name of
+    the resized WebP files (see catalog.images).
+    """
+    card_id = models.CharField(max_length=100)
+    language = models.CharField(max_length=5, choices=Collection.LANGUAGE_CHOICES, default='en')
+    source_url = models.URLField(max_length=500)
+    digest = models.CharField(max_length=64)
+    original = models.CharField(max_length=255)
+    variants = models.JSONField(default=dict)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['card_id', 'language']
+
+    def __str__(self):
+        return f"{self.card_id} ({self.language}) {self.digest[:12]}"
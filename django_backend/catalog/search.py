@@ -0,0 +1,211 @@
+"""
+In-memory name search over the local catalog.
+
+Each language gets a SearchIndex of its distinct card names and set names,
+loaded from the database on first use and reloaded when the catalog import
+bumps the index version. Completions come from a sorted list of every word
+start in a name, so "char" finds both "Charizard" and "Dark Charizard";
+when prefixes run short, a trigram index supplies typo-tolerant matches
+("pikachi" -> "Pikachu").
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Min
+
+from collection.caching import VERSION_CACHE_ALIAS
+
+from .models import Card, CardSet, normalize_search_text
+
+INDEX_VERSION_KEY = 'catalog-search-version'
+MAX_LIMIT = 50
+# Prefixes matching more word starts than this get their ranking precomputed
+PRECOMPUTE_THRESHOLD = 256
+PRECOMPUTE_MAX_LENGTH = 3
+# Fuzzy matching: trigram similarity needed, candidates scored per query, and
+# the share of names a trigram may appear in and still select candidates
+FUZZY_THRESHOLD = 0.3
+FUZZY_CANDIDATES = 100
+FUZZY_COMMON_TRIGRAM_SHARE = 0.02
+
+
+@dataclass(frozen=True)
+class Term:
+    kind: str  # 'card' or 'set'
+    name: str
+    key: str  # normalize_search_text(name)
+    id: str  # set id for sets, '' for card names
+    count: int  # cards with this name, or cards in the set
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _similarity(a, b):
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+class SearchIndex:
+    def __init__(self, terms):
+        self.terms = terms
+        # (word-start suffix of the key, term position) sorted for prefix lookups
+        entries = []
+        self.trigram_postings = defaultdict(list)
+        self.term_trigrams = []
+        for position, term in enumerate(terms):
+            words = term.key.split()
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), position))
+            grams = trigrams(term.key)
+            self.term_trigrams.append(grams)
+            for gram in grams:
+                self.trigram_postings[gram].append(position)
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.positions = [position for _, position in entries]
+        self.common_trigram_limit = max(int(len(terms) * FUZZY_COMMON_TRIGRAM_SHARE), 50)
+        self.precomputed = self._precompute_short_prefixes()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def _precompute_short_prefixes(self):
+        """Ranked term positions for short prefixes with too many matches to rank per request"""
+        counts = Counter(key[:length] for key in self.keys for length in range(1, PRECOMPUTE_MAX_LENGTH + 1))
+        return {
+            prefix: self.rank_prefix_matches(self.prefix_matches(prefix))
+            for prefix, count in counts.items() if count > PRECOMPUTE_THRESHOLD
+        }
+
+    def rank_prefix_matches(self, matches):
+        terms = self.terms
+        return sorted(matches, key=lambda p: (matches[p], -terms[p].count, len(terms[p].key), terms[p].key))
+
+    def ranked_prefix_matches(self, query):
+        """Term positions whose name or a later word starts with the query, best first"""
+        ranked = self.precomputed.get(query)
+        if ranked is None:
+            ranked = self.rank_prefix_matches(self.prefix_matches(query))
+        return ranked
+
+    def prefix_matches(self, query):
+        """{term position: rank} where lower ranks are better"""
+        matches = {}
+        index = bisect_left(self.keys, query)
+        while index < len(self.keys) and self.keys[index].startswith(query):
+            position = self.positions[index]
+            term = self.terms[position]
+            if term.key == query:
+                rank = 0
+            elif term.key.startswith(query):
+                rank = 1
+            else:
+                rank = 2  # a later word of the name
+            if rank < matches.get(position, 3):
+                matches[position] = rank
+            index += 1
+        return matches
+
+    def fuzzy_matches(self, query, exclude):
+        """{term position: similarity} for names close to the query or to its length-prefix"""
+        query_grams = trigrams(query)
+        postings = sorted((self.trigram_postings.get(gram, ()) for gram in query_grams), key=len)
+        # Trigrams shared by many names (e.g. "  d") add cost but barely narrow the candidates
+        selective = [posting for posting in postings if len(posting) <= self.common_trigram_limit] or postings[:3]
+        shared = Counter()
+        for posting in selective:
+            shared.update(posting)
+        matches = {}
+        for position, _ in shared.most_common(FUZZY_CANDIDATES):
+            if position in exclude:
+                continue
+            term = self.terms[position]
+            score = max(
+                _similarity(query_grams, self.term_trigrams[position]),
+                # Typos while still typing: compare against the name cut to the query's length
+                _similarity(query_grams, trigrams(term.key[:len(query) + 1])),
+            )
+            if score >= FUZZY_THRESHOLD:
+                matches[position] = score
+        return matches
+
+    def suggest(self, query, limit=10, kinds=('card', 'set')):
+        """Ranked completions: prefix matches first, then fuzzy ones"""
+        query = normalize_search_text(query)
+        if not query:
+            return []
+        limit = min(limit, MAX_LIMIT)
+
+        prefix = list(islice((p for p in self.ranked_prefix_matches(query) if self.terms[p].kind in kinds), limit))
+        results = [(self.terms[p], 'prefix') for p in prefix]
+
+        # Fewer than `limit` prefix matches means `prefix` holds all of them
+        if len(results) < limit and len(query) >= 3:
+            fuzzy = {p: s for p, s in self.fuzzy_matches(query, set(prefix)).items() if self.terms[p].kind in kinds}
+            ranked = sorted(fuzzy, key=lambda p: (-fuzzy[p], -self.terms[p].count, self.terms[p].key))
+            results += [(self.terms[p], 'fuzzy') for p in ranked[:limit - len(results)]]
+
+        return [
+            {'type': term.kind, 'name': term.name, 'id': term.id or None, 'count': term.count, 'match': match}
+            for term, match in results
+        ]
+
+
+def build_index(language):
+    """Load the language's distinct card names and its sets into a SearchIndex"""
+    terms = [
+        Term('card', row['name'], row['search_name'], '', row['count'])
+        for row in Card.objects.filter(language=language).exclude(search_name='')
+        .values('search_name').annotate(name=Min('name'), count=Count('id')).order_by()
+    ]
+    terms += [
+        Term('set', row['name'], normalize_search_text(row['name']), row['set_id'], row['count'])
+        for row in CardSet.objects.filter(language=language).values('set_id', 'name')
+        .annotate(count=Count('cards')).order_by()
+    ]
+    return SearchIndex(terms)
+
+
+def bump_index_version():
+    """Make every process reload its indexes on next use (call after catalog imports)"""
+    # The shared alias, since imports run in their own process
+    caches[VERSION_CACHE_ALIAS].set(INDEX_VERSION_KEY, time.time(), None)
+
+
+def get_index_version():
+    """Changes with every catalog import, so it also versions other catalog-derived caches"""
+    return caches[VERSION_CACHE_ALIAS].get(INDEX_VERSION_KEY, 0)
+
+
+_indexes = {}  # language -> (version, checked_at, SearchIndex)
+_lock = threading.Lock()
+
+
+def get_index(language):
+    now = time.monotonic()
+    loaded = _indexes.get(language)
+    if loaded is not None and now - loaded[1] < settings.SEARCH_INDEX_CHECK_INTERVAL:
+        return loaded[2]
+
+    version = get_index_version()
+    with _lock:
+        loaded = _indexes.get(language)
+        if loaded is not None and loaded[0] == version:
+            index = loaded[2]
+        else:
+            index = build_index(language)
+        _indexes[language] = (version, now, index)
+    return index
+
+
+def suggest(query, language, limit=10, kinds=('card', 'set')):
+    return get_index(language).suggest(query, limit=limit, kinds=kinds)
@@ -0,0 +1,46 @@
+from rest_framework import serializers
+from .models import Serie, CardSet, Card
+
+
+class SerieSerializer(serializers.ModelSerializer):
+    id = serializers.CharField(source='serie_id')
+
+    class Meta:
+        model = Serie
+        fields = ['id', 'name', 'logo']
+
+
+class CardSetSerializer(serializers.ModelSerializer):
+    """Serializes a set in the TCGdex shape the frontend already understands"""
+    id = serializers.CharField(source='set_id')
+    serie = SerieSerializer(read_only=True)
+    cardCount = serializers.SerializerMethodField()
+    releaseDate = serializers.DateField(source='release_date')
+    tcgOnline = serializers.CharField(source='tcg_online')
+
+    class Meta:
+        model = CardSet
+        fields = ['id', 'name', 'logo', 'symbol', 'serie', 'cardCount', 'releaseDate', 'tcgOnline']
+
+    def get_cardCount(self, obj):
+        return {'total': obj.card_count_total, 'official': obj.card_count_official}
+
+
+class CardSerializer(serializers.ModelSerializer):
+    """Brief card, as returned by TCGdex list endpoints plus set and rarity"""
+    id = serializers.CharField(source='card_id')
+    localId = serializers.CharField(source='local_id')
+    set = CardSetSerializer(source='card_set', read_only=True)
+
+    class Meta:
+        model = Card
+        fields = ['id', 'localId', 'name', 'image', 'category', 'rarity', 'variants', 'language', 'set']
+
+
+class CardDetailSerializer(CardSerializer):
+    """Full card: the raw TCGdex payload with our set representation on top"""
+
+    def to_representation(self, instance):
+        data = dict(instance.data or {})
+        data.update(super().to_representation(instance))
+        return data
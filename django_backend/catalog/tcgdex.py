@@ -0,0 +1,239 @@
+"""
+Read-through cache in front of the TCGdex REST API.
+
+/api/tcg/<lang>/<series|sets|cards>/... proxies GET requests to
+TCGDEX_API_BASE. Responses are kept in a per-process LRU and in the shared
+Django cache (file or database with CACHE_BACKEND), with a TTL per resource.
+Expired entries are still served for TCGDEX_STALE_SECONDS while a single
+background thread refreshes them, concurrent misses for one key share one
+upstream request, and every upstream call goes through one pooled session.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# resource -> (single object TTL, list TTL) in seconds
+RESOURCE_TTLS = {
+    'series': (7 * 24 * 3600, 24 * 3600),
+    'sets': (24 * 3600, 6 * 3600),
+    'cards': (24 * 3600, 6 * 3600),
+}
+NOT_FOUND_TTL = 10 * 60
+CACHEABLE_STATUSES = (200, 404)
+CACHE_KEY_PREFIX = 'tcgdex:'
+PATH_RE = re.compile(r'^[a-z]{2}(?:-[a-z]{2})?/(?P<resource>series|sets|cards)(?P<detail>(?:/[\w.\-%]+)+)?/?$')
+
+
+class UpstreamError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status: int
+    body: bytes
+    content_type: str
+    fetched_at: float
+    expires_at: float
+
+    def is_fresh(self, now):
+        return now < self.expires_at
+
+    def is_usable(self, now):
+        return now < self.expires_at + settings.TCGDEX_STALE_SECONDS
+
+    @property
+    def etag(self):
+        return '"%s"' % hashlib.sha256(self.body).hexdigest()[:32]
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """One call per key at a time; callers arriving meanwhile get its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def do_in_background(self, key, func):
+        """Start `func` in a daemon thread unless a call for `key` is already running"""
+        with self._lock:
+            if key in self._calls:
+                return False
+        threading.Thread(target=self._run_quietly, args=(key, func), daemon=True).start()
+        return True
+
+    def _run_quietly(self, key, func):
+        try:
+            self.do(key, func)
+        except UpstreamError:
+            pass
+        finally:
+            # The shared cache may be database-backed
+            connections.close_all()
+
+
+_lru = LRUCache(settings.TCGDEX_LRU_SIZE)
+_flight = SingleFlight()
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The pooled HTTP session used for every upstream request"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.TCGDEX_POOL_SIZE,
+                    max_retries=Retry(
+                        total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=('GET',),
+                    ),
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def is_proxied_path(path):
+    return PATH_RE.match(path) is not None
+
+
+def ttl_for(path):
+    match = PATH_RE.match(path)
+    detail_ttl, list_ttl = RESOURCE_TTLS[match['resource']]
+    return detail_ttl if match['detail'] else list_ttl
+
+
+def cache_key(path, query):
+    raw = path.strip('/') + '?' + urlencode(sorted(query))
+    return CACHE_KEY_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _store(key, entry):
+    _lru.set(key, entry)
+    cache.set(key, entry, int(entry.expires_at - time.time()) + settings.TCGDEX_STALE_SECONDS)
+
+
+def fetch(path, query, key=None):
+    """Request `path` upstream and cache the response"""
+    url = f"{settings.TCGDEX_API_BASE.rstrip('/')}/{path.strip('/')}"
+    try:
+        response = get_session().get(url, params=sorted(query), timeout=settings.TCGDEX_TIMEOUT)
+    except requests.RequestException as e:
+        raise UpstreamError(f'TCGdex request failed: {e}') from e
+    if response.status_code not in CACHEABLE_STATUSES:
+        raise UpstreamError(f'TCGdex answered {response.status_code}')
+
+    now = time.time()
+    ttl = ttl_for(path) if response.status_code == 200 else NOT_FOUND_TTL
+    entry = CachedResponse(
+        status=response.status_code,
+        body=response.content,
+        content_type=response.headers.get('Content-Type', 'application/json'),
+        fetched_at=now,
+        expires_at=now + ttl,
+    )
+    _store(key or cache_key(path, query), entry)
+    return entry
+
+
+def get(path, query=()):
+    """
+    (CachedResponse, state) for a TCGdex path and query pairs, where state is
+    HIT, STALE or MISS. Raises UpstreamError when nothing usable is cached and
+    TCGdex cannot be reached.
+    """
+    key = cache_key(path, query)
+    entry = _lru.get(key)
+    if entry is None:
+        entry = cache.get(key)
+        if entry is not None:
+            _lru.set(key, entry)
+
+    now = time.time()
+    if entry is not None and entry.is_fresh(now):
+        return entry, 'HIT'
+
+    def refresh():
+        return fetch(path, query, key)
+
+    if entry is not None and entry.is_usable(now):
+        _flight.do_in_background(key, refresh)
+        return entry, 'STALE'
+    try:
+        return _flight.do(key, refresh), 'MISS'
+    except UpstreamError:
+        if entry is not None:
+            # Past the stale window, but better than an error
+            return entry, 'STALE'
+        raise
@@ -0,0 +1,13 @@
+from django.urls import path, re_path
+from . import views
+
+urlpatterns = [
+    path('catalog/cards/', views.CardListView.as_view(), name='catalog-card-list'),
+    path('catalog/cards/batch/', views.CardBatchView.as_view(), name='catalog-card-batch'),
+    path('catalog/cards/<str:card_id>/', views.CardDetailView.as_view(), name='catalog-card-detail'),
+    path('catalog/sets/', views.CardSetListView.as_view(), name='catalog-set-list'),
+    path('catalog/sets/<str:set_id>/', views.CardSetDetailView.as_view(), name='catalog-set-detail'),
+    path('search/suggest/', views.SearchSuggestView.as_view(), name='search-suggest'),
+    path('catalog/images/<str:language>/<str:card_id>/<str:size>/', views.card_image, name='catalog-card-image'),
+    re_path(r'^tcg/(?P<path>.+)$', views.tcgdex_proxy, name='tcgdex-proxy'),
+]
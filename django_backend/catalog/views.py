@@ -0,0 +1,188 @@
+import time
+
+from django.conf import settings
+from rest_framework import generics, permissions, status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_http_methods
+from . import images, search, tcgdex
+from collection.models import Collection
+from .models import CardSet, Card, normalize_search_text
+from .serializers import CardSetSerializer, CardSerializer, CardDetailSerializer
+from .hydration import MAX_BATCH_IDS, hydrate_cards
+from tcg_backend.db import ReplicaReadMixin
+from tcg_backend.views import serve_media
+
+CARD_ORDERINGS = {
+    'number': ['card_set__release_date', 'card_set_id', 'number', 'local_id'],
+    '-number': ['-card_set__release_date', '-card_set_id', '-number', '-local_id'],
+    'name': ['search_name', 'id'],
+    '-name': ['-search_name', '-id'],
+}
+
+
+class CatalogPagination(PageNumberPagination):
+    page_size = 30
+    page_size_query_param = 'page_size'
+    max_page_size = 250
+
+
+class CardListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Search the local card catalog.
+
+    Filters: language (default "en"), name (accent/case-insensitive prefix),
+    set (TCGdex set ID), number (local ID within the set).
+    Ordering: ordering=number|-number|name|-name.
+    """
+    serializer_class = CardSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = CatalogPagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        language = params.get('language', 'en')
+        queryset = Card.objects.filter(language=language).select_related('card_set__serie')
+
+        name = normalize_search_text(params.get('name', ''))
+        if name:
+            # Range instead of LIKE so every backend can walk the (language, search_name) index
+            queryset = queryset.filter(search_name__gte=name, search_name__lt=name + '\U0010ffff')
+
+        set_id = params.get('set', '').strip()
+        if set_id:
+            queryset = queryset.filter(card_set__set_id=set_id, card_set__language=language)
+
+        number = params.get('number', '').strip()
+        if number:
+            queryset = queryset.filter(local_id=number)
+
+        ordering = CARD_ORDERINGS.get(params.get('ordering', ''))
+        if ordering is None:
+            ordering = CARD_ORDERINGS['number'] if set_id else ['id']
+        return queryset.order_by(*ordering)
+
+
+class CardDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
+    serializer_class = CardDetailSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_object(self):
+        language = self.request.query_params.get('language', 'en')
+        return get_object_or_404(
+            Card.objects.select_related('card_set__serie'),
+            card_id=self.kwargs['card_id'],
+            language=language,
+        )
+
+
+class CardSetListView(ReplicaReadMixin, generics.ListAPIView):
+    serializer_class = CardSetSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+
+    def get_queryset(self):
+        language = self.request.query_params.get('language', 'en')
+        return CardSet.objects.filter(language=language).select_related('serie').order_by('-release_date', 'set_id')
+
+
+class CardSetDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
+    serializer_class = CardSetSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_object(self):
+        language = self.request.query_params.get('language', 'en')
+        return get_object_or_404(
+            CardSet.objects.select_related('serie'),
+            set_id=self.kwargs['set_id'],
+            language=language,
+        )
+
+
+class CardBatchView(ReplicaReadMixin, APIView):
+    """Many cards in one request: ?ids=base1-1,base1-2&language=en"""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        ids = [card_id.strip() for card_id in request.query_params.get('ids', '').split(',') if card_id.strip()]
+        if len(ids) > MAX_BATCH_IDS:
+            return Response({'error': f'At most {MAX_BATCH_IDS} ids per request'}, status=status.HTTP_400_BAD_REQUEST)
+        cards = hydrate_cards(ids, request.query_params.get('language'))
+        return Response({
+            'results': cards,
+            'missing': [card_id for card_id in dict.fromkeys(ids) if card_id not in cards],
+        })
+
+
+class SearchSuggestView(ReplicaReadMixin, APIView):
+    """
+    Name completions from the in-memory search index:
+    ?q=char&language=en&limit=10&types=card,set
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        language = params.get('language', settings.CATALOG_DEFAULT_LANGUAGE)
+        if language not in dict(Collection.LANGUAGE_CHOICES):
+            return Response({'error': f'Unsupported language "{language}"'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(params.get('limit', 10)), search.MAX_LIMIT))
+        except ValueError:
+            limit = 10
+        kinds = tuple(kind for kind in params.get('types', 'card,set').split(',') if kind in ('card', 'set'))
+
+        started = time.perf_counter()
+        results = search.suggest(params.get('q', ''), language, limit=limit, kinds=kinds)
+        return Response({
+            'query': params.get('q', ''),
+            'language': language,
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3),
+        })
+
+
+@require_http_methods(['GET', 'HEAD'])
+def tcgdex_proxy(request, path):
+    """TCGdex API through the shared cache: /api/tcg/<lang>/<series|sets|cards>/..."""
+    if not tcgdex.is_proxied_path(path):
+        raise Http404('Unknown TCGdex resource')
+    query = [(key, value) for key, values in request.GET.lists() for value in values]
+    try:
+        entry, state = tcgdex.get(path, query)
+    except tcgdex.UpstreamError:
+        return JsonResponse({'error': 'TCGdex is unavailable'}, status=502)
+
+    if entry.status == 200:
+        response = get_conditional_response(request, etag=entry.etag)
+    else:
+        response = None
+    if response is None:
+        response = HttpResponse(entry.body, status=entry.status, content_type=entry.content_type)
+        response['ETag'] = entry.etag
+    max_age = max(int(entry.expires_at - time.time()), 0)
+    response['Cache-Control'] = f'public, max-age={max_age}, stale-while-revalidate={settings.TCGDEX_STALE_SECONDS}'
+    response['X-Cache'] = state
+    return response
+
+
+@require_http_methods(['GET', 'HEAD'])
+def card_image(request, language, card_id, size):
+    """
+    Resized WebP artwork for a card (size: small, medium or large), fetched from
+    TCGdex once and then served from the local content-addressed copy.
+    """
+    try:
+        name = images.variant_name(card_id, language, size)
+    except images.CardImageNotFound:
+        raise Http404('Card image not found') from None
+    except images.CardImageError:
+        return JsonResponse({'error': 'Card image is unavailable'}, status=502)
+    response = serve_media(request, name)
+    # The artwork behind a card id does not change, so this URL is as cacheable as the file
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
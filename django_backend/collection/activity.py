@@ -0,0 +1,91 @@
+"""
+Activity feed built in the database.
+
+Collection and Wishlist rows are projected onto the same columns and merged
+with UNION ALL, so search, ordering and pagination all run in SQL and a page
+only ever materializes the rows it returns.
+"""
+from django.db import models
+from django.db.models import F, Q, Value
+from django.db.models.functions import Cast, Concat
+
+from .models import Collection, Wishlist
+
+ACTIVITY_COLUMNS = [
+    'activity_id', 'activity_type', 'activity_card_id', 'activity_date', 'activity_message',
+    'activity_quantity', 'activity_variant', 'activity_condition', 'activity_priority',
+]
+
+
+def _text(value):
+    return Value(value, output_field=models.CharField())
+
+
+def _collection_activities(user):
+    return Collection.objects.filter(user=user).annotate(
+        activity_id=Concat(_text('collection_'), Cast('id', models.CharField())),
+        activity_type=_text('collection_add'),
+        activity_card_id=F('card_id'),
+        activity_date=F('added_date'),
+        activity_message=Concat(
+            _text('Added '), Cast('quantity', models.CharField()), _text('x card '), 'card_id', _text(' to collection'),
+        ),
+        activity_quantity=F('quantity'),
+        activity_variant=F('variant'),
+        activity_condition=F('condition'),
+        activity_priority=_text(None),
+    )
+
+
+def _wishlist_activities(user):
+    return Wishlist.objects.filter(user=user).annotate(
+        activity_id=Concat(_text('wishlist_'), Cast('id', models.CharField())),
+        activity_type=_text('wishlist_add'),
+        activity_card_id=F('card_id'),
+        activity_date=F('added_date'),
+        activity_message=Concat(_text('Added card '), 'card_id', _text(' to wishlist')),
+        activity_quantity=Value(None, output_field=models.PositiveIntegerField()),
+        activity_variant=_text(None),
+        activity_condition=_text(None),
+        activity_priority=F('priority'),
+    )
+
+
+def activity_queryset(user, search_query='', extra_filter=None):
+    """
+    UNION ALL of the user's collection and wishlist activity, newest first.
+    `extra_filter` (e.g. a keyset cursor) is applied to both branches, since
+    Django cannot filter a combined queryset. Cursors must come from
+    KeysetPagination.get_cursor_filter: its plain `activity_date <= cursor`
+    bound (activity_date is added_date) lets each branch range-scan its
+    (user, added_date) index instead of reading the user's rows from the top.
+    """
+    branches = []
+    for branch in (_collection_activities(user), _wishlist_activities(user)):
+        if search_query:
+            branch = branch.filter(
+                Q(activity_message__icontains=search_query) | Q(activity_card_id__icontains=search_query)
+            )
+        if extra_filter is not None:
+            branch = branch.filter(extra_filter)
+        branches.append(branch.values(*ACTIVITY_COLUMNS))
+    return branches[0].union(branches[1], all=True).order_by('-activity_date', '-activity_id')
+
+
+def serialize_activity(row):
+    activity = {
+        'id': row['activity_id'],
+        'type': row['activity_type'],
+        'card_id': row['activity_card_id'],
+        'date': row['activity_date'].isoformat(),
+        'message': row['activity_message'],
+    }
+    if row['activity_type'] == 'collection_add':
+        activity.update({
+            'quantity': row['activity_quantity'],
+            'variant': row['activity_variant'],
+            'condition': row['activity_condition'],
+        })
+    else:
+        activity['priority'] = row['activity_priority']
+    return activity
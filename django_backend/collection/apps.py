@@ -1,7 +1,9 @@
-
 from django.apps import AppConfig
 
 
 class CollectionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'collection'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
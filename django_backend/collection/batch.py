@@ -0,0 +1,208 @@
+"""
+Batch mutations across Collection, Wishlist and CardNote.
+
+All operations are validated first; if every one is valid they are applied in
+a single transaction with one bulk_create, one bulk_update and one DELETE per
+model, and per-operation results are returned in request order. The bulk writes
+send no model signals: the summary gets one counter delta per batch and the
+caller runs collection_bulk_changed once for the derived caches.
+"""
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from subscriptions.entitlements import FREE_PLAN_LIMIT_MESSAGE
+
+from . import summary
+from .models import Collection, Wishlist, CardNote
+from .serializers import CollectionSerializer, WishlistSerializer, CardNoteSerializer
+
+MAX_BATCH_OPERATIONS = 500
+
+BATCH_TYPES = {
+    'collection': (Collection, CollectionSerializer, 'updated_date'),
+    'wishlist': (Wishlist, WishlistSerializer, None),
+    'note': (CardNote, CardNoteSerializer, 'updated_at'),
+}
+OPERATIONS = ('create', 'update', 'delete')
+
+
+class BatchError(Exception):
+    def __init__(self, detail, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class _Operation:
+    def __init__(self, index, raw):
+        self.index = index
+        self.op = raw.get('op')
+        self.type = raw.get('type')
+        self.pk = raw.get('id')
+        self.data = raw.get('data') or {}
+        self.instance = None
+        self.errors = None
+        self.update_fields = set()
+
+    def result(self):
+        if self.errors is not None:
+            return {'index': self.index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': self.errors}
+        if self.op == 'delete':
+            return {'index': self.index, 'status': status.HTTP_204_NO_CONTENT, 'id': self.pk}
+        serializer_class = BATCH_TYPES[self.type][1]
+        return {
+            'index': self.index,
+            'status': status.HTTP_201_CREATED if self.op == 'create' else status.HTTP_200_OK,
+            'data': serializer_class(self.instance).data,
+        }
+
+
+def _parse(payload):
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list) or not operations:
+        raise BatchError({'operations': ['Expected a non-empty list of operations.']})
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise BatchError({'operations': [f'At most {MAX_BATCH_OPERATIONS} operations per batch.']})
+
+    parsed = []
+    for index, raw in enumerate(operations):
+        operation = _Operation(index, raw if isinstance(raw, dict) else {})
+        if operation.op not in OPERATIONS:
+            operation.errors = {'op': [f'Expected one of: {", ".join(OPERATIONS)}.']}
+        elif operation.type not in BATCH_TYPES:
+            operation.errors = {'type': [f'Expected one of: {", ".join(BATCH_TYPES)}.']}
+        elif operation.op != 'create' and not isinstance(operation.pk, int):
+            operation.errors = {'id': ['An integer id is required.']}
+        elif not isinstance(operation.data, dict):
+            operation.errors = {'data': ['Expected an object.']}
+        parsed.append(operation)
+    return parsed
+
+
+def _validate(user, operations, card_limit, current_total):
+    for type_name, (model, serializer_class, _) in BATCH_TYPES.items():
+        ops = [o for o in operations if o.type == type_name and o.errors is None]
+        if not ops:
+            continue
+
+        # One query loads every row this batch updates or deletes
+        existing = model.objects.filter(user=user, pk__in={o.pk for o in ops if o.op != 'create'}).in_bulk()
+        creates = []
+        for operation in ops:
+            if operation.op == 'create':
+                serializer = serializer_class(data=operation.data)
+                if serializer.is_valid():
+                    operation.instance = model(user=user, **serializer.validated_data)
+                    creates.append(operation)
+                else:
+                    operation.errors = serializer.errors
+                continue
+
+            operation.instance = existing.get(operation.pk)
+            if operation.instance is None:
+                operation.errors = {'id': ['Not found.']}
+            elif operation.op == 'update':
+                serializer = serializer_class(operation.instance, data=operation.data, partial=True)
+                if serializer.is_valid():
+                    for field, value in serializer.validated_data.items():
+                        setattr(operation.instance, field, value)
+                    operation.update_fields = set(serializer.validated_data)
+                else:
+                    operation.errors = serializer.errors
+
+        if type_name == 'collection' and creates and card_limit is not None:
+            if current_total + len(creates) > card_limit:
+                for operation in creates:
+                    operation.errors = {'non_field_errors': [FREE_PLAN_LIMIT_MESSAGE]}
+
+
+def _owned(user, card_ids):
+    return set(Collection.objects.filter(user=user, card_id__in=card_ids).values_list('card_id', flat=True))
+
+
+def _summary_deltas(operations):
+    """Counter changes for the collection/wishlist rows this batch writes"""
+    deltas = dict.fromkeys(('total_cards', 'graded_cards', 'quantity_sum', 'wishlist_count'), 0)
+    deleted = {(o.type, o.pk): o.instance for o in operations if o.op == 'delete'}
+    for (type_name, _), instance in deleted.items():
+        if type_name == 'wishlist':
+            deltas['wishlist_count'] -= 1
+        elif type_name == 'collection':
+            loaded = instance._loaded_values
+            deltas['total_cards'] -= 1
+            deltas['graded_cards'] -= int(bool(loaded['is_graded']))
+            deltas['quantity_sum'] -= loaded['quantity'] or 0
+    for operation in operations:
+        instance = operation.instance
+        if operation.op == 'create' and operation.type == 'wishlist':
+            deltas['wishlist_count'] += 1
+        elif operation.type != 'collection' or (operation.type, operation.pk) in deleted:
+            continue
+        elif operation.op == 'create':
+            deltas['total_cards'] += 1
+            deltas['graded_cards'] += int(instance.is_graded)
+            deltas['quantity_sum'] += instance.quantity
+        elif operation.update_fields:
+            loaded = instance._loaded_values
+            deltas['graded_cards'] += int(instance.is_graded) - int(bool(loaded['is_graded']))
+            deltas['quantity_sum'] += instance.quantity - (loaded['quantity'] or 0)
+    return deltas
+
+
+@transaction.atomic
+def _apply(user, operations, changed_card_ids):
+    now = timezone.now()
+    deltas = _summary_deltas(operations)
+    owned_before = _owned(user, changed_card_ids) if changed_card_ids else set()
+    for type_name, (model, _, touched_field) in BATCH_TYPES.items():
+        ops = [o for o in operations if o.type == type_name]
+        creates = [o.instance for o in ops if o.op == 'create']
+        updates = [o for o in ops if o.op == 'update' and o.update_fields]
+        deletes = {o.pk for o in ops if o.op == 'delete'}
+
+        if creates:
+            model.objects.bulk_create(creates)
+        if updates:
+            fields = set().union(*(o.update_fields for o in updates))
+            if touched_field:
+                fields.add(touched_field)
+                for operation in updates:
+                    setattr(operation.instance, touched_field, now)
+            model.objects.bulk_update([o.instance for o in updates], sorted(fields))
+        if deletes:
+            # No rows reference these models, so skip the collector and its per-row post_delete
+            # handlers; the summary delta below and the caller's collection_bulk_changed cover them
+            rows = model.objects.filter(user=user, pk__in=deletes)
+            rows._raw_delete(rows.db)
+
+    # bulk writes send no signals; adjust the counters once in the same transaction
+    if changed_card_ids:
+        deltas['unique_cards'] = len(_owned(user, changed_card_ids)) - len(owned_before)
+    summary.apply_deltas(user.pk, **deltas)
+
+
+def run_batch(user, payload, card_limit, current_total):
+    """
+    Returns (status_code, results, changed collection card IDs).
+    Nothing is written unless every operation is valid.
+    """
+    operations = _parse(payload)
+    _validate(user, operations, card_limit, current_total)
+
+    if any(o.errors is not None for o in operations):
+        return status.HTTP_400_BAD_REQUEST, [o.result() for o in operations], set()
+
+    changed_card_ids = set()
+    for operation in operations:
+        if operation.type == 'collection':
+            changed_card_ids.add(operation.instance.card_id)
+            changed_card_ids.add(getattr(operation.instance, '_loaded_values', {}).get('card_id'))
+    changed_card_ids.discard(None)
+
+    try:
+        _apply(user, operations, changed_card_ids)
+    except IntegrityError:
+        raise BatchError({'non_field_errors': ['A create or update conflicts with an existing item.']},
+                         status.HTTP_409_CONFLICT) from None
+
+    return status.HTTP_200_OK, [o.result() for o in operations], changed_card_ids
@@ -0,0 +1,76 @@
+"""
+Card type and rarity breakdowns for the dashboard.
+
+One GROUP BY over the catalog rows matching the user's distinct card IDs.
+Results are cached under the user's cache version and the catalog version, so
+a Collection write (in any worker) or a catalog import moves every process on
+to a fresh key.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from catalog.models import Card, normalize_search_text
+from catalog.search import get_index_version
+from .caching import get_user_cache_version
+from .models import Collection
+
+BREAKDOWN_CACHE_TIMEOUT = 60 * 60 * 24
+
+CARD_TYPES = ['pokemon', 'trainer', 'energy']
+CARD_RARITIES = ['common', 'uncommon', 'rare', 'ultra_rare']
+RARE_RARITIES = {'rare', 'rare holo', 'holo rare'}
+
+
+def rarity_bucket(rarity):
+    rarity = normalize_search_text(rarity)
+    if not rarity or rarity == 'none':
+        return None
+    if rarity in ('common', 'uncommon'):
+        return rarity
+    if rarity in RARE_RARITIES:
+        return 'rare'
+    return 'ultra_rare'
+
+
+def _cache_key(user_id):
+    return f'collection:breakdown:{user_id}:{get_user_cache_version(user_id)}:{get_index_version()}'
+
+
+def compute_card_breakdown(user):
+    card_types = dict.fromkeys(CARD_TYPES, 0)
+    card_rarities = dict.fromkeys(CARD_RARITIES, 0)
+
+    # Category and rarity labels are only canonical in the default catalog language
+    rows = (
+        Card.objects.filter(
+            language=settings.CATALOG_DEFAULT_LANGUAGE,
+            card_id__in=Collection.objects.filter(user=user).values('card_id'),
+        )
+        .values('category', 'rarity')
+        .annotate(cards=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        category = normalize_search_text(row['category'])
+        if category in card_types:
+            card_types[category] += row['cards']
+        bucket = rarity_bucket(row['rarity'])
+        if bucket:
+            card_rarities[bucket] += row['cards']
+
+    return {'card_types': card_types, 'card_rarities': card_rarities}
+
+
+def get_card_breakdown(user):
+    user_id = getattr(user, 'pk', user)
+    breakdown = cache.get(_cache_key(user_id))
+    if breakdown is None:
+        breakdown = compute_card_breakdown(user_id)
+        cache.set(_cache_key(user_id), breakdown, BREAKDOWN_CACHE_TIMEOUT)
+    return breakdown
+
+
+def invalidate_card_breakdown(user_id):
+    # Other workers move on when the write bumps the user's cache version
+    cache.delete(_cache_key(user_id))
@@ -0,0 +1,174 @@
+"""
+Bulk collection import and streaming export.
+
+Imports read the request body line by line and upsert in batches on the
+(user, card_id, condition, variant, language) unique key, so a 5,000 card
+move is one request and a handful of queries per batch. Exports stream rows
+straight from a server-side iterator and never hold the collection in memory.
+"""
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+from subscriptions.entitlements import FREE_PLAN_LIMIT_MESSAGE
+
+from . import summary
+from .models import Collection
+from .serializers import CollectionSerializer
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+UNIQUE_FIELDS = ['user', 'card_id', 'condition', 'variant', 'language']
+EXPORT_FIELDS = ['card_id', 'quantity', 'condition', 'variant', 'language', 'is_graded', 'notes', 'added_date', 'updated_date']
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines')
+
+
+class BulkFormatError(ValueError):
+    pass
+
+
+def iter_import_rows(stream, content_type):
+    """Yield (line_number, row dict) pairs from a CSV or NDJSON request body"""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+
+    if media_type in CSV_CONTENT_TYPES:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # Blank cells fall back to the model defaults
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in (None, '')}
+    elif media_type in NDJSON_CONTENT_TYPES:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+                continue
+            yield line_number, row
+    else:
+        raise BulkFormatError('Send text/csv or application/x-ndjson')
+
+
+def _key(values):
+    for field in UNIQUE_FIELDS[1:]:
+        values.setdefault(field, Collection._meta.get_field(field).get_default())
+    return tuple(values[field] for field in UNIQUE_FIELDS[1:])
+
+
+def import_collection(user, rows, card_limit, current_total):
+    """
+    Validate and upsert `rows` batch by batch; `card_limit` is the plan's cap
+    on collection rows (None for unlimited). Returns a report dict;
+    `changed_card_ids` lets the caller refresh derived data once at the end.
+    """
+    validator = CollectionSerializer()
+    report = {'processed': 0, 'created': 0, 'updated': 0, 'rejected': 0, 'errors': []}
+    changed_card_ids = set()
+    total = current_total
+
+    def reject(line_number, errors):
+        report['rejected'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': line_number, 'errors': errors})
+
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, IMPORT_BATCH_SIZE))
+        if not batch:
+            break
+
+        valid = {}
+        for line_number, row in batch:
+            report['processed'] += 1
+            if isinstance(row, Exception):
+                reject(line_number, {'non_field_errors': [f'Invalid JSON: {row}']})
+                continue
+            if not isinstance(row, dict):
+                reject(line_number, {'non_field_errors': ['Row is not a JSON object']})
+                continue
+            try:
+                values = validator.run_validation(row)
+            except serializers.ValidationError as e:
+                reject(line_number, e.detail)
+                continue
+            # The last row wins when the same key appears twice in a batch
+            valid[_key(values)] = (line_number, values)
+
+        if not valid:
+            continue
+
+        card_ids = {key[0] for key in valid}
+        # key -> (quantity, is_graded) of the rows this batch may overwrite
+        existing = {
+            row[:-2]: row[-2:] for row in Collection.objects.filter(user=user, card_id__in=card_ids)
+            .values_list(*UNIQUE_FIELDS[1:], 'quantity', 'is_graded')
+        }
+
+        # Free plan limit is checked once per batch against the running total
+        new_keys = [key for key in valid if key not in existing]
+        if card_limit is not None:
+            allowed = max(card_limit - total, 0)
+            for key in new_keys[allowed:]:
+                reject(valid.pop(key)[0], {
+                    'non_field_errors': [FREE_PLAN_LIMIT_MESSAGE],
+                })
+            new_keys = new_keys[:allowed]
+
+        objs = [Collection(user=user, **values) for _, values in valid.values()]
+        with transaction.atomic():
+            Collection.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=UNIQUE_FIELDS,
+                update_fields=['quantity', 'is_graded', 'notes', 'updated_date'],
+            )
+            # bulk_create sends no signals; move the summary with the rows
+            summary.collection_rows_upserted(
+                user.pk, [(obj, existing.get(key)) for key, obj in zip(valid, objs)], {key[0] for key in existing},
+            )
+
+        total += len(new_keys)
+        report['created'] += len(new_keys)
+        report['updated'] += len(valid) - len(new_keys)
+        changed_card_ids.update(key[0] for key in valid)
+
+    report['changed_card_ids'] = changed_card_ids
+    return report
+
+
+class _Echo:
+    """File-like object whose write() hands back the value, for csv.writer streaming"""
+
+    def write(self, value):
+        return value
+
+
+def _export_rows(user):
+    return (
+        Collection.objects.filter(user=user)
+        .order_by('id')
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=2000)
+    )
+
+
+def stream_csv(user):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _export_rows(user):
+        yield writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+
+
+def stream_ndjson(user):
+    for row in _export_rows(user):
+        item = dict(zip(EXPORT_FIELDS, row))
+        item['added_date'] = item['added_date'].isoformat()
+        item['updated_date'] = item['updated_date'].isoformat()
+        yield json.dumps(item) + '\n'
@@ -0,0 +1,104 @@
+"""
+Per-user response caching with write-through invalidation.
+
+Each user has a version number in the 'shared' cache, bumped by every
+Collection, Wishlist, CardNote or Subscription write. Every worker process
+must see the same version, so that alias may not be process-local (see
+collection.checks); response bodies can stay in the default cache, since
+their keys include the version. Cached responses are keyed by that
+version, so a bump invalidates all of them at once without touching any
+key. The version doubles as ETag and Last-Modified, which lets an unchanged
+request get a 304 after a single cache read and no database work at all.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache, caches
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+RESPONSE_CACHE_TIMEOUT = 60 * 15
+VERSION_CACHE_ALIAS = 'shared'
+
+
+def _version_key(user_id):
+    return f'user-cache-version:{user_id}'
+
+
+def get_user_cache_version(user_id):
+    """Current version, in milliseconds since the epoch of the last write"""
+    versions = caches[VERSION_CACHE_ALIAS]
+    version = versions.get(_version_key(user_id))
+    if version is None:
+        version = int(time.time() * 1000)
+        # add() so two processes racing on a cold cache agree on one value
+        if not versions.add(_version_key(user_id), version, None):
+            version = versions.get(_version_key(user_id), version)
+    return version
+
+
+def bump_user_cache_version(user_id):
+    versions = caches[VERSION_CACHE_ALIAS]
+    previous = versions.get(_version_key(user_id)) or 0
+    versions.set(_version_key(user_id), max(int(time.time() * 1000), previous + 1), None)
+
+
+def _etag(view_name, user_id, version, query):
+    digest = hashlib.sha1(f'{view_name}:{user_id}:{version}:{query}'.encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _not_modified(request, etag, last_modified):
+    # If-None-Match wins: Last-Modified only has one-second resolution
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        return etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def _owner_id(request, kwargs):
+    return kwargs.get('user_id') or request.user.pk
+
+
+def cached_user_response(view_func=None, timeout=RESPONSE_CACHE_TIMEOUT, cache_control='private, no-cache'):
+    """
+    Cache a function view's 200 responses per owner (the `user_id` URL kwarg for
+    shared views, otherwise the authenticated user). Apply below @api_view and
+    @permission_classes so permission checks still run first.
+    """
+    def decorator(func):
+        view_name = f'{func.__module__}.{func.__name__}'
+
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            user_id = _owner_id(request, kwargs)
+            version = get_user_cache_version(user_id)
+            query = request.META.get('QUERY_STRING', '')
+            etag = _etag(view_name, user_id, version, query)
+            last_modified = version // 1000
+
+            if _not_modified(request, etag, last_modified):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                key = f'user-response:{etag}'
+                data = cache.get(key)
+                if data is None:
+                    response = func(request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    cache.set(key, response.data, timeout)
+                else:
+                    response = Response(data)
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            response['Cache-Control'] = cache_control
+            response['Vary'] = 'Authorization'
+            return response
+
+        return wrapper
+
+    return decorator(view_func) if view_func else decorator
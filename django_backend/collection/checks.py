@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .caching import VERSION_CACHE_ALIAS
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_version_cache(app_configs, **kwargs):
+    """Per-user cache versions must be visible to every worker process"""
+    config = settings.CACHES.get(VERSION_CACHE_ALIAS)
+    if config is None:
+        return [Error(
+            f"CACHES has no '{VERSION_CACHE_ALIAS}' alias for per-user cache versions.",
+            hint='Point it at a cache every worker shares (file, db or redis).',
+            id='collection.E001',
+        )]
+    if config['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f"CACHES['{VERSION_CACHE_ALIAS}'] is process-local, so a write served by one worker "
+            'would not invalidate cached responses in the others.',
+            hint='Point it at a cache every worker shares (file, db or redis).',
+            id='collection.E002',
+        )]
+    return []
@@ -0,0 +1,107 @@
+"""
+Set-completion engine.
+
+SetProgress rows hold per-user, per-set owned counters. A Collection write only
+refreshes the sets touched by the changed card IDs, which costs one catalog read
+and one indexed collection read bounded by the size of the set.
+"""
+from django.conf import settings
+from django.db.models import Count, F, Q
+
+from catalog.models import Card, CardSet
+from .models import Collection, SetProgress
+
+# TCGdex `variants` flags mapped onto Collection.VARIANT_CHOICES
+CATALOG_VARIANTS = {
+    'normal': 'normal',
+    'reverse': 'reverse_holo',
+    'holo': 'holo',
+    'firstEdition': 'first_edition',
+}
+REGULAR_VARIANTS = {'normal', 'holo'}
+
+
+def printed_variants(card_variants):
+    variants = {CATALOG_VARIANTS[key] for key, printed in (card_variants or {}).items()
+                if printed and key in CATALOG_VARIANTS}
+    return variants or {'normal'}
+
+
+def _canonical_set(set_id):
+    """The catalog copy of a set used for totals, preferring the default catalog language"""
+    sets = CardSet.objects.filter(set_id=set_id)
+    return (sets.filter(language=settings.CATALOG_DEFAULT_LANGUAGE).first()
+            or sets.order_by('language').first())
+
+
+def set_ids_for_cards(card_ids):
+    return set(
+        Card.objects.filter(card_id__in=set(card_ids), card_set__isnull=False)
+        .values_list('card_set__set_id', flat=True)
+        .distinct()
+    )
+
+
+def refresh_set_progress(user_id, set_id):
+    card_set = _canonical_set(set_id)
+    if card_set is None:
+        SetProgress.objects.filter(user_id=user_id, set_id=set_id).delete()
+        return None
+
+    cards = {card_id: (number, printed_variants(variants))
+             for card_id, number, variants in card_set.cards.values_list('card_id', 'number', 'variants')}
+
+    owned = {}
+    for card_id, variant in Collection.objects.filter(
+        user_id=user_id, card_id__in=list(cards)
+    ).values_list('card_id', 'variant'):
+        owned.setdefault(card_id, set()).add(variant)
+
+    if not owned:
+        SetProgress.objects.filter(user_id=user_id, set_id=set_id).delete()
+        return None
+
+    official = card_set.card_count_official
+    counters = {
+        'owned_cards': len(owned),
+        'owned_regular': sum(1 for variants in owned.values() if variants & REGULAR_VARIANTS),
+        'owned_variants': sum(len(variants & cards[card_id][1]) for card_id, variants in owned.items()),
+        'owned_standard': sum(1 for card_id in owned
+                              if cards[card_id][0] is not None and 1 <= cards[card_id][0] <= official),
+        'owned_reverse': sum(1 for card_id, variants in owned.items()
+                             if 'reverse_holo' in variants and 'reverse_holo' in cards[card_id][1]),
+        'total_cards': max(card_set.card_count_total, len(cards)),
+        'official_cards': official,
+        'variant_total': sum(len(printed) for _, printed in cards.values()),
+        'reverse_total': sum(1 for _, printed in cards.values() if 'reverse_holo' in printed),
+    }
+    progress, _ = SetProgress.objects.update_or_create(user_id=user_id, set_id=set_id, defaults=counters)
+    return progress
+
+
+def refresh_cards(user_id, card_ids):
+    """Refresh every set containing one of `card_ids` for this user"""
+    for set_id in set_ids_for_cards(card_ids):
+        refresh_set_progress(user_id, set_id)
+
+
+def rebuild_user_progress(user_id):
+    card_ids = Collection.objects.filter(user_id=user_id).values_list('card_id', flat=True).distinct()
+    set_ids = set_ids_for_cards(card_ids)
+    SetProgress.objects.filter(user_id=user_id).exclude(set_id__in=set_ids).delete()
+    for set_id in set_ids:
+        refresh_set_progress(user_id, set_id)
+    return len(set_ids)
+
+
+def get_sets_completed(user):
+    """Completed-set counts for the dashboard, one aggregate over the user's SetProgress rows"""
+    complete = Q(total_cards__gt=0)
+    counts = SetProgress.objects.filter(user=user).aggregate(
+        any_variant=Count('id', filter=complete & Q(owned_cards__gte=F('total_cards'))),
+        regular_variants=Count('id', filter=complete & Q(owned_regular__gte=F('total_cards'))),
+        all_variants=Count('id', filter=complete & Q(owned_variants__gte=F('variant_total'))),
+        standard_set=Count('id', filter=Q(official_cards__gt=0, owned_standard__gte=F('official_cards'))),
+        parallel_set=Count('id', filter=Q(reverse_total__gt=0, owned_reverse__gte=F('reverse_total'))),
+    )
+    return counts
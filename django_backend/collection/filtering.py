@@ -0,0 +1,199 @@
+"""
+Filtering, sorting and facet counts for a user's collection.
+
+CollectionFilter turns query parameters into ORM filters. Facets come from a
+single GROUP BY over (condition, variant, language, is_graded, set) on the
+rows matching the range and text filters. Each dimension's counts apply every
+other selected facet in Python but not its own, so with condition=near_mint
+selected the condition facet still shows what the other conditions would add.
+"""
+from collections import Counter
+from datetime import datetime, time
+
+from django.conf import settings
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from catalog.models import Card
+from .models import Collection
+
+# facet name -> field of the grouped rows
+FACET_FIELDS = {
+    'condition': 'condition',
+    'variant': 'variant',
+    'language': 'language',
+    'graded': 'is_graded',
+    'set': 'set_id',
+}
+ORDERINGS = {
+    'added_date': ['added_date', 'id'],
+    '-added_date': ['-added_date', '-id'],
+    'updated_date': ['updated_date', 'id'],
+    '-updated_date': ['-updated_date', '-id'],
+    'quantity': ['quantity', 'id'],
+    '-quantity': ['-quantity', '-id'],
+    'card_id': ['card_id', 'id'],
+    '-card_id': ['-card_id', '-id'],
+}
+DEFAULT_ORDERING = '-added_date'
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _values(params, name):
+    """Comma-separated and/or repeated parameter values"""
+    return [value.strip() for raw in params.getlist(name) for value in raw.split(',') if value.strip()]
+
+
+def _parse_moment(value, name, end_of_day=False):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError({name: 'Use YYYY-MM-DD or an ISO 8601 datetime.'})
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _parse_int(value, name):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a whole number.'}) from None
+
+
+def set_id_expression():
+    """The card's TCGdex set id from the default-language catalog ('' if unknown)"""
+    return Coalesce(
+        Subquery(
+            Card.objects.filter(card_id=OuterRef('card_id'), language=settings.CATALOG_DEFAULT_LANGUAGE)
+            .values('card_set__set_id')[:1]
+        ),
+        Value(''),
+    )
+
+
+class CollectionFilter:
+    """
+    Parameters: condition, variant, language, set (comma-separated or repeated),
+    graded (true/false), added_after/added_before (date or datetime),
+    quantity_min/quantity_max, q (text in the notes) and ordering.
+    """
+
+    def __init__(self, params):
+        self.selected = {}
+        for facet, choices in (
+            ('condition', Collection.CONDITION_CHOICES),
+            ('variant', Collection.VARIANT_CHOICES),
+            ('language', Collection.LANGUAGE_CHOICES),
+        ):
+            values = _values(params, facet)
+            invalid = set(values) - set(dict(choices))
+            if invalid:
+                raise ValidationError({facet: f"Unknown value(s): {', '.join(sorted(invalid))}"})
+            if values:
+                self.selected[facet] = set(values)
+
+        graded = params.get('graded', '').lower()
+        if graded:
+            if graded not in BOOLEAN_VALUES:
+                raise ValidationError({'graded': 'Use true or false.'})
+            self.selected['graded'] = {BOOLEAN_VALUES[graded]}
+
+        sets = _values(params, 'set')
+        if sets:
+            self.selected['set'] = set(sets)
+
+        self.added_after = _parse_moment(params['added_after'], 'added_after') if params.get('added_after') else None
+        self.added_before = (
+            _parse_moment(params['added_before'], 'added_before', end_of_day=True) if params.get('added_before') else None
+        )
+        self.quantity_min = _parse_int(params['quantity_min'], 'quantity_min') if params.get('quantity_min') else None
+        self.quantity_max = _parse_int(params['quantity_max'], 'quantity_max') if params.get('quantity_max') else None
+        self.text = params.get('q', '').strip()
+
+        self.ordering = params.get('ordering', DEFAULT_ORDERING)
+        if self.ordering not in ORDERINGS:
+            raise ValidationError({'ordering': f"Use one of: {', '.join(ORDERINGS)}"})
+
+    def base_queryset(self, user):
+        """The user's rows matching the range and text filters (not the facets)"""
+        queryset = Collection.objects.filter(user=user)
+        if self.added_after is not None:
+            queryset = queryset.filter(added_date__gte=self.added_after)
+        if self.added_before is not None:
+            queryset = queryset.filter(added_date__lte=self.added_before)
+        if self.quantity_min is not None:
+            queryset = queryset.filter(quantity__gte=self.quantity_min)
+        if self.quantity_max is not None:
+            queryset = queryset.filter(quantity__lte=self.quantity_max)
+        if self.text:
+            queryset = queryset.filter(notes__icontains=self.text)
+        return queryset
+
+    def results_queryset(self, user):
+        queryset = self.base_queryset(user)
+        for facet, values in self.selected.items():
+            if facet == 'set':
+                queryset = queryset.filter(card_id__in=Card.objects.filter(
+                    language=settings.CATALOG_DEFAULT_LANGUAGE, card_set__set_id__in=values,
+                ).values('card_id'))
+            else:
+                queryset = queryset.filter(**{f'{FACET_FIELDS[facet]}__in': values})
+        return queryset.order_by(*ORDERINGS[self.ordering])
+
+    def groups(self, user):
+        """One row per facet-value combination, with its row count and range aggregates"""
+        return list(
+            self.base_queryset(user)
+            .annotate(set_id=set_id_expression())
+            .values(*FACET_FIELDS.values())
+            .annotate(
+                rows=Count('id'), cards=Sum('quantity'),
+                first_added=Min('added_date'), last_added=Max('added_date'),
+                min_quantity=Min('quantity'), max_quantity=Max('quantity'),
+            )
+            .order_by()
+        )
+
+    def _matches(self, group, skip=None):
+        return all(
+            group[FACET_FIELDS[facet]] in values
+            for facet, values in self.selected.items() if facet != skip
+        )
+
+    def facets(self, groups):
+        """{facet: [{'value', 'count'}]}, most common first, selected values always listed"""
+        facets = {}
+        for facet, field in FACET_FIELDS.items():
+            counts = Counter()
+            for group in groups:
+                if self._matches(group, skip=facet):
+                    counts[group[field]] += group['rows']
+            for value in self.selected.get(facet, ()):
+                counts.setdefault(value, 0)
+            facets[facet] = [
+                {'value': value, 'count': count}
+                for value, count in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+            ]
+        return facets
+
+    def summary(self, groups):
+        """Totals and value ranges over the rows matching every filter"""
+        matching = [group for group in groups if self._matches(group)]
+        return {
+            'rows': sum(group['rows'] for group in matching),
+            'cards': sum(group['cards'] for group in matching),
+            'added_date': {
+                'min': min((group['first_added'] for group in matching), default=None),
+                'max': max((group['last_added'] for group in matching), default=None),
+            },
+            'quantity': {
+                'min': min((group['min_quantity'] for group in matching), default=None),
+                'max': max((group['max_quantity'] for group in matching), default=None),
+            },
+        }
@@ -0,0 +1,210 @@
+import random
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from collection.models import CardNote, Collection, Wishlist
+from collection.pagination import KeysetPagination
+from collection.summary import get_summary
+
+SEED_BATCH_SIZE = 5000
+# Plan fragments meaning a full scan or a sort step, per backend
+BAD_PLAN_MARKERS = {
+    'sqlite': ['SCAN ', 'USE TEMP B-TREE'],
+    'postgresql': ['Seq Scan', 'Sort '],
+}
+# Sorts that only order rows tied on an already index-ordered prefix
+TOLERATED_PLAN_MARKERS = {
+    'sqlite': ['FOR RIGHT PART OF ORDER BY'],
+    'postgresql': ['Incremental Sort'],
+}
+# Plan lines naming the index search condition, per backend
+INDEX_ACCESS_MARKERS = {
+    'sqlite': 'USING INDEX',
+    'postgresql': 'Index Cond:',
+}
+LIST_TABLES = [model._meta.db_table for model in (Collection, Wishlist, CardNote)]
+# Keyset pages are checked from a cursor this far down the list
+DEEP_CURSOR_OFFSET = 1000
+# Bodies and ETags cached by earlier requests would hide the queries
+NO_CACHE = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'shared')
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def deep_cursor(queryset, date_field, id_field='id', id_prefix=''):
+    """A cursor well into the list, encoded as the paginator does; None for short lists"""
+    paginator = KeysetPagination(date_field, id_field)
+    row = queryset.order_by(*paginator.get_ordering()).values(date_field, id_field)[DEEP_CURSOR_OFFSET:][:1].first()
+    if row is None:
+        return None
+    if id_prefix:
+        row[id_field] = f'{id_prefix}{row[id_field]}'
+    return paginator.encode_cursor(row)
+
+
+def endpoint_requests(user_id):
+    """Requests to each per-user list endpoint, first and deep pages"""
+    collection = Collection.objects.filter(user_id=user_id)
+    collection_cursor = deep_cursor(collection, 'added_date')
+    wishlist_cursor = deep_cursor(Wishlist.objects.filter(user_id=user_id), 'added_date')
+    graded_cursor = deep_cursor(collection.filter(is_graded=True), 'added_date')
+    notes_cursor = deep_cursor(CardNote.objects.filter(user_id=user_id), 'created_at')
+    activity_cursor = deep_cursor(collection.annotate(activity_date=F('added_date')), 'activity_date', 'id', 'collection_')
+
+    # (name, path, params, date column the deep page's index scan must start from)
+    endpoints = [
+        ('collection list', '/api/collection/', {}, None),
+        ('collection list (page 50)', '/api/collection/', {'page': 50}, None),
+        ('collection cursor', '/api/collection/', {'pagination': 'cursor'}, None),
+        ('collection deep cursor', '/api/collection/', {'cursor': collection_cursor}, 'added_date'),
+        ('user collection deep cursor', '/api/user/collection/', {'cursor': collection_cursor}, 'added_date'),
+        ('graded cards', '/api/user/graded/', {}, None),
+        ('graded deep cursor', '/api/user/graded/', {'cursor': graded_cursor}, 'added_date'),
+        ('wishlist list', '/api/wishlist/', {}, None),
+        ('wishlist deep cursor', '/api/wishlist/', {'cursor': wishlist_cursor}, 'added_date'),
+        ('card notes', '/api/notes/', {}, None),
+        ('card notes deep cursor', '/api/notes/', {'cursor': notes_cursor}, 'created_at'),
+        ('activity deep cursor', '/api/activities/', {'cursor': activity_cursor}, 'added_date'),
+        ('shared collection deep cursor', f'/api/shared/collection/{user_id}/', {'cursor': collection_cursor}, 'added_date'),
+    ]
+    # Lists shorter than DEEP_CURSOR_OFFSET have no deep page to check
+    return [endpoint for endpoint in endpoints if None not in endpoint[2].values()]
+
+
+def endpoint_queries(user, name, path, params):
+    """SQL run against the list tables when the real view serves the request"""
+    request = APIRequestFactory().get(path, params)
+    force_authenticate(request, user=user)
+    match = resolve(path)
+    with override_settings(CACHES=NO_CACHE), CaptureQueriesContext(connection) as captured:
+        response = match.func(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise CommandError(f'{name}: GET {path} answered {response.status_code}')
+    return [
+        query['sql'] for query in captured.captured_queries
+        if query['sql'].startswith('SELECT') and any(f'"{table}"' in query['sql'] for table in LIST_TABLES)
+    ]
+
+
+def unbounded_index_scans(plan, column):
+    """Index accesses in the plan that do not seek on `column`, i.e. read the list from its top"""
+    access = INDEX_ACCESS_MARKERS[connection.vendor]
+    return [
+        line.strip() for line in plan.splitlines()
+        if access in line and not re.search(rf'\b{column}"?\s*[<>]', line)
+    ]
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve each per-user list endpoint (first and deep pages) through its view, EXPLAIN the list '
+        'queries it runs and fail if any needs a full scan or a sort. '
+        'With --seed N, first inserts N collection rows (plus wishlist and notes) for a scratch user '
+        'inside a transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Rows to seed, e.g. 1000000')
+        parser.add_argument('--user', type=int, help='Explain for this user id (default: scratch or first user)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan')
+
+    def handle(self, *args, **options):
+        markers = BAD_PLAN_MARKERS.get(connection.vendor)
+        if markers is None:
+            raise CommandError(f'No plan checks for the {connection.vendor} backend')
+
+        failures = []
+        try:
+            with transaction.atomic():
+                user_id = options['user']
+                if options['seed']:
+                    user_id = self.seed(options['seed'])
+                elif user_id is None:
+                    user_id = get_user_model().objects.values_list('pk', flat=True).first()
+                if user_id is None:
+                    raise CommandError('No users; pass --seed N')
+                failures = self.check_plans(user_id, markers, options['verbose_plans'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError('Query plan regressions:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('All list queries use an index without sorting'))
+
+    def check_plans(self, user_id, markers, verbose):
+        user = get_user_model().objects.get(pk=user_id)
+        # Built once per user by a full aggregate; list requests only read it
+        get_summary(user)
+        tolerated = TOLERATED_PLAN_MARKERS.get(connection.vendor, [])
+        failures = []
+        for name, path, params, cursor_column in endpoint_requests(user_id):
+            for sql in endpoint_queries(user, name, path, params):
+                plan = explain(sql)
+                if verbose:
+                    self.stdout.write(f'{name}:\n{sql}\n{plan}\n')
+                bad = [
+                    line.strip() for line in plan.splitlines()
+                    if any(marker in line for marker in markers) and not any(ok in line for ok in tolerated)
+                ]
+                if cursor_column and 'ORDER BY' in sql:
+                    # Deep pages must seek to the cursor, not walk the index from the first row
+                    bad += unbounded_index_scans(plan, cursor_column)
+                if bad:
+                    failures.append(f'  {name}: ' + '; '.join(bad))
+        return failures
+
+    def seed(self, rows):
+        User = get_user_model()
+        user = User.objects.create_user(
+            username='query-plan-check@example.com', email='query-plan-check@example.com', password=None,
+        )
+        # A second user so the user_id prefix is selective, as in production
+        other = User.objects.create_user(
+            username='query-plan-other@example.com', email='query-plan-other@example.com', password=None,
+        )
+        conditions = [choice for choice, _ in Collection.CONDITION_CHOICES]
+        variants = [choice for choice, _ in Collection.VARIANT_CHOICES]
+        self.stdout.write(f'Seeding {rows} collection rows...')
+
+        def batches(total, build):
+            for offset in range(0, total, SEED_BATCH_SIZE):
+                yield [build(i) for i in range(offset, min(offset + SEED_BATCH_SIZE, total))]
+
+        for owner, count in ((user, rows), (other, max(rows // 10, 1))):
+            for batch in batches(count, lambda i: Collection(
+                user=owner,
+                card_id=f'seed{i // 500}-{i % 500}',
+                condition=random.choice(conditions),
+                variant=random.choice(variants),
+                is_graded=random.random() < 0.05,
+            )):
+                Collection.objects.bulk_create(batch, ignore_conflicts=True)
+
+        side_rows = max(rows // 10, 1)
+        for batch in batches(side_rows, lambda i: Wishlist(user=user, card_id=f'wish{i}')):
+            Wishlist.objects.bulk_create(batch)
+        for batch in batches(side_rows, lambda i: CardNote(user=user, card_id=f'note{i}', note='seed')):
+            CardNote.objects.bulk_create(batch)
+
+        # Planner statistics for the seeded tables
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return user.pk
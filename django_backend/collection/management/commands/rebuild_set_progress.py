@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from collection.completion import rebuild_user_progress
+from collection.models import Collection
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-user set-completion counters (run after importing or updating the catalog)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Only rebuild these user IDs')
+
+    def handle(self, *args, **options):
+        user_ids = options['users'] or Collection.objects.values_list('user_id', flat=True).distinct()
+        total_users = total_sets = 0
+        for user_id in user_ids:
+            total_sets += rebuild_user_progress(user_id)
+            total_users += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total_sets} set(s) for {total_users} user(s)'))
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from collection.summary import rebuild_summary
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recompute CollectionSummary rows from Collection and Wishlist to repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Only rebuild these user IDs')
+
+    def handle(self, *args, **options):
+        user_ids = options['users'] or User.objects.values_list('id', flat=True).iterator()
+        rebuilt = 0
+        for user_id in user_ids:
+            rebuild_summary(user_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} collection summar{"y" if rebuilt == 1 else "ies"}'))
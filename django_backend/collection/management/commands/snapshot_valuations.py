@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from collection.models import Collection
+from collection.valuation import compute_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Store daily collection value snapshots (run once a day; --backfill-days fills price history)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Valuation date (YYYY-MM-DD, default: today)')
+        parser.add_argument('--backfill-days', type=int, default=0,
+                            help='Also value the current holdings at each of the previous N days')
+        parser.add_argument('--user', type=int, action='append', dest='users')
+
+    def handle(self, *args, **options):
+        as_of = parse_date(options['date']) if options['date'] else timezone.localdate()
+        dates = [as_of - timedelta(days=offset) for offset in range(options['backfill_days'] + 1)]
+        user_ids = options['users'] or Collection.objects.values_list('user_id', flat=True).distinct()
+
+        snapshots = 0
+        for user_id in user_ids:
+            for date in dates:
+                compute_snapshot(user_id, date)
+                snapshots += 1
+        self.stdout.write(self.style.SUCCESS(f'Stored {snapshots} valuation snapshot(s)'))
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('collection', '0003_cardnote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SetProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('set_id', models.CharField(max_length=50)),
+                ('owned_cards', models.PositiveIntegerField(default=0)),
+                ('owned_regular', models.PositiveIntegerField(default=0)),
+                ('owned_variants', models.PositiveIntegerField(default=0)),
+                ('owned_standard', models.PositiveIntegerField(default=0)),
+                ('owned_reverse', models.PositiveIntegerField(default=0)),
+                ('total_cards', models.PositiveIntegerField(default=0)),
+                ('official_cards', models.PositiveIntegerField(default=0)),
+                ('variant_total', models.PositiveIntegerField(default=0)),
+                ('reverse_total', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='set_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'set_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_profile_picture'),
+        ('collection', '0004_setprogress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='collection_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_cards', models.PositiveIntegerField(default=0)),
+                ('unique_cards', models.PositiveIntegerField(default=0)),
+                ('graded_cards', models.PositiveIntegerField(default=0)),
+                ('quantity_sum', models.PositiveIntegerField(default=0)),
+                ('wishlist_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('collection', '0006_collectionvaluesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharedSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=50)),
+                ('query', models.CharField(blank=True, max_length=255)),
+                ('version', models.BigIntegerField()),
+                ('etag', models.CharField(max_length=64)),
+                ('body', models.BinaryField()),
+                ('max_age', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shared_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'endpoint', 'query')},
+            },
+        ),
+    ]
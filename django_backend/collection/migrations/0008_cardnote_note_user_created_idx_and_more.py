@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection', '0007_sharedsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cardnote',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='note_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collection',
+            index=models.Index(fields=['user', '-added_date', '-id'], name='coll_user_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collection',
+            index=models.Index(fields=['user', 'is_graded', '-added_date', '-id'], name='coll_user_graded_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wishlist',
+            index=models.Index(fields=['user', '-added_date', '-id'], name='wish_user_added_idx'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 class Collection(models.Model):
@@ -46,11 +46,22 @@ class Collection(models.Model):
     updated_date = models.DateTimeField(auto_now=True)
 
     class Meta:
+        # The unique constraint's (user, card_id, ...) prefix serves per-card lookups
         unique_together = ['user', 'card_id', 'condition', 'variant', 'language']
+        indexes = [
+            # Trailing -id matches the keyset tie-breaker, so no list needs a sort step
+            models.Index(fields=['user', '-added_date', '-id'], name='coll_user_added_idx'),
+            models.Index(fields=['user', 'is_graded', '-added_date', '-id'], name='coll_user_graded_added_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.card_id} ({self.quantity})"
 
+    def save(self, *args, **kwargs):
+        # post_save adjusts CollectionSummary: commit the row and the counters together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 class Wishlist(models.Model):
     PRIORITY_CHOICES = [
         ('low', 'Low'),
@@ -67,10 +78,18 @@ class Wishlist(models.Model):
 
     class Meta:
         unique_together = ['user', 'card_id']
+        indexes = [
+            models.Index(fields=['user', '-added_date', '-id'], name='wish_user_added_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.card_id}"
 
+    def save(self, *args, **kwargs):
+        # post_save adjusts CollectionSummary: commit the row and the counters together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 class CardNote(models.Model):
     """Standalone notes for cards that aren't in collection or wishlist"""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -81,6 +100,89 @@ class CardNote(models.Model):
 
     class Meta:
         unique_together = ['user', 'card_id']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='note_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.card_id} - Note"
+
+class SetProgress(models.Model):
+    """
+    Per-user, per-set owned counters, kept current by Collection signals so the
+    dashboard reads O(sets) rows instead of joining the whole collection.
+    Totals are copied from the catalog when the row is refreshed.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='set_progress')
+    set_id = models.CharField(max_length=50)  # TCGdex set ID
+    owned_cards = models.PositiveIntegerField(default=0)  # Distinct cards, any variant
+    owned_regular = models.PositiveIntegerField(default=0)  # Distinct cards owned as normal or holo
+    owned_variants = models.PositiveIntegerField(default=0)  # Distinct (card, printed variant) pairs
+    owned_standard = models.PositiveIntegerField(default=0)  # Distinct cards numbered within the official count
+    owned_reverse = models.PositiveIntegerField(default=0)  # Distinct cards owned as reverse holo
+    total_cards = models.PositiveIntegerField(default=0)
+    official_cards = models.PositiveIntegerField(default=0)
+    variant_total = models.PositiveIntegerField(default=0)
+    reverse_total = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'set_id']
+
+    def __str__(self):
+        return f"{self.user.email} - {self.set_id} ({self.owned_cards}/{self.total_cards})"
+
+class CollectionSummary(models.Model):
+    """
+    Materialized per-user totals, maintained incrementally by Collection and
+    Wishlist signals (see collection.summary) so stats endpoints are a single
+    primary-key lookup. `rebuild_summaries` repairs any drift.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='collection_summary')
+    total_cards = models.PositiveIntegerField(default=0)  # Collection rows
+    unique_cards = models.PositiveIntegerField(default=0)  # Distinct card IDs
+    graded_cards = models.PositiveIntegerField(default=0)
+    quantity_sum = models.PositiveIntegerField(default=0)
+    wishlist_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.email} - {self.total_cards} cards"
+
+class CollectionValueSnapshot(models.Model):
+    """Daily per-user collection value, so repeat valuation requests skip the aggregation"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='value_snapshots')
+    date = models.DateField()
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    currency = models.CharField(max_length=3, default='USD')
+    priced_cards = models.PositiveIntegerField(default=0)  # Quantity with a known price
+    total_quantity = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'date']
+
+    def __str__(self):
+        return f"{self.user.email} - {self.date}: {self.value} {self.currency}"
+
+class SharedSnapshot(models.Model):
+    """
+    Pre-rendered, gzip-compressed JSON of a public shared-dashboard response.
+    Served as-is until `expires_at`, then revalidated against the owner's
+    cache version (see collection.snapshots).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='shared_snapshots')
+    endpoint = models.CharField(max_length=50)
+    query = models.CharField(max_length=255, blank=True)
+    version = models.BigIntegerField()
+    etag = models.CharField(max_length=64)
+    body = models.BinaryField()
+    max_age = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ['user', 'endpoint', 'query']
+
+    def __str__(self):
+        return f"{self.user_id} - {self.endpoint}?{self.query}"
@@ -0,0 +1,160 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from catalog.hydration import embed_cards, expand_requested
+
+
+class CustomPageNumberPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetPagination:
+    """
+    Cursor pagination on a (date, id) pair, newest first.
+
+    Each page is `WHERE (date, id) < cursor ORDER BY date DESC, id DESC LIMIT n`,
+    so page 500 costs the same as page 1: no OFFSET and no COUNT(*). Rows may be
+    model instances or dicts (e.g. from a UNION ALL `values()` queryset), and
+    ids ints or strings (`id_type`).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+
+    def __init__(self, date_field='added_date', id_field='id', id_type=int):
+        self.date_field = date_field
+        self.id_field = id_field
+        self.id_type = id_type
+
+    @classmethod
+    def requested(cls, request):
+        """Cursor mode is opt-in: ?pagination=cursor or an explicit ?cursor="""
+        return request.query_params.get('pagination') == 'cursor' or cls.cursor_query_param in request.query_params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            date, row_id = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            date = parse_datetime(date) if isinstance(date, str) else None
+        except (TypeError, ValueError):
+            date = None
+        # bool is an int subclass but never a row id
+        if date is None or type(row_id) is not self.id_type:
+            raise NotFound('Invalid cursor')
+        return date, row_id
+
+    def encode_cursor(self, row):
+        value = json.dumps([self._value(row, self.date_field).isoformat(), self._value(row, self.id_field)])
+        return base64.urlsafe_b64encode(value.encode()).decode()
+
+    def get_cursor_filter(self, request):
+        """Q selecting the rows after the requested cursor, or None for the first page"""
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            return None
+        date, row_id = cursor
+        # The plain `date <= cursor` bound lets the (user, date, id) index range-scan
+        # from the cursor; the OR alone would be checked row by row from the top
+        return Q(**{f'{self.date_field}__lte': date}) & (
+            Q(**{f'{self.date_field}__lt': date}) | Q(**{self.date_field: date, f'{self.id_field}__lt': row_id})
+        )
+
+    def get_ordering(self):
+        return [f'-{self.date_field}', f'-{self.id_field}']
+
+    def paginate_ordered(self, queryset, request):
+        """Slice an already filtered and ordered queryset into one page"""
+        self.request = request
+        size = self.get_page_size(request)
+        rows = list(queryset[:size + 1])
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        return self.page
+
+    def paginate_queryset(self, queryset, request):
+        cursor_filter = self.get_cursor_filter(request)
+        if cursor_filter is not None:
+            queryset = queryset.filter(cursor_filter)
+        return self.paginate_ordered(queryset.order_by(*self.get_ordering()), request)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, 'pagination', 'cursor')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data, **extra):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            **extra,
+            'results': data,
+        })
+
+    @staticmethod
+    def _value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+class SelectablePagination(BasePagination):
+    """
+    Page-number paging by default; keyset paging on (date_field, id) with
+    ?pagination=cursor. In cursor mode the response carries `count` only when
+    a cheap one is available: the `count` callable passed in, or the view's
+    `get_cached_count()`. It never runs COUNT(*). With ?expand=card each
+    row also embeds its catalog card.
+    """
+    date_field = 'added_date'
+    # Every query parameter this paginator reads (e.g. for cache keys)
+    query_params = ('page', 'page_size', 'pagination', 'cursor', 'expand', 'card_language')
+
+    def __init__(self, count=None, date_field=None):
+        self.count = count
+        if date_field:
+            self.date_field = date_field
+        self.delegate = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if KeysetPagination.requested(request):
+            self.delegate = KeysetPagination(self.date_field, 'id')
+            if self.count is None and hasattr(view, 'get_cached_count'):
+                self.count = view.get_cached_count
+            return self.delegate.paginate_queryset(queryset, request)
+        self.delegate = CustomPageNumberPagination()
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if expand_requested(self.request):
+            data = embed_cards(self.request, data)
+        if isinstance(self.delegate, KeysetPagination):
+            extra = {'count': self.count()} if self.count is not None else {}
+            return self.delegate.get_paginated_response(data, **extra)
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return CustomPageNumberPagination().get_paginated_response_schema(schema)
+
+
+class CreatedSelectablePagination(SelectablePagination):
+    date_field = 'created_at'
@@ -10,6 +10,8 @@ class CollectionSerializer(serializers.ModelSerializer):
             'language', 'is_graded', 'notes', 'added_date', 'updated_date'
         ]
         read_only_fields = ['user', 'added_date', 'updated_date']
+        # Matches the CHECK constraint of PositiveIntegerField, which DRF does not infer on every backend
+        extra_kwargs = {'quantity': {'min_value': 0}}
 
 class WishlistSerializer(serializers.ModelSerializer):
     class Meta:
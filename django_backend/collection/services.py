@@ -0,0 +1,16 @@
+"""
+Hooks for collection writes that bypass model signals (bulk_create,
+bulk_update, queryset.update). Signal-driven writes keep derived data current
+row by row; bulk paths call these once per request instead. CollectionSummary
+is not refreshed here: bulk writers update it inside their own transaction.
+"""
+from . import breakdown, completion, valuation
+from .caching import bump_user_cache_version
+
+
+def collection_bulk_changed(user_id, card_ids):
+    """Bring the caches and tables derived from a user's collection up to date"""
+    breakdown.invalidate_card_breakdown(user_id)
+    valuation.invalidate_current_valuation(user_id)
+    completion.refresh_cards(user_id, card_ids)
+    bump_user_cache_version(user_id)
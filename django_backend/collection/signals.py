@@ -0,0 +1,63 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Collection, Wishlist, CardNote
+from .caching import bump_user_cache_version
+from . import breakdown, completion, summary, valuation
+from subscriptions.models import Subscription
+
+
+@receiver(post_init, sender=Collection)
+def remember_collection_values(sender, instance, **kwargs):
+    # Lets post_save see what a row looked like before an update
+    instance._loaded_values = {
+        'card_id': instance.card_id,
+        'quantity': instance.quantity,
+        'is_graded': instance.is_graded,
+    }
+
+
+@receiver(post_save, sender=Collection)
+def collection_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = instance._loaded_values
+    summary.collection_row_saved(instance, created, previous)
+    if created or previous['card_id'] != instance.card_id:
+        breakdown.invalidate_card_breakdown(instance.user_id)
+    valuation.invalidate_current_valuation(instance.user_id)
+    completion.refresh_cards(instance.user_id, {instance.card_id, previous['card_id']} - {None, ''})
+    remember_collection_values(sender, instance)
+
+
+@receiver(post_delete, sender=Collection)
+def collection_deleted(sender, instance, **kwargs):
+    summary.collection_row_deleted(instance)
+    breakdown.invalidate_card_breakdown(instance.user_id)
+    valuation.invalidate_current_valuation(instance.user_id)
+    completion.refresh_cards(instance.user_id, {instance.card_id, instance._loaded_values['card_id']} - {None, ''})
+
+
+@receiver(post_save, sender=Wishlist)
+def wishlist_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        summary.wishlist_row_changed(instance.user_id, 1)
+
+
+@receiver(post_delete, sender=Wishlist)
+def wishlist_deleted(sender, instance, **kwargs):
+    summary.wishlist_row_changed(instance.user_id, -1)
+
+
+@receiver(post_save, sender=Collection)
+@receiver(post_delete, sender=Collection)
+@receiver(post_save, sender=Wishlist)
+@receiver(post_delete, sender=Wishlist)
+@receiver(post_save, sender=CardNote)
+@receiver(post_delete, sender=CardNote)
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_user_responses(sender, instance, raw=False, **kwargs):
+    # Runs after the handlers above, so cached responses never see stale derived data
+    if not raw:
+        bump_user_cache_version(instance.user_id)
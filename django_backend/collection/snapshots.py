@@ -0,0 +1,133 @@
+"""
+Precomputed snapshots for the public shared-dashboard endpoints.
+
+A shared view is rendered to JSON once per change of its owner's data and
+stored gzip-compressed in SharedSnapshot. Within the owner's staleness window
+(User.shared_snapshot_max_age) the stored bytes are served after a single
+indexed lookup. Once the window has passed, the snapshot is checked against
+the owner's cache version (collection.caching) and either re-armed or
+re-rendered. Responses carry `public` Cache-Control headers, so a CDN or
+browser can absorb repeat traffic.
+
+Snapshots are keyed on the query parameters the view reads, in a fixed order,
+so junk parameters map onto an existing row. Storing a new version deletes
+the owner's snapshots of older versions, and each endpoint keeps at most
+MAX_SNAPSHOTS_PER_ENDPOINT rows per owner.
+"""
+import gzip
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from .caching import get_user_cache_version
+from .models import SharedSnapshot
+
+MAX_SNAPSHOTS_PER_ENDPOINT = 50
+
+
+def _staleness_window(user_id):
+    from accounts.models import SHARED_SNAPSHOT_MAX_AGE_LIMIT, User
+
+    max_age = User.objects.filter(pk=user_id).values_list('shared_snapshot_max_age', flat=True).first()
+    if max_age is None:
+        return getattr(settings, 'SHARED_SNAPSHOT_MAX_AGE', 60)
+    # Values saved before the serializer enforced the limit
+    return min(max_age, SHARED_SNAPSHOT_MAX_AGE_LIMIT)
+
+
+def snapshot_query(request, params):
+    """The honoured parameters of the request as a canonical query string"""
+    return urlencode([
+        (name, request.GET[name]) for name in sorted(params) if request.GET.get(name)
+    ])[:255]
+
+
+def _prune(user_id, endpoint, version):
+    # Older versions can never be served again
+    SharedSnapshot.objects.filter(user_id=user_id).exclude(version=version).delete()
+    surplus = (
+        SharedSnapshot.objects.filter(user_id=user_id, endpoint=endpoint)
+        .order_by('-expires_at').values_list('pk', flat=True)[MAX_SNAPSHOTS_PER_ENDPOINT:]
+    )
+    SharedSnapshot.objects.filter(pk__in=list(surplus)).delete()
+
+
+def _store(user_id, endpoint, query, version, data):
+    body = JSONRenderer().render(data)
+    max_age = _staleness_window(user_id)
+    snapshot, _ = SharedSnapshot.objects.update_or_create(
+        user_id=user_id,
+        endpoint=endpoint,
+        query=query,
+        defaults={
+            'version': version,
+            'etag': f'"{hashlib.sha1(body).hexdigest()[:32]}"',
+            'body': gzip.compress(body, compresslevel=6),
+            'max_age': max_age,
+            'expires_at': timezone.now() + timedelta(seconds=max_age),
+        },
+    )
+    _prune(user_id, endpoint, version)
+    return snapshot
+
+
+def _serve(request, snapshot):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if snapshot.etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]:
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+        response = HttpResponse(bytes(snapshot.body), content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(snapshot.body), content_type='application/json')
+
+    response['ETag'] = snapshot.etag
+    response['Cache-Control'] = (
+        f'public, max-age={snapshot.max_age}, '
+        f's-maxage={snapshot.max_age}, stale-while-revalidate={snapshot.max_age * 5}'
+    )
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def shared_snapshot(view_func=None, params=()):
+    """
+    Serve a public `user_id` view from its stored snapshot, one per value of
+    the query parameters named in `params` (all others are ignored). Apply
+    below @api_view and @permission_classes. Non-200 responses (e.g. unknown
+    user) are passed through and never stored.
+    """
+    def decorator(func):
+        endpoint = func.__name__
+
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            user_id = kwargs['user_id']
+            query = snapshot_query(request, params)
+            snapshot = SharedSnapshot.objects.filter(user_id=user_id, endpoint=endpoint, query=query).first()
+
+            if snapshot is not None and snapshot.expires_at > timezone.now():
+                return _serve(request, snapshot)
+
+            version = get_user_cache_version(user_id)
+            if snapshot is not None and snapshot.version == version:
+                snapshot.expires_at = timezone.now() + timedelta(seconds=snapshot.max_age)
+                SharedSnapshot.objects.filter(pk=snapshot.pk).update(expires_at=snapshot.expires_at)
+                return _serve(request, snapshot)
+
+            response = func(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            return _serve(request, _store(user_id, endpoint, query, version, response.data))
+
+        return wrapper
+
+    return decorator(view_func) if view_func else decorator
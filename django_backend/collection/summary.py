@@ -0,0 +1,120 @@
+"""
+CollectionSummary maintenance.
+
+Counters are adjusted with F() expressions so concurrent writes never lose an
+increment. Only `unique_cards` needs a lookup, and that one walks the
+(user, card_id, ...) unique index. Every adjustment runs in the transaction
+that writes the rows: Collection/Wishlist.save() and Django's deletion wrap
+their signals in one, and bulk writers call the functions below (or
+rebuild_summary) inside theirs. `manage.py rebuild_summaries` repairs drift
+from writes that bypass both, such as queryset.update().
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Collection, Wishlist, CollectionSummary
+
+
+def rebuild_summary(user_id):
+    """Recompute a user's summary from scratch"""
+    totals = Collection.objects.filter(user_id=user_id).aggregate(
+        total_cards=Count('id'),
+        unique_cards=Count('card_id', distinct=True),
+        graded_cards=Count('id', filter=Q(is_graded=True)),
+        quantity_sum=Coalesce(Sum('quantity'), 0),
+    )
+    totals['wishlist_count'] = Wishlist.objects.filter(user_id=user_id).count()
+    summary, _ = CollectionSummary.objects.update_or_create(user_id=user_id, defaults=totals)
+    return summary
+
+
+def get_summary(user):
+    user_id = getattr(user, 'pk', user)
+    try:
+        return CollectionSummary.objects.get(pk=user_id)
+    except CollectionSummary.DoesNotExist:
+        return rebuild_summary(user_id)
+
+
+def _apply(user_id, create_missing=True, **deltas):
+    deltas = {field: Greatest(F(field) + delta, 0) for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        updated = CollectionSummary.objects.filter(pk=user_id).update(**deltas)
+        if not updated and create_missing:
+            # First write for this user: the rebuild already includes this change
+            rebuild_summary(user_id)
+
+
+def apply_deltas(user_id, **deltas):
+    """One counter adjustment for a bulk write, run in the writer's transaction"""
+    _apply(user_id, **deltas)
+
+
+def _owns_card(user_id, card_id, exclude_pk=None):
+    rows = Collection.objects.filter(user_id=user_id, card_id=card_id)
+    if exclude_pk is not None:
+        rows = rows.exclude(pk=exclude_pk)
+    return rows.exists()
+
+
+def collection_row_saved(instance, created, previous):
+    """`previous` holds the card_id/quantity/is_graded the row was loaded with"""
+    user_id = instance.user_id
+    if created:
+        _apply(
+            user_id,
+            total_cards=1,
+            unique_cards=0 if _owns_card(user_id, instance.card_id, instance.pk) else 1,
+            graded_cards=1 if instance.is_graded else 0,
+            quantity_sum=instance.quantity,
+        )
+        return
+
+    unique_delta = 0
+    if previous['card_id'] != instance.card_id:
+        if not _owns_card(user_id, previous['card_id']):
+            unique_delta -= 1
+        if not _owns_card(user_id, instance.card_id, instance.pk):
+            unique_delta += 1
+    _apply(
+        user_id,
+        unique_cards=unique_delta,
+        graded_cards=int(instance.is_graded) - int(bool(previous['is_graded'])),
+        quantity_sum=instance.quantity - (previous['quantity'] or 0),
+    )
+
+
+def collection_rows_upserted(user_id, rows, owned_card_ids):
+    """
+    Counters after a bulk upsert. `rows` pairs each written Collection with the
+    (quantity, is_graded) it replaced, or None for a new row; `owned_card_ids`
+    are the card ids the user owned before.
+    """
+    new_card_ids = {row.card_id for row, previous in rows if previous is None}
+    _apply(
+        user_id,
+        total_cards=sum(previous is None for _, previous in rows),
+        unique_cards=len(new_card_ids - set(owned_card_ids)),
+        graded_cards=sum(int(row.is_graded) - int(bool(previous and previous[1])) for row, previous in rows),
+        quantity_sum=sum(row.quantity - (previous[0] if previous else 0) for row, previous in rows),
+    )
+
+
+def collection_row_deleted(instance):
+    user_id = instance.user_id
+    # Never create a summary on delete: the user itself may be going away in a cascade
+    _apply(
+        user_id,
+        create_missing=False,
+        total_cards=-1,
+        unique_cards=0 if _owns_card(user_id, instance.card_id) else -1,
+        graded_cards=-1 if instance.is_graded else 0,
+        quantity_sum=-instance.quantity,
+    )
+
+
+def wishlist_row_changed(user_id, delta):
+    _apply(user_id, create_missing=delta > 0, wishlist_count=delta)
@@ -6,10 +6,15 @@ urlpatterns = [
     path('collection/', views.CollectionListCreateView.as_view(), name='collection-list'),
     path('collection/<int:pk>/', views.CollectionDetailView.as_view(), name='collection-detail'),
     path('collection/stats/', views.collection_stats, name='collection-stats'),
+    path('collection/valuation/', views.collection_valuation, name='collection-valuation'),
+    path('collection/filter/', views.collection_filter, name='collection-filter'),
+    path('collection/bulk/', views.CollectionBulkImportView.as_view(), name='collection-bulk'),
+    path('collection/export/<str:export_format>/', views.collection_export, name='collection-export'),
     path('wishlist/', views.WishlistListCreateView.as_view(), name='wishlist-list'),
     path('wishlist/<int:pk>/', views.WishlistDetailView.as_view(), name='wishlist-detail'),
     path('notes/', views.CardNoteListCreateView.as_view(), name='card-notes-list'),
     path('notes/<int:pk>/', views.CardNoteDetailView.as_view(), name='card-notes-detail'),
+    path('batch/', views.batch_mutations, name='batch-mutations'),
     path('dashboard/analytics/', views.dashboard_analytics, name='dashboard-analytics'),
     path('activities/', views.user_activities, name='user-activities'),
     path('user/collection/', views.user_collection_cards, name='user-collection-cards'),
@@ -0,0 +1,119 @@
+"""
+Collection valuation engine.
+
+Every collection row is priced in a single SQL aggregation: the newest
+CardPrice on or before the valuation date is looked up with correlated
+subqueries, from most to least specific, and scaled by condition and
+variant multipliers when the price is not for that exact printing.
+Results are stored as one CollectionValueSnapshot per user and day.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import (
+    Case, DecimalField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from catalog.models import CardPrice
+from .models import Collection, CollectionValueSnapshot
+
+DEFAULT_CONDITION_MULTIPLIERS = {
+    'mint': '1.20',
+    'near_mint': '1.00',
+    'excellent': '0.85',
+    'good': '0.70',
+    'light_played': '0.60',
+    'played': '0.45',
+    'poor': '0.25',
+    'unspecified': '0.90',
+}
+
+DEFAULT_VARIANT_MULTIPLIERS = {
+    'normal': '1.00',
+    'reverse_holo': '1.25',
+    'holo': '1.50',
+    'first_edition': '3.00',
+    'shadowless': '2.00',
+}
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def _multiplier(field, configured, defaults):
+    multipliers = {**defaults, **(configured or {})}
+    return Case(
+        *[When(Q(**{field: key}), then=Value(Decimal(str(value)), output_field=MONEY)) for key, value in multipliers.items()],
+        default=Value(Decimal('1'), output_field=MONEY),
+        output_field=MONEY,
+    )
+
+
+def _latest_price(as_of, variant, condition):
+    """Newest price for the outer row's card; language-specific prices win over blank ones"""
+    prices = CardPrice.objects.filter(
+        Q(language=OuterRef('language')) | Q(language=''),
+        card_id=OuterRef('card_id'),
+        currency=settings.VALUATION_CURRENCY,
+        date__lte=as_of,
+        variant=variant,
+        condition=condition,
+    ).order_by('-date', '-language')
+    return Subquery(prices.values('price')[:1], output_field=MONEY)
+
+
+def valuation_aggregate(user, as_of=None):
+    as_of = as_of or timezone.localdate()
+    condition_multiplier = _multiplier(
+        'condition', getattr(settings, 'VALUATION_CONDITION_MULTIPLIERS', None), DEFAULT_CONDITION_MULTIPLIERS,
+    )
+    variant_multiplier = _multiplier(
+        'variant', getattr(settings, 'VALUATION_VARIANT_MULTIPLIERS', None), DEFAULT_VARIANT_MULTIPLIERS,
+    )
+
+    unit_price = Coalesce(
+        _latest_price(as_of, OuterRef('variant'), OuterRef('condition')),
+        ExpressionWrapper(_latest_price(as_of, OuterRef('variant'), '') * condition_multiplier, output_field=MONEY),
+        ExpressionWrapper(_latest_price(as_of, '', '') * variant_multiplier * condition_multiplier, output_field=MONEY),
+        output_field=MONEY,
+    )
+
+    totals = Collection.objects.filter(user=user).annotate(unit_price=unit_price).aggregate(
+        value=Sum(ExpressionWrapper(F('quantity') * F('unit_price'), output_field=MONEY)),
+        priced_cards=Sum('quantity', filter=Q(unit_price__isnull=False)),
+        total_quantity=Sum('quantity'),
+    )
+    return {
+        'value': Decimal(totals['value'] or 0).quantize(Decimal('0.01')),
+        'priced_cards': totals['priced_cards'] or 0,
+        'total_quantity': totals['total_quantity'] or 0,
+    }
+
+
+def compute_snapshot(user, as_of=None):
+    as_of = as_of or timezone.localdate()
+    totals = valuation_aggregate(user, as_of)
+    snapshot, _ = CollectionValueSnapshot.objects.update_or_create(
+        user_id=getattr(user, 'pk', user),
+        date=as_of,
+        defaults={**totals, 'currency': settings.VALUATION_CURRENCY},
+    )
+    return snapshot
+
+
+def get_current_valuation(user):
+    """Today's snapshot, computed on first request and reused until the collection changes"""
+    user_id = getattr(user, 'pk', user)
+    snapshot = CollectionValueSnapshot.objects.filter(user_id=user_id, date=timezone.localdate()).first()
+    return snapshot or compute_snapshot(user_id)
+
+
+def invalidate_current_valuation(user_id):
+    CollectionValueSnapshot.objects.filter(user_id=user_id, date=timezone.localdate()).delete()
+
+
+def valuation_history(user, days):
+    since = timezone.localdate() - timedelta(days=days)
+    return CollectionValueSnapshot.objects.filter(user=user, date__gte=since).order_by('date')
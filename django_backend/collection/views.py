@@ -2,50 +2,111 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Count, Q
+from rest_framework.views import APIView
+from rest_framework.exceptions import PermissionDenied
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from .models import Collection, Wishlist, CardNote
 from .serializers import CollectionSerializer, WishlistSerializer, CardNoteSerializer
-from subscriptions.models import Subscription
+from .completion import get_sets_completed
+from .summary import get_summary
+from .breakdown import get_card_breakdown
+from .valuation import get_current_valuation, valuation_history
+from .activity import activity_queryset, serialize_activity
+from .pagination import (
+    CreatedSelectablePagination, CustomPageNumberPagination, KeysetPagination, SelectablePagination,
+)
+from .bulk import BulkFormatError, import_collection, iter_import_rows, stream_csv, stream_ndjson
+from .services import collection_bulk_changed
+from .batch import BatchError, run_batch
+from .filtering import DEFAULT_ORDERING, CollectionFilter
+from .caching import cached_user_response
+from .snapshots import shared_snapshot
+from accounts.images import thumbnail_urls
+from tcg_backend.db import ReplicaReadMixin, read_replica
+from subscriptions.entitlements import (
+    FREE_PLAN_LIMIT_MESSAGE, EntitlementMixin, HasFeature, get_entitlement, request_entitlement,
+)
 
 User = get_user_model()
 
-class CustomPageNumberPagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
-class CollectionListCreateView(generics.ListCreateAPIView):
+class CollectionListCreateView(EntitlementMixin, ReplicaReadMixin, generics.ListCreateAPIView):
     serializer_class = CollectionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SelectablePagination
 
     def get_queryset(self):
         return Collection.objects.filter(user=self.request.user).order_by('-added_date')
 
+    def get_cached_count(self):
+        return get_summary(self.request.user).total_cards
+
     def perform_create(self, serializer):
-        # Check subscription limits for free users
-        user_subscription = None
-        try:
-            user_subscription = Subscription.objects.get(user=self.request.user)
-        except Subscription.DoesNotExist:
-            pass
-
-        # If user doesn't have active subscription (free plan), enforce 100 card limit
-        if not user_subscription or not user_subscription.is_active:
-            current_count = Collection.objects.filter(user=self.request.user).aggregate(
-                total=Count('id')
-            )['total'] or 0
-            
-            if current_count >= 100:
-                return Response(
-                    {'error': 'Free plan limited to 100 cards. Upgrade to Premium for unlimited cards.'},
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        # Free plan: enforce the card limit
+        card_limit = self.entitlement.card_limit
+        if card_limit is not None and get_summary(self.request.user).total_cards >= card_limit:
+            raise PermissionDenied(FREE_PLAN_LIMIT_MESSAGE)
 
         serializer.save(user=self.request.user)
 
+class CollectionBulkImportView(EntitlementMixin, APIView):
+    """
+    Upsert many collection rows in one request.
+    Body: text/csv with a header row, or application/x-ndjson (one object per line),
+    using the same fields as POST /api/collection/.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        try:
+            rows = iter_import_rows(request.stream or [], request.content_type)
+            report = import_collection(
+                request.user, rows, self.entitlement.card_limit, get_summary(request.user).total_cards,
+            )
+        except BulkFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        except UnicodeDecodeError:
+            return Response({'error': 'Body must be UTF-8 encoded'}, status=status.HTTP_400_BAD_REQUEST)
+
+        changed_card_ids = report.pop('changed_card_ids')
+        if changed_card_ids:
+            collection_bulk_changed(request.user.pk, changed_card_ids)
+        return Response(report, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def collection_export(request, export_format):
+    """Stream the whole collection as CSV or NDJSON"""
+    if export_format == 'csv':
+        response = StreamingHttpResponse(stream_csv(request.user), content_type='text/csv')
+    elif export_format == 'ndjson':
+        response = StreamingHttpResponse(stream_ndjson(request.user), content_type='application/x-ndjson')
+    else:
+        return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+    response['Content-Disposition'] = f'attachment; filename="collection.{export_format}"'
+    return response
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def batch_mutations(request):
+    """
+    Apply many create/update/delete operations on collection, wishlist and notes in one transaction.
+    Body: {"operations": [{"op": "update", "type": "collection", "id": 1, "data": {...}}, ...]}
+    """
+    try:
+        status_code, results, changed_card_ids = run_batch(
+            request.user, request.data, request_entitlement(request).card_limit,
+            get_summary(request.user).total_cards,
+        )
+    except BatchError as e:
+        return Response(e.detail, status=e.status_code)
+
+    if status_code == status.HTTP_200_OK:
+        collection_bulk_changed(request.user.pk, changed_card_ids)
+    return Response({'results': results}, status=status_code)
+
 class CollectionDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CollectionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -53,13 +114,17 @@ class CollectionDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Collection.objects.filter(user=self.request.user)
 
-class WishlistListCreateView(generics.ListCreateAPIView):
+class WishlistListCreateView(ReplicaReadMixin, generics.ListCreateAPIView):
     serializer_class = WishlistSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SelectablePagination
 
     def get_queryset(self):
         return Wishlist.objects.filter(user=self.request.user).order_by('-added_date')
 
+    def get_cached_count(self):
+        return get_summary(self.request.user).wishlist_count
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -70,12 +135,13 @@ class WishlistDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Wishlist.objects.filter(user=self.request.user)
 
-class CardNoteListCreateView(generics.ListCreateAPIView):
+class CardNoteListCreateView(ReplicaReadMixin, generics.ListCreateAPIView):
     serializer_class = CardNoteSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedSelectablePagination
 
     def get_queryset(self):
-        return CardNote.objects.filter(user=self.request.user)
+        return CardNote.objects.filter(user=self.request.user).order_by('-created_at', '-id')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -89,46 +155,37 @@ class CardNoteDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_replica
+@cached_user_response
 def collection_stats(request):
     """Get collection statistics for the authenticated user"""
-    collection_count = Collection.objects.filter(user=request.user).count()
-    unique_cards = Collection.objects.filter(user=request.user).values('card_id').distinct().count()
-    wishlist_count = Wishlist.objects.filter(user=request.user).count()
-    
+    summary = get_summary(request.user)
+
     return Response({
-        'total_cards': collection_count,
-        'unique_cards': unique_cards,
-        'wishlist_count': wishlist_count,
+        'total_cards': summary.total_cards,
+        'unique_cards': summary.unique_cards,
+        'wishlist_count': summary.wishlist_count,
     })
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def dashboard_analytics(request):
-    """Get comprehensive dashboard analytics with subscription-aware features"""
-    user = request.user
-    
+def build_dashboard_analytics(user):
+    """Dashboard payload shared by the private and the public (shared) dashboard"""
     # Get user subscription status
-    user_subscription = None
-    is_premium = False
-    try:
-        user_subscription = Subscription.objects.get(user=user)
-        is_premium = user_subscription.is_active
-    except Subscription.DoesNotExist:
-        pass
+    entitlement = get_entitlement(user)
+    is_premium = entitlement.has_feature('advanced_analytics')
 
     # Basic analytics available to all users
-    collection_items = Collection.objects.filter(user=user)
-    total_cards = collection_items.count()
-    unique_cards = collection_items.values('card_id').distinct().count()
-    wishlist_count = Wishlist.objects.filter(user=user).count()
-    graded_cards = collection_items.filter(is_graded=True).count()
+    summary = get_summary(user)
+    total_cards = summary.total_cards
+    unique_cards = summary.unique_cards
+    wishlist_count = summary.wishlist_count
+    graded_cards = summary.graded_cards
 
     # Calculate usage percentage for free users
     usage_percentage = 0
     cards_remaining = 0
-    if not is_premium:
-        usage_percentage = min((total_cards / 100) * 100, 100)
-        cards_remaining = max(100 - total_cards, 0)
+    if entitlement.card_limit is not None:
+        usage_percentage = min((total_cards / entitlement.card_limit) * 100, 100)
+        cards_remaining = entitlement.cards_remaining(total_cards)
 
     # Advanced analytics only for premium users
     estimated_value = 0
@@ -140,32 +197,22 @@ def dashboard_analytics(request):
         'standard_set': 0,
         'parallel_set': 0,
     }
-    
+
     if is_premium:
         # Premium users get advanced analytics
-        # For now, using placeholder values - can be enhanced with real calculations
-        estimated_value = total_cards * 2.5  # Placeholder calculation
+        estimated_value = float(get_current_valuation(user).value)
         completion_rate = min((unique_cards / max(total_cards, 1)) * 100, 100)
+        sets_completed = get_sets_completed(user)
 
-    # Card type breakdown
-    card_types = {
-        'pokemon': unique_cards * 0.7,  # Approximate breakdown
-        'trainer': unique_cards * 0.2,
-        'energy': unique_cards * 0.1,
-    }
-
-    # Card rarity breakdown (placeholder data)
-    card_rarities = {
-        'common': unique_cards * 0.4,
-        'uncommon': unique_cards * 0.3,
-        'rare': unique_cards * 0.2,
-        'ultra_rare': unique_cards * 0.1,
-    }
+    # Card type and rarity breakdown from catalog metadata
+    breakdown = get_card_breakdown(user)
+    card_types = breakdown['card_types']
+    card_rarities = breakdown['card_rarities']
 
     # Recent activity
-    recent_collection = collection_items.order_by('-added_date')[:5]
+    recent_collection = Collection.objects.filter(user=user).order_by('-added_date')[:5]
     recent_wishlist = Wishlist.objects.filter(user=user).order_by('-added_date')[:3]
-    
+
     recent_activity = []
     for item in recent_collection:
         recent_activity.append({
@@ -177,7 +224,7 @@ def dashboard_analytics(request):
             'variant': item.variant,
             'condition': item.condition,
         })
-    
+
     for item in recent_wishlist:
         recent_activity.append({
             'type': 'wishlist_add',
@@ -186,11 +233,11 @@ def dashboard_analytics(request):
             'message': f'Added card {item.card_id} to wishlist',
             'priority': item.priority,
         })
-    
+
     # Sort by date
     recent_activity.sort(key=lambda x: x['date'], reverse=True)
 
-    return Response({
+    return {
         'total_cards': total_cards,
         'unique_cards': unique_cards,
         'wishlist_count': wishlist_count,
@@ -200,73 +247,80 @@ def dashboard_analytics(request):
         'is_premium': is_premium,
         'usage_percentage': usage_percentage,
         'cards_remaining': cards_remaining,
-        'plan_name': user_subscription.plan if user_subscription and is_premium else 'Free',
+        'plan_name': entitlement.plan_name,
         'user_name': f"{user.first_name} {user.last_name}".strip() or user.email,
+        'profile_thumbnails': thumbnail_urls(user),
         'sets_completed': sets_completed,
         'card_types': card_types,
         'card_rarities': card_rarities,
         'recent_activity': recent_activity[:10],
+    }
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@read_replica
+@cached_user_response
+def dashboard_analytics(request):
+    """Get comprehensive dashboard analytics with subscription-aware features"""
+    return Response(build_dashboard_analytics(request.user))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, HasFeature.of('valuation', 'Collection valuation is a Premium feature.')])
+@read_replica
+@cached_user_response
+def collection_valuation(request):
+    """Current collection value plus the stored daily value history (?days=, default 90)"""
+    try:
+        days = min(max(int(request.GET.get('days', 90)), 1), 3650)
+    except ValueError:
+        days = 90
+
+    current = get_current_valuation(request.user)
+    return Response({
+        'date': current.date,
+        'value': current.value,
+        'currency': current.currency,
+        'priced_cards': current.priced_cards,
+        'total_quantity': current.total_quantity,
+        'history': [
+            {'date': snapshot.date, 'value': snapshot.value}
+            for snapshot in valuation_history(request.user, days)
+        ],
     })
 
 # ... keep existing code (user_activities, user_collection_cards, user_wishlist_cards, user_graded_cards functions)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_replica
 def user_activities(request):
-    """Get paginated user activities with search functionality"""
+    """
+    Get paginated user activities with search functionality.
+    Pass ?pagination=cursor (then follow `next`) for keyset paging on (date, id).
+    """
     user = request.user
     search_query = request.GET.get('search', '').strip()
-    
-    # Get all activities
-    collection_items = Collection.objects.filter(user=user).order_by('-added_date')
-    wishlist_items = Wishlist.objects.filter(user=user).order_by('-added_date')
-    
-    activities = []
-    
-    # Add collection activities
-    for item in collection_items:
-        activity = {
-            'id': f'collection_{item.id}',
-            'type': 'collection_add',
-            'card_id': item.card_id,
-            'date': item.added_date.isoformat(),
-            'message': f'Added {item.quantity}x card {item.card_id} to collection',
-            'quantity': item.quantity,
-            'variant': item.variant,
-            'condition': item.condition,
-        }
-        if not search_query or search_query.lower() in activity['message'].lower() or search_query.lower() in item.card_id.lower():
-            activities.append(activity)
-    
-    # Add wishlist activities
-    for item in wishlist_items:
-        activity = {
-            'id': f'wishlist_{item.id}',
-            'type': 'wishlist_add',
-            'card_id': item.card_id,
-            'date': item.added_date.isoformat(),
-            'message': f'Added card {item.card_id} to wishlist',
-            'priority': item.priority,
-        }
-        if not search_query or search_query.lower() in activity['message'].lower() or search_query.lower() in item.card_id.lower():
-            activities.append(activity)
-    
-    # Sort by date
-    activities.sort(key=lambda x: x['date'], reverse=True)
-    
+
+    if KeysetPagination.requested(request):
+        paginator = KeysetPagination(date_field='activity_date', id_field='activity_id', id_type=str)
+        activities = activity_queryset(user, search_query, paginator.get_cursor_filter(request))
+        page = paginator.paginate_ordered(activities, request)
+        return paginator.get_paginated_response([serialize_activity(row) for row in page])
+
     # Pagination
     paginator = CustomPageNumberPagination()
-    page = paginator.paginate_queryset(activities, request)
-    
-    return paginator.get_paginated_response(page)
+    page = paginator.paginate_queryset(activity_queryset(user, search_query), request)
+
+    return paginator.get_paginated_response([serialize_activity(row) for row in page])
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_replica
 def user_collection_cards(request):
-    """Get paginated collection cards"""
+    """Get paginated collection cards (?pagination=cursor for keyset paging)"""
     collection_items = Collection.objects.filter(user=request.user).order_by('-added_date')
     
-    paginator = CustomPageNumberPagination()
+    paginator = SelectablePagination(count=lambda: get_summary(request.user).total_cards)
     page = paginator.paginate_queryset(collection_items, request)
     
     if page is not None:
@@ -278,11 +332,38 @@ def user_collection_cards(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_replica
+@cached_user_response
+def collection_filter(request):
+    """
+    Filtered, sorted collection page plus facet counts for every filter
+    dimension (see collection.filtering for the parameters). Facets and totals
+    come from one grouped query; ?pagination=cursor needs the default ordering.
+    """
+    collection_filter = CollectionFilter(request.query_params)
+    if KeysetPagination.requested(request) and collection_filter.ordering != DEFAULT_ORDERING:
+        return Response(
+            {'error': f'Cursor pagination only supports ordering={DEFAULT_ORDERING}'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    groups = collection_filter.groups(request.user)
+    summary = collection_filter.summary(groups)
+    paginator = SelectablePagination(count=lambda: summary['rows'])
+    page = paginator.paginate_queryset(collection_filter.results_queryset(request.user), request)
+    response = paginator.get_paginated_response(CollectionSerializer(page, many=True).data)
+    response.data['facets'] = collection_filter.facets(groups)
+    response.data['summary'] = summary
+    return response
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@read_replica
 def user_wishlist_cards(request):
-    """Get paginated wishlist cards"""
+    """Get paginated wishlist cards (?pagination=cursor for keyset paging)"""
     wishlist_items = Wishlist.objects.filter(user=request.user).order_by('-added_date')
     
-    paginator = CustomPageNumberPagination()
+    paginator = SelectablePagination(count=lambda: get_summary(request.user).wishlist_count)
     page = paginator.paginate_queryset(wishlist_items, request)
     
     if page is not None:
@@ -294,11 +375,12 @@ def user_wishlist_cards(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@read_replica
 def user_graded_cards(request):
-    """Get paginated graded collection cards"""
+    """Get paginated graded collection cards (?pagination=cursor for keyset paging)"""
     graded_items = Collection.objects.filter(user=request.user, is_graded=True).order_by('-added_date')
     
-    paginator = CustomPageNumberPagination()
+    paginator = SelectablePagination(count=lambda: get_summary(request.user).graded_cards)
     page = paginator.paginate_queryset(graded_items, request)
     
     if page is not None:
@@ -311,14 +393,16 @@ def user_graded_cards(request):
 # New shared dashboard views - these don't require authentication
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@read_replica
+@shared_snapshot(params=SelectablePagination.query_params)
 def shared_collection(request, user_id):
     """Get shared collection for a specific user (public access)"""
     try:
         user = get_object_or_404(User, id=user_id)
         collection_items = Collection.objects.filter(user=user).order_by('-added_date')
         
-        # Apply pagination
-        paginator = CustomPageNumberPagination()
+        # Apply pagination (?pagination=cursor for keyset paging)
+        paginator = SelectablePagination(count=lambda: get_summary(user).total_cards)
         page = paginator.paginate_queryset(collection_items, request)
         
         if page is not None:
@@ -338,14 +422,16 @@ def shared_collection(request, user_id):
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@read_replica
+@shared_snapshot(params=SelectablePagination.query_params)
 def shared_wishlist(request, user_id):
     """Get shared wishlist for a specific user (public access)"""
     try:
         user = get_object_or_404(User, id=user_id)
         wishlist_items = Wishlist.objects.filter(user=user).order_by('-added_date')
         
-        # Apply pagination
-        paginator = CustomPageNumberPagination()
+        # Apply pagination (?pagination=cursor for keyset paging)
+        paginator = SelectablePagination(count=lambda: get_summary(user).wishlist_count)
         page = paginator.paginate_queryset(wishlist_items, request)
         
         if page is not None:
@@ -365,109 +451,12 @@ def shared_wishlist(request, user_id):
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@read_replica
+@shared_snapshot
 def shared_dashboard_analytics(request, user_id):
     """Get shared dashboard analytics for a specific user (public access)"""
     try:
         user = get_object_or_404(User, id=user_id)
-        
-        # Get user subscription status
-        user_subscription = None
-        is_premium = False
-        try:
-            user_subscription = Subscription.objects.get(user=user)
-            is_premium = user_subscription.is_active
-        except Subscription.DoesNotExist:
-            pass
-
-        # Basic analytics available to all users
-        collection_items = Collection.objects.filter(user=user)
-        total_cards = collection_items.count()
-        unique_cards = collection_items.values('card_id').distinct().count()
-        wishlist_count = Wishlist.objects.filter(user=user).count()
-        graded_cards = collection_items.filter(is_graded=True).count()
-
-        # Calculate usage percentage for free users
-        usage_percentage = 0
-        cards_remaining = 0
-        if not is_premium:
-            usage_percentage = min((total_cards / 100) * 100, 100)
-            cards_remaining = max(100 - total_cards, 0)
-
-        # Advanced analytics only for premium users
-        estimated_value = 0
-        completion_rate = 0
-        sets_completed = {
-            'any_variant': 0,
-            'regular_variants': 0,
-            'all_variants': 0,
-            'standard_set': 0,
-            'parallel_set': 0,
-        }
-        
-        if is_premium:
-            # Premium users get advanced analytics
-            estimated_value = total_cards * 2.5  # Placeholder calculation
-            completion_rate = min((unique_cards / max(total_cards, 1)) * 100, 100)
-
-        # Card type breakdown
-        card_types = {
-            'pokemon': unique_cards * 0.7,
-            'trainer': unique_cards * 0.2,
-            'energy': unique_cards * 0.1,
-        }
-
-        # Card rarity breakdown
-        card_rarities = {
-            'common': unique_cards * 0.4,
-            'uncommon': unique_cards * 0.3,
-            'rare': unique_cards * 0.2,
-            'ultra_rare': unique_cards * 0.1,
-        }
-
-        # Recent activity
-        recent_collection = collection_items.order_by('-added_date')[:5]
-        recent_wishlist = Wishlist.objects.filter(user=user).order_by('-added_date')[:3]
-        
-        recent_activity = []
-        for item in recent_collection:
-            recent_activity.append({
-                'type': 'collection_add',
-                'card_id': item.card_id,
-                'date': item.added_date.isoformat(),
-                'message': f'Added {item.quantity}x card {item.card_id} to collection',
-                'quantity': item.quantity,
-                'variant': item.variant,
-                'condition': item.condition,
-            })
-        
-        for item in recent_wishlist:
-            recent_activity.append({
-                'type': 'wishlist_add',
-                'card_id': item.card_id,
-                'date': item.added_date.isoformat(),
-                'message': f'Added card {item.card_id} to wishlist',
-                'priority': item.priority,
-            })
-        
-        # Sort by date
-        recent_activity.sort(key=lambda x: x['date'], reverse=True)
-
-        return Response({
-            'total_cards': total_cards,
-            'unique_cards': unique_cards,
-            'wishlist_count': wishlist_count,
-            'graded_cards': graded_cards,
-            'estimated_value': estimated_value if is_premium else 0,
-            'completion_rate': completion_rate,
-            'is_premium': is_premium,
-            'usage_percentage': usage_percentage,
-            'cards_remaining': cards_remaining,
-            'plan_name': user_subscription.plan if user_subscription and is_premium else 'Free',
-            'user_name': f"{user.first_name} {user.last_name}".strip() or user.email,
-            'sets_completed': sets_completed,
-            'card_types': card_types,
-            'card_rarities': card_rarities,
-            'recent_activity': recent_activity[:10],
-        })
+        return Response(build_dashboard_analytics(user))
     except Exception as e:
         return Response({'error': 'Dashboard not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -1,6 +1,6 @@
 
 from django.contrib import admin
-from .models import Subscription
+from .models import StripeCustomer, Subscription, WebhookEvent
 
 @admin.register(Subscription)
 class SubscriptionAdmin(admin.ModelAdmin):
@@ -8,3 +8,15 @@ class SubscriptionAdmin(admin.ModelAdmin):
     list_filter = ['plan', 'status', 'created_at']
     search_fields = ['user__email', 'stripe_customer_id', 'stripe_subscription_id']
     readonly_fields = ['stripe_customer_id', 'stripe_subscription_id', 'created_at', 'updated_at']
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ['stripe_event_id', 'event_type', 'status', 'attempts', 'received_at', 'processed_at']
+    list_filter = ['status', 'event_type']
+    search_fields = ['stripe_event_id', 'ordering_key']
+    readonly_fields = ['payload', 'received_at', 'processed_at']
+
+@admin.register(StripeCustomer)
+class StripeCustomerAdmin(admin.ModelAdmin):
+    list_display = ['user', 'stripe_customer_id', 'email', 'updated_at']
+    search_fields = ['user__email', 'email', 'stripe_customer_id']
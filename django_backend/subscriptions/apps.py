@@ -1,6 +1,14 @@
-
 from django.apps import AppConfig
 
 class SubscriptionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'subscriptions'
+
+    def ready(self):
+        from django.conf import settings
+        import stripe
+
+        if settings.STRIPE_API_BASE:
+            stripe.api_base = settings.STRIPE_API_BASE
+
+        from . import signals  # noqa: F401
@@ -0,0 +1,180 @@
+"""
+Central resolver for what a user's plan allows.
+
+`get_entitlement(user)` answers plan, status, the free-plan card cap and
+feature flags without a Subscription query on the hot path: results are kept
+in a short-lived, size-bounded in-process cache in front of the 'shared' cache
+alias, which every worker and management command sees. Any Subscription write
+(webhook handlers, cancel_subscription, admin) invalidates both tiers through
+the signal in subscriptions.signals, so a webhook applied by
+`process_webhooks` reaches the web workers within LOCAL_CACHE_TTL; bulk
+updates that skip signals must call `invalidate_entitlement` themselves.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.core.cache import caches
+from rest_framework.permissions import BasePermission
+from rest_framework.throttling import UserRateThrottle
+
+from collection.caching import VERSION_CACHE_ALIAS
+
+FREE_PLAN_CARD_LIMIT = 100
+FREE_PLAN_LIMIT_MESSAGE = 'Free plan limited to 100 cards. Upgrade to Premium for unlimited cards.'
+PREMIUM_FEATURES = frozenset({'advanced_analytics', 'valuation', 'unlimited_cards'})
+
+SHARED_CACHE_TIMEOUT = 60 * 5
+LOCAL_CACHE_TTL = 5  # seconds; bounds staleness in other processes after an invalidation
+LOCAL_CACHE_MAX_ENTRIES = 10000
+
+# user_id -> (expires_at, Entitlement), oldest write first
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Entitlement:
+    plan: str  # 'free', 'monthly' or 'yearly'
+    status: str  # Subscription.status, or 'none' without a subscription
+    is_premium: bool
+    card_limit: int | None  # None means unlimited
+    features: frozenset = frozenset()
+
+    @property
+    def plan_name(self):
+        return self.plan if self.is_premium else 'Free'
+
+    def has_feature(self, feature):
+        return feature in self.features
+
+    def cards_remaining(self, total_cards):
+        if self.card_limit is None:
+            return None
+        return max(self.card_limit - total_cards, 0)
+
+
+FREE_ENTITLEMENT = Entitlement(plan='free', status='none', is_premium=False, card_limit=FREE_PLAN_CARD_LIMIT)
+
+
+def _cache_key(user_id):
+    return f'entitlement:{user_id}'
+
+
+def resolve_entitlement(subscription):
+    """Build an Entitlement from a Subscription (or None) without caching"""
+    if subscription is None:
+        return FREE_ENTITLEMENT
+    if subscription.is_active:
+        return Entitlement(
+            plan=subscription.plan,
+            status=subscription.status,
+            is_premium=True,
+            card_limit=None,
+            features=PREMIUM_FEATURES,
+        )
+    return Entitlement(
+        plan=subscription.plan,
+        status=subscription.status,
+        is_premium=False,
+        card_limit=FREE_PLAN_CARD_LIMIT,
+    )
+
+
+def _cache_timeout(subscription, entitlement):
+    # Never cache premium access past the point where the period lapses
+    if not entitlement.is_premium or subscription.current_period_end is None:
+        return SHARED_CACHE_TIMEOUT
+    remaining = (subscription.current_period_end - subscription.expiry_cutoff()).total_seconds()
+    return max(1, min(SHARED_CACHE_TIMEOUT, int(remaining)))
+
+
+def get_entitlement(user):
+    """Entitlement for a user or user id, from the local cache, the shared cache or the database"""
+    from .models import Subscription
+
+    user_id = getattr(user, 'pk', user)
+    now = time.monotonic()
+    with _local_lock:
+        hit = _local.get(user_id)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    shared = caches[VERSION_CACHE_ALIAS]
+    entitlement = shared.get(_cache_key(user_id))
+    if entitlement is None:
+        subscription = Subscription.objects.filter(user_id=user_id).first()
+        entitlement = resolve_entitlement(subscription)
+        shared.set(_cache_key(user_id), entitlement, _cache_timeout(subscription, entitlement))
+
+    _remember(user_id, entitlement, now)
+    return entitlement
+
+
+def _remember(user_id, entitlement, now):
+    with _local_lock:
+        _local[user_id] = (now + LOCAL_CACHE_TTL, entitlement)
+        _local.move_to_end(user_id)
+        # Every entry lives LOCAL_CACHE_TTL, so expired ones sit at the front
+        while _local and (next(iter(_local.values()))[0] <= now or len(_local) > LOCAL_CACHE_MAX_ENTRIES):
+            _local.popitem(last=False)
+
+
+def invalidate_entitlement(user_id):
+    with _local_lock:
+        _local.pop(user_id, None)
+    caches[VERSION_CACHE_ALIAS].delete(_cache_key(user_id))
+
+
+def request_entitlement(request):
+    """Entitlement of the authenticated user, memoised on the request"""
+    entitlement = getattr(request, '_entitlement', None)
+    if entitlement is None:
+        entitlement = get_entitlement(request.user) if request.user.is_authenticated else FREE_ENTITLEMENT
+        request._entitlement = entitlement
+    return entitlement
+
+
+class IsPremium(BasePermission):
+    message = 'This is a Premium feature.'
+
+    def has_permission(self, request, view):
+        return request_entitlement(request).is_premium
+
+
+class HasFeature(BasePermission):
+    """Use as HasFeature.of('valuation') in permission_classes"""
+    feature = None
+    message = 'This is a Premium feature.'
+
+    @classmethod
+    def of(cls, feature, message=None):
+        return type(f'HasFeature_{feature}', (cls,), {'feature': feature, 'message': message or cls.message})
+
+    def has_permission(self, request, view):
+        return request_entitlement(request).has_feature(self.feature)
+
+
+class EntitlementMixin:
+    """Gives class-based views `self.entitlement` for the requesting user"""
+
+    @property
+    def entitlement(self):
+        return request_entitlement(self.request)
+
+
+class PlanRateThrottle(UserRateThrottle):
+    """
+    Per-user throttle whose scope follows the plan: configure 'free' and
+    'premium' in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. Unset rates do not throttle.
+    """
+
+    def get_rate(self):
+        return self.THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        self.scope = 'premium' if request_entitlement(request).is_premium else 'free'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from subscriptions.webhooks import DEFAULT_BATCH_SIZE, DEFAULT_MAX_ATTEMPTS, process_pending
+
+
+class Command(BaseCommand):
+    help = 'Apply queued Stripe webhook events (run from cron, or with --loop as a worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls when idle')
+
+    def handle(self, *args, **options):
+        totals = [0, 0, 0]
+        while True:
+            counts = process_pending(batch_size=options['batch_size'], max_attempts=options['max_attempts'])
+            totals = [total + count for total, count in zip(totals, counts)]
+            if not any(counts[:2]):
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        succeeded, failed, deferred = totals
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {succeeded} event(s), {failed} failed, {deferred} deferred'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from subscriptions.stripe_sync import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Refresh the local Stripe customer/subscription mirror from the Stripe API (run nightly)'
+
+    def handle(self, *args, **options):
+        counts = reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f"Synced {counts['customers']} customer(s) and {counts['subscriptions']} subscription(s), "
+            f"{counts['unmatched']} without a local user"
+        ))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from subscriptions.sweeper import RECONCILE_BATCH_SIZE, expire_lapsed, reconcile_statuses
+
+
+class Command(BaseCommand):
+    help = 'Downgrade lapsed subscriptions and reconcile statuses with Stripe (run from cron, or with --interval)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-stripe', action='store_true', help='Only run the local expiry UPDATE')
+        parser.add_argument('--batch-size', type=int, default=RECONCILE_BATCH_SIZE)
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running, sweeping every N seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_lapsed()
+            message = f'Downgraded {expired} lapsed subscription(s)'
+            if not options['skip_stripe']:
+                checked, corrected = reconcile_statuses(batch_size=options['batch_size'])
+                message += f'; checked {checked} against Stripe, corrected {corrected}'
+            self.stdout.write(self.style.SUCCESS(message))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -1,6 +1,9 @@
 
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class Subscription(models.Model):
     PLAN_CHOICES = [
@@ -25,12 +28,26 @@ class Subscription(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Expiry sweep: active subscriptions past their period end
+            models.Index(fields=['status', 'current_period_end'], name='subs_status_period_end_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.email} - {self.plan} - {self.status}"
+
+    @classmethod
+    def expiry_cutoff(cls):
+        """Active subscriptions whose period ended before this are treated as lapsed"""
+        return timezone.now() - timedelta(hours=settings.SUBSCRIPTION_GRACE_HOURS)
     
     @property
     def is_active(self):
-        return self.status == 'active'
+        if self.status != 'active':
+            return False
+        # Renewals normally move the period end forward; past it (plus grace) access has lapsed
+        return self.current_period_end is None or self.current_period_end > self.expiry_cutoff()
 
     # setter for is_active
     @is_active.setter
@@ -40,3 +57,50 @@ class Subscription(models.Model):
         else:
             self.status = 'canceled'
         self.save()
+
+class StripeCustomer(models.Model):
+    """Local mirror of the user's Stripe customer, so checkout and portal never search Stripe"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='stripe_customer')
+    stripe_customer_id = models.CharField(max_length=255, unique=True)
+    email = models.EmailField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.email} - {self.stripe_customer_id}"
+
+class WebhookEvent(models.Model):
+    """
+    A verified Stripe event, stored on receipt and processed later by
+    `manage.py process_webhooks`. The unique Stripe event id makes redelivered
+    events no-ops.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    stripe_event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    # Events sharing a key (the Stripe subscription, else the customer) are applied in order
+    ordering_key = models.CharField(max_length=255, blank=True)
+    stripe_created = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='subs_webhook_queue_idx'),
+            models.Index(fields=['ordering_key', 'stripe_created'], name='subs_webhook_order_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.stripe_event_id} - {self.status}"
@@ -0,0 +1,156 @@
+"""
+Local mirror of Stripe customer and subscription state.
+
+Webhook handlers and `manage.py reconcile_stripe` write Stripe objects into
+StripeCustomer and Subscription (including the billing period), so request
+paths read ids and status from the database instead of searching Stripe.
+Every function takes the Stripe client as a parameter; settings.STRIPE_API_BASE
+points the default client at a local fake server.
+"""
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+import stripe
+from django.contrib.auth import get_user_model
+
+from .models import StripeCustomer, Subscription
+
+logger = logging.getLogger(__name__)
+
+# Stripe statuses folded onto Subscription.STATUS_CHOICES
+STATUS_MAP = {
+    'trialing': 'active',
+    'unpaid': 'past_due',
+    'incomplete_expired': 'canceled',
+    'paused': 'canceled',
+}
+LAPSED_STATUSES = {'canceled', 'incomplete_expired', 'paused'}
+
+
+def from_timestamp(value):
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc) if value else None
+
+
+def billing_period(stripe_subscription):
+    # Newer API versions moved the billing period onto the subscription items
+    start = stripe_subscription.get('current_period_start')
+    end = stripe_subscription.get('current_period_end')
+    if start is None or end is None:
+        items = (stripe_subscription.get('items') or {}).get('data') or [{}]
+        start = start or items[0].get('current_period_start')
+        end = end or items[0].get('current_period_end')
+    return from_timestamp(start), from_timestamp(end)
+
+
+def _plan(stripe_subscription, default='monthly'):
+    try:
+        interval = stripe_subscription['items']['data'][0]['price']['recurring']['interval']
+    except (KeyError, IndexError, TypeError):
+        return default
+    return 'yearly' if interval == 'year' else 'monthly'
+
+
+def sync_customer(user, stripe_customer_id, email=''):
+    customer, _ = StripeCustomer.objects.update_or_create(
+        user=user,
+        defaults={'stripe_customer_id': stripe_customer_id, 'email': email or user.email},
+    )
+    return customer
+
+
+def stored_customer_id(user):
+    """The user's Stripe customer id from the mirror (or their subscription), without calling Stripe"""
+    customer_id = StripeCustomer.objects.filter(user=user).values_list('stripe_customer_id', flat=True).first()
+    if customer_id is None:
+        customer_id = Subscription.objects.filter(user=user).values_list('stripe_customer_id', flat=True).first()
+        if customer_id:
+            sync_customer(user, customer_id)
+    return customer_id
+
+
+def get_or_create_customer_id(user, client=stripe):
+    """Stored customer id, creating the Stripe customer only on the user's first checkout"""
+    customer_id = stored_customer_id(user)
+    if customer_id is None:
+        customer = client.Customer.create(
+            email=user.email,
+            name=f"{user.first_name} {user.last_name}".strip(),
+            metadata={'user_id': user.pk},
+        )
+        customer_id = sync_customer(user, customer['id']).stripe_customer_id
+    return customer_id
+
+
+def _user_for(stripe_subscription):
+    customer_id = stripe_subscription.get('customer')
+    customer = StripeCustomer.objects.select_related('user').filter(stripe_customer_id=customer_id).first()
+    if customer is not None:
+        return customer.user
+    subscription = Subscription.objects.select_related('user').filter(
+        stripe_subscription_id=stripe_subscription['id'],
+    ).first()
+    if subscription is not None:
+        return subscription.user
+    user_id = (stripe_subscription.get('metadata') or {}).get('user_id')
+    return get_user_model().objects.filter(pk=user_id).first() if user_id else None
+
+
+def sync_subscription(stripe_subscription, user=None):
+    """
+    Upsert the local Subscription from a Stripe subscription object.
+    Returns None when no local user can be matched.
+    """
+    user = user or _user_for(stripe_subscription)
+    if user is None:
+        logger.warning(f"No local user for Stripe subscription {stripe_subscription['id']}")
+        return None
+
+    period_start, period_end = billing_period(stripe_subscription)
+    status = stripe_subscription.get('status') or 'incomplete'
+    existing = Subscription.objects.filter(user=user).first()
+    subscription, _ = Subscription.objects.update_or_create(
+        user=user,
+        defaults={
+            'stripe_customer_id': stripe_subscription['customer'],
+            'stripe_subscription_id': stripe_subscription['id'],
+            'plan': _plan(stripe_subscription, existing.plan if existing else 'monthly'),
+            'status': STATUS_MAP.get(status, status),
+            'current_period_start': period_start,
+            'current_period_end': period_end,
+        },
+    )
+    return subscription
+
+
+def reconcile(client=stripe):
+    """Walk all Stripe customers and subscriptions and refresh the mirror. Returns counts."""
+    User = get_user_model()
+    counts = {'customers': 0, 'subscriptions': 0, 'unmatched': 0}
+
+    for customer in client.Customer.list(limit=100).auto_paging_iter():
+        user_id = (customer.get('metadata') or {}).get('user_id')
+        user = User.objects.filter(pk=user_id).first() if user_id else None
+        if user is None and customer.get('email'):
+            user = User.objects.filter(email=customer['email']).first()
+        if user is None:
+            counts['unmatched'] += 1
+            continue
+        sync_customer(user, customer['id'], customer.get('email') or '')
+        counts['customers'] += 1
+
+    # One local Subscription per user: keep a live subscription over older canceled ones
+    latest = {}
+    for stripe_subscription in client.Subscription.list(status='all', limit=100).auto_paging_iter():
+        current = latest.get(stripe_subscription['customer'])
+        if current is None or (
+            stripe_subscription['status'] not in LAPSED_STATUSES and current['status'] in LAPSED_STATUSES
+        ):
+            latest[stripe_subscription['customer']] = stripe_subscription
+
+    for stripe_subscription in latest.values():
+        if sync_subscription(stripe_subscription) is None:
+            counts['unmatched'] += 1
+        else:
+            counts['subscriptions'] += 1
+
+    return counts
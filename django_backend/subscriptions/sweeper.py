@@ -0,0 +1,70 @@
+"""
+Periodic subscription expiry and reconciliation (`manage.py sweep_subscriptions`).
+
+`expire_lapsed` downgrades active subscriptions whose billing period ended
+more than SUBSCRIPTION_GRACE_HOURS ago with one UPDATE on the
+(status, current_period_end) index. `reconcile_statuses` then pages through
+Stripe's subscription listing and corrects local rows that disagree, so
+missed webhooks are repaired without any per-request Stripe call.
+"""
+import logging
+from itertools import islice
+
+import stripe
+
+from collection.caching import bump_user_cache_version
+
+from .entitlements import invalidate_entitlement
+from .models import Subscription
+from .stripe_sync import STATUS_MAP, billing_period, sync_subscription
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 100
+
+
+def _invalidate(user_ids):
+    # QuerySet.update() skips the post_save signals that normally do this
+    for user_id in user_ids:
+        invalidate_entitlement(user_id)
+        bump_user_cache_version(user_id)
+
+
+def expire_lapsed():
+    """Mark lapsed active subscriptions past_due. Returns the number downgraded."""
+    lapsed = Subscription.objects.filter(status='active', current_period_end__lt=Subscription.expiry_cutoff())
+    user_ids = list(lapsed.values_list('user_id', flat=True))
+    if not user_ids:
+        return 0
+    expired = lapsed.update(status='past_due')
+    _invalidate(user_ids)
+    logger.info(f"Downgraded {expired} lapsed subscription(s)")
+    return expired
+
+
+def _differs(local, remote):
+    status = STATUS_MAP.get(remote['status'], remote['status'])
+    _, period_end = billing_period(remote)
+    return local.status != status or (period_end is not None and local.current_period_end != period_end)
+
+
+def reconcile_statuses(client=stripe, batch_size=RECONCILE_BATCH_SIZE):
+    """Compare local subscriptions with Stripe page by page. Returns (checked, corrected)."""
+    remote_iter = client.Subscription.list(status='all', limit=batch_size).auto_paging_iter()
+    checked = corrected = 0
+    while True:
+        page = list(islice(remote_iter, batch_size))
+        if not page:
+            break
+        local = Subscription.objects.select_related('user').in_bulk(
+            [remote['id'] for remote in page], field_name='stripe_subscription_id',
+        )
+        for remote in page:
+            subscription = local.get(remote['id'])
+            if subscription is None:
+                continue
+            checked += 1
+            if _differs(subscription, remote):
+                sync_subscription(remote, user=subscription.user)
+                corrected += 1
+    return checked, corrected
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from . import webhooks
+from .models import Subscription, WebhookEvent
+
+
+class StubSubscriptionAPI:
+    def __init__(self, subscriptions):
+        self.subscriptions = subscriptions
+        self.retrieved = []
+
+    def retrieve(self, subscription_id):
+        self.retrieved.append(subscription_id)
+        return self.subscriptions[subscription_id]
+
+
+class StubStripe:
+    """Stands in for the `stripe` module: only what the webhook handlers call"""
+
+    def __init__(self, subscriptions):
+        self.Subscription = StubSubscriptionAPI(subscriptions)
+
+
+def checkout_event(event_id, email, created=1):
+    return {
+        'id': event_id,
+        'type': 'checkout.session.completed',
+        'created': created,
+        'data': {'object': {
+            'object': 'checkout.session',
+            'customer': 'cus_1',
+            'subscription': 'sub_1',
+            'customer_details': {'email': email},
+        }},
+    }
+
+
+class WebhookQueueTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='buyer@example.com', email='buyer@example.com', password='x',
+        )
+        self.client_stub = StubStripe({'sub_1': {
+            'id': 'sub_1',
+            'customer': 'cus_1',
+            'status': 'active',
+            'current_period_start': 1700000000,
+            'current_period_end': 1702592000,
+            'items': {'data': [{'price': {'recurring': {'interval': 'year'}}}]},
+        }})
+
+    def test_checkout_event_syncs_subscription_through_client(self):
+        self.assertTrue(webhooks.record_event(checkout_event('evt_1', self.user.email)))
+        self.assertFalse(webhooks.record_event(checkout_event('evt_1', self.user.email)))
+
+        self.assertEqual(webhooks.process_pending(client=self.client_stub), (1, 0, 0))
+
+        self.assertEqual(self.client_stub.Subscription.retrieved, ['sub_1'])
+        subscription = Subscription.objects.get(user=self.user)
+        self.assertEqual((subscription.stripe_subscription_id, subscription.plan, subscription.status),
+                         ('sub_1', 'yearly', 'active'))
+        self.assertEqual(WebhookEvent.objects.get().status, 'succeeded')
+
+    def test_customer_events_are_ordered_by_customer_id(self):
+        event = {'id': 'evt_2', 'type': 'customer.updated', 'created': 1,
+                 'data': {'object': {'object': 'customer', 'id': 'cus_1'}}}
+        self.assertTrue(webhooks.record_event(event))
+        self.assertEqual(WebhookEvent.objects.get(stripe_event_id='evt_2').ordering_key, 'cus_1')
+
+    def test_failed_event_is_retried_later(self):
+        webhooks.record_event(checkout_event('evt_1', 'nobody@example.com'))
+
+        self.assertEqual(webhooks.process_pending(client=self.client_stub), (0, 1, 0))
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ('pending', 1))
+        self.assertGreater(event.next_attempt_at, timezone.now())
+        self.assertEqual(webhooks.process_pending(client=self.client_stub), (0, 0, 0))
+
+    def test_claim_skips_events_another_worker_claimed_after_the_select(self):
+        for i in range(3):
+            webhooks.record_event(checkout_event(f'evt_{i}', self.user.email, created=i))
+        select_due = webhooks._due_ids
+
+        def select_then_lose_race(now, batch_size):
+            ids = select_due(now, batch_size)
+            # Another worker claims the first two events between our SELECT and UPDATE
+            WebhookEvent.objects.filter(id__in=ids[:2]).update(status='processing', locked_at=timezone.now())
+            return ids
+
+        with mock.patch.object(webhooks, '_due_ids', side_effect=select_then_lose_race):
+            claimed = webhooks._claim(10)
+
+        self.assertEqual([event.stripe_event_id for event in claimed], ['evt_2'])
+
+    def test_claim_takes_over_expired_locks(self):
+        webhooks.record_event(checkout_event('evt_1', self.user.email))
+        WebhookEvent.objects.update(
+            status='processing', locked_at=timezone.now() - webhooks.STALE_LOCK_AFTER * 2,
+        )
+
+        self.assertEqual([event.stripe_event_id for event in webhooks._claim(10)], ['evt_1'])
@@ -10,6 +10,9 @@ import stripe
 import json
 import logging
 from .models import Subscription
+from .entitlements import request_entitlement
+from .webhooks import record_event
+from .stripe_sync import get_or_create_customer_id, stored_customer_id
 from .serializers import SubscriptionSerializer
 
 logger = logging.getLogger(__name__)
@@ -39,22 +42,12 @@ def create_checkout_session(request):
         plan = request.data.get('plan', 'monthly')
         
         # Check if user already has an active subscription
-        try:
-            existing_subscription = Subscription.objects.get(user=request.user)
-            if existing_subscription.is_active:
-                logger.warning(f"User {request.user.email} already has an active subscription.")
-                return Response({'error': 'User already has an active subscription'}, status=400)
-        except Subscription.DoesNotExist:
-            pass
+        if request_entitlement(request).is_premium:
+            logger.warning(f"User {request.user.email} already has an active subscription.")
+            return Response({'error': 'User already has an active subscription'}, status=400)
 
-        # Create or get Stripe customer
-        try:
-            customer = stripe.Customer.list(email=request.user.email).data[0]
-        except IndexError:
-            customer = stripe.Customer.create(
-                email=request.user.email,
-                name=f"{request.user.first_name} {request.user.last_name}".strip()
-            )
+        # Stored Stripe customer (created in Stripe only on the first checkout)
+        customer_id = get_or_create_customer_id(request.user)
 
         # Set price based on plan
         if plan == 'yearly':
@@ -82,7 +75,7 @@ def create_checkout_session(request):
 
         # Create checkout session
         checkout_session = stripe.checkout.Session.create(
-            customer=customer.id,
+            customer=customer_id,
             payment_method_types=['card'],
             line_items=[{
                 'price_data': price_data,
@@ -104,14 +97,13 @@ def create_checkout_session(request):
 def create_portal_session(request):
     try:
         # Get user's Stripe customer
-        try:
-            customer = stripe.Customer.list(email=request.user.email).data[0]
-        except IndexError:
+        customer_id = stored_customer_id(request.user)
+        if customer_id is None:
             return Response({'error': 'No Stripe customer found'}, status=404)
 
         # Create portal session
         portal_session = stripe.billing_portal.Session.create(
-            customer=customer.id,
+            customer=customer_id,
             return_url=f'{settings.FRONTEND_URL}/premium',
         )
 
@@ -151,11 +143,10 @@ def cancel_subscription(request):
         logger.error(f"Error canceling subscription: {str(e)}")
         return Response({'error': str(e)}, status=500)
 
-# ... keep existing code (webhook functions and handlers remain the same)
-
 @csrf_exempt
 @require_POST
 def stripe_webhook(request):
+    """Verify and queue the event; `manage.py process_webhooks` applies it"""
     payload = request.body
     sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
     endpoint_secret = settings.STRIPE_WEBHOOK_SECRET
@@ -169,102 +160,7 @@ def stripe_webhook(request):
         logger.error("Invalid signature")
         return HttpResponse(status=400)
 
-    # Handle the event
-    if event['type'] == 'checkout.session.completed':
-        handle_checkout_completed(event['data']['object'])
-    elif event['type'] == 'invoice.payment_succeeded':
-        handle_payment_succeeded(event['data']['object'])
-    elif event['type'] == 'customer.subscription.updated':
-        handle_subscription_updated(event['data']['object'])
-    elif event['type'] == 'customer.subscription.deleted':
-        handle_subscription_deleted(event['data']['object'])
-    else:
-        logger.info(f'Unhandled event type: {event["type"]}')
+    if not record_event(event):
+        logger.info(f"Duplicate webhook delivery {event['id']} ignored")
 
     return HttpResponse(status=200)
-
-def handle_checkout_completed(session):
-    try:
-        customer_email = session['customer_details']['email']
-        stripe_customer_id = session['customer']
-        stripe_subscription_id = session['subscription']
-        
-        # Get the user
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        user = User.objects.get(email=customer_email)
-        
-        # Get subscription details from Stripe
-        stripe_subscription = stripe.Subscription.retrieve(stripe_subscription_id)
-        plan = 'yearly' if stripe_subscription['items']['data'][0]['price']['recurring']['interval'] == 'year' else 'monthly'
-        
-        # Create or update subscription
-        subscription, created = Subscription.objects.update_or_create(
-            user=user,
-            defaults={
-                'stripe_customer_id': stripe_customer_id,
-                'stripe_subscription_id': stripe_subscription_id,
-                'plan': plan,
-                'status': 'active',
-            }
-        )
-        
-        logger.info(f"Subscription {'created' if created else 'updated'} for user {user.email}")
-        
-    except Exception as e:
-        logger.error(f"Error handling checkout completed: {str(e)}")
-
-def handle_payment_succeeded(invoice):
-    try:
-        if 'subscription' not in invoice:
-            logger.info("Invoice not related to subscription, skipping")
-            return
-            
-        subscription_id = invoice['subscription']
-        stripe_subscription = stripe.Subscription.retrieve(subscription_id)
-        customer = stripe.Customer.retrieve(stripe_subscription['customer'])
-        
-        # Update subscription status
-        try:
-            subscription = Subscription.objects.get(stripe_subscription_id=subscription_id)
-            subscription.status = 'active'
-            subscription.save()
-            logger.info(f"Updated subscription status for {customer['email']}")
-        except Subscription.DoesNotExist:
-            logger.warning(f"Local subscription not found for Stripe subscription {subscription_id}")
-            
-    except Exception as e:
-        logger.error(f"Error handling payment succeeded: {str(e)}")
-
-def handle_subscription_updated(subscription):
-    try:
-        stripe_subscription_id = subscription['id']
-        
-        # Update local subscription
-        try:
-            local_subscription = Subscription.objects.get(stripe_subscription_id=stripe_subscription_id)
-
-            local_subscription.status = subscription['status']
-            local_subscription.save()
-            logger.info(f"Updated subscription {stripe_subscription_id}")
-        except Subscription.DoesNotExist:
-            logger.warning(f"Local subscription not found for {stripe_subscription_id}")
-            
-    except Exception as e:
-        logger.error(f"Error handling subscription updated: {str(e)}")
-
-def handle_subscription_deleted(subscription):
-    try:
-        stripe_subscription_id = subscription['id']
-        
-        # Update local subscription
-        try:
-            local_subscription = Subscription.objects.get(stripe_subscription_id=stripe_subscription_id)
-            local_subscription.status = 'canceled'
-            local_subscription.save()
-            logger.info(f"Canceled subscription {stripe_subscription_id}")
-        except Subscription.DoesNotExist:
-            logger.warning(f"Local subscription not found for {stripe_subscription_id}")
-            
-    except Exception as e:
-        logger.error(f"Error handling subscription deleted: {str(e)}")
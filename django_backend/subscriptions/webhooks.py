@@ -0,0 +1,205 @@
+"""
+Queued Stripe webhook processing.
+
+`stripe_webhook` only verifies and stores events (`record_event`); the
+`process_webhooks` management command calls `process_pending`, which claims
+due events in batches and applies them with the handlers below. Events are
+applied in Stripe creation order per ordering key, and a failing event holds
+back later events for the same subscription until it succeeds or gives up.
+Failures are retried with exponential backoff.
+
+Handlers take the Stripe client as an argument, so the worker can run against
+a stub exposing `Subscription.retrieve`.
+"""
+import logging
+from datetime import timedelta
+
+import stripe
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import StripeCustomer, Subscription, WebhookEvent
+from .stripe_sync import from_timestamp, sync_customer, sync_subscription
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 8
+RETRY_BASE_DELAY = 30  # seconds, doubled per attempt
+STALE_LOCK_AFTER = timedelta(minutes=10)
+
+
+def _ordering_key(obj):
+    if obj.get('object') in ('subscription', 'customer'):
+        return obj.get('id') or ''
+    return obj.get('subscription') or obj.get('customer') or ''
+
+
+def record_event(event):
+    """Store a verified event. Returns False when it was already received."""
+    obj = event['data']['object']
+    try:
+        with transaction.atomic():
+            WebhookEvent.objects.create(
+                stripe_event_id=event['id'],
+                event_type=event['type'],
+                payload=obj,
+                ordering_key=_ordering_key(obj),
+                stripe_created=event.get('created') or 0,
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def handle_checkout_completed(session, client):
+    customer_email = session['customer_details']['email']
+    user = get_user_model().objects.get(email=customer_email)
+    sync_customer(user, session['customer'], customer_email)
+
+    # The session only carries the id; the subscription has the plan and billing period
+    stripe_subscription = client.Subscription.retrieve(session['subscription'])
+    sync_subscription(stripe_subscription, user=user)
+    logger.info(f"Subscription synced for user {user.email}")
+
+
+def handle_payment_succeeded(invoice, client):
+    subscription_id = invoice.get('subscription')
+    if not subscription_id:
+        logger.info("Invoice not related to subscription, skipping")
+        return
+
+    local_subscription = Subscription.objects.filter(stripe_subscription_id=subscription_id).first()
+    if local_subscription is None:
+        logger.warning(f"Local subscription not found for Stripe subscription {subscription_id}")
+        return
+    local_subscription.status = 'active'
+    # A paid renewal invoice carries the new billing period
+    lines = (invoice.get('lines') or {}).get('data') or []
+    period = lines[0].get('period') if lines else None
+    if period:
+        local_subscription.current_period_start = from_timestamp(period.get('start'))
+        local_subscription.current_period_end = from_timestamp(period.get('end'))
+    local_subscription.save()
+    logger.info(f"Updated subscription status for {invoice.get('customer_email') or subscription_id}")
+
+
+def handle_subscription_updated(subscription, client):
+    sync_subscription(subscription)
+    logger.info(f"Updated subscription {subscription['id']}")
+
+
+def handle_subscription_deleted(subscription, client):
+    sync_subscription({**subscription, 'status': 'canceled'})
+    logger.info(f"Canceled subscription {subscription['id']}")
+
+
+def handle_customer_updated(customer, client):
+    mirrored = StripeCustomer.objects.filter(stripe_customer_id=customer['id']).first()
+    if mirrored is not None and customer.get('email'):
+        mirrored.email = customer['email']
+        mirrored.save(update_fields=['email', 'updated_at'])
+
+
+HANDLERS = {
+    'checkout.session.completed': handle_checkout_completed,
+    'invoice.payment_succeeded': handle_payment_succeeded,
+    'customer.subscription.updated': handle_subscription_updated,
+    'customer.subscription.deleted': handle_subscription_deleted,
+    'customer.updated': handle_customer_updated,
+}
+
+
+def _due(now):
+    """Pending events whose retry time has come, or events held by a worker that died"""
+    return Q(status='pending', next_attempt_at__lte=now) | Q(status='processing', locked_at__lt=now - STALE_LOCK_AFTER)
+
+
+def _due_ids(now, batch_size):
+    return list(
+        WebhookEvent.objects.filter(_due(now))
+        .order_by('stripe_created', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+
+
+def _claim(batch_size):
+    """Mark up to `batch_size` due events as processing and return them in Stripe order"""
+    now = timezone.now()
+    ids = _due_ids(now, batch_size)
+    # Re-check the due predicate in the UPDATE: rows another worker claimed
+    # since the SELECT are no longer due and stay with that worker
+    WebhookEvent.objects.filter(_due(now), id__in=ids).update(status='processing', locked_at=now)
+    return list(WebhookEvent.objects.filter(id__in=ids, locked_at=now).order_by('stripe_created', 'id'))
+
+
+def _blocked_keys(events):
+    """Ordering keys with an earlier event still waiting for a retry"""
+    keys = {event.ordering_key for event in events if event.ordering_key}
+    if not keys:
+        return {}
+    blocked = {}
+    waiting = (
+        WebhookEvent.objects
+        .filter(ordering_key__in=keys, status='pending', attempts__gt=0)
+        .values_list('ordering_key', 'stripe_created')
+    )
+    for key, created in waiting:
+        blocked[key] = min(created, blocked.get(key, created))
+    return blocked
+
+
+def _fail(event, error, max_attempts):
+    event.attempts += 1
+    event.last_error = str(error)
+    event.locked_at = None
+    if event.attempts >= max_attempts:
+        event.status = 'failed'
+        logger.error(f"Giving up on webhook {event.stripe_event_id} after {event.attempts} attempts: {error}")
+    else:
+        event.status = 'pending'
+        event.next_attempt_at = timezone.now() + timedelta(seconds=RETRY_BASE_DELAY * 2 ** (event.attempts - 1))
+        logger.warning(f"Webhook {event.stripe_event_id} failed (attempt {event.attempts}): {error}")
+    event.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'])
+
+
+def process_event(event, client=stripe):
+    handler = HANDLERS.get(event.event_type)
+    with transaction.atomic():
+        if handler is None:
+            logger.info(f'Unhandled event type: {event.event_type}')
+        else:
+            handler(event.payload, client)
+        event.status = 'succeeded'
+        event.locked_at = None
+        event.processed_at = timezone.now()
+        event.save(update_fields=['status', 'locked_at', 'processed_at'])
+
+
+def process_pending(client=stripe, batch_size=DEFAULT_BATCH_SIZE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Process one batch of due events. Returns (succeeded, failed, deferred) counts."""
+    events = _claim(batch_size)
+    blocked = _blocked_keys(events)
+    succeeded = failed = deferred = 0
+
+    for event in events:
+        key = event.ordering_key
+        if key in blocked and event.stripe_created >= blocked[key]:
+            # An earlier event for this subscription is waiting to be retried
+            WebhookEvent.objects.filter(pk=event.pk).update(
+                status='pending', locked_at=None, next_attempt_at=timezone.now() + timedelta(seconds=RETRY_BASE_DELAY),
+            )
+            deferred += 1
+            continue
+        try:
+            process_event(event, client)
+            succeeded += 1
+        except Exception as e:
+            _fail(event, e, max_attempts)
+            failed += 1
+            if key and event.status == 'pending':
+                blocked[key] = min(event.stripe_created, blocked.get(key, event.stripe_created))
+
+    return succeeded, failed, deferred
@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """WAL lets readers run alongside the single writer; the rest trades durability on power loss for speed"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma in settings.SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {pragma}')
+
+
+class TcgBackendConfig(AppConfig):
+    name = 'tcg_backend'
+    verbose_name = 'TCG backend'
+
+    def ready(self):
+        connection_created.connect(configure_sqlite, dispatch_uid='tcg_backend.configure_sqlite')
@@ -0,0 +1,91 @@
+"""
+Read-replica routing.
+
+Views opt in with @read_replica (function views) or ReplicaReadMixin
+(class-based views); while such a view handles a GET or HEAD request, ORM
+reads go to the 'replica' alias and every write still goes to 'default'.
+Reads stay on the primary when no replica is configured, inside a transaction
+on the primary, and for DATABASE_REPLICA_LAG_SECONDS after the data owner's
+last write, so users always read their own writes. The last write time is the
+per-user cache version, which lives in the 'shared' cache alias: a request
+served by any worker sees a write made through any other.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+
+def _recently_written(owner_id):
+    from collection.caching import get_user_cache_version
+
+    if owner_id is None:
+        return False
+    # Read from the cross-process 'shared' cache; a cold cache counts as a fresh write
+    last_write = get_user_cache_version(owner_id) / 1000
+    return time.time() - last_write < settings.DATABASE_REPLICA_LAG_SECONDS
+
+
+def _should_use_replica(request, kwargs):
+    if not replica_configured() or request.method not in SAFE_METHODS:
+        return False
+    user = getattr(request, 'user', None)
+    owner_id = kwargs.get('user_id') or (user.pk if user is not None and user.is_authenticated else None)
+    return not _recently_written(owner_id)
+
+
+def read_replica(view_func):
+    """Route the view's reads to the replica. Apply below @api_view/@permission_classes."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _should_use_replica(request, kwargs):
+            return view_func(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """Route a DRF view's reads to the replica for safe methods"""
+
+    def initial(self, request, *args, **kwargs):
+        # Runs after authentication, so the owner's last write is known
+        super().initial(request, *args, **kwargs)
+        if _should_use_replica(request, kwargs):
+            self._replica_token = _use_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _use_replica.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
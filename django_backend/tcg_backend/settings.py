@@ -25,6 +25,8 @@ INSTALLED_APPS = [
     'accounts',
     'collection',
     'subscriptions',
+    'catalog',
+    'tcg_backend',
     'django.contrib.admin',  # Keep admin after our apps
 ]
 
@@ -57,16 +59,104 @@ TEMPLATES = [
     },
 ]
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database profile: DB_ENGINE=sqlite (default) or postgresql. Setting DB_REPLICA_HOST
+# (PostgreSQL) or DB_REPLICA_NAME (SQLite file) adds a 'replica' alias that read-only
+# views use through tcg_backend.db.ReplicaRouter.
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='tcg'),
+            'USER': config('DB_USER', default='tcg'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            # Persistent connections, checked before reuse
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int)},
+        }
+    }
+    if config('DB_REPLICA_HOST', default=''):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': config('DB_REPLICA_HOST'),
+            'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+            'OPTIONS': {'timeout': 20},  # Seconds to wait for the write lock
+        }
+    }
+    if config('DB_REPLICA_NAME', default=''):
+        # Local stand-in for a replica; migrate it with `migrate --database replica`
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'NAME': config('DB_REPLICA_NAME'),
+            'TEST': {'MIRROR': 'default'},
+        }
+
+DATABASE_ROUTERS = ['tcg_backend.db.ReplicaRouter']
+# Reads stay on the primary for this long after the data owner's last write
+DATABASE_REPLICA_LAG_SECONDS = config('DATABASE_REPLICA_LAG_SECONDS', default=5, cast=int)
+
+# Applied to every new SQLite connection (see tcg_backend.apps)
+SQLITE_PRAGMAS = [
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'busy_timeout=20000',
+    'cache_size=-20000',  # ~20 MB page cache
+    'temp_store=MEMORY',
+    'mmap_size=268435456',
+]
+
+# Cache: locmem by default; CACHE_BACKEND=file or db for a cache shared by all workers
+# (db needs `python manage.py createcachetable` once)
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_LOCATION = config('CACHE_LOCATION', default='')
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_LOCATION or os.path.join(BASE_DIR, 'cache'),
+        }
+    }
+elif CACHE_BACKEND == 'db':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': CACHE_LOCATION or 'django_cache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': CACHE_LOCATION or 'tcg-backend',
+        }
+    }
+
+# Per-user cache versions must be the same in every worker process, so they live
+# in the 'shared' cache: the default one unless that is process-local
+if CACHE_BACKEND in ('file', 'db'):
+    CACHES['shared'] = CACHES['default']
+else:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('SHARED_CACHE_LOCATION', default=os.path.join(BASE_DIR, 'cache', 'shared')),
     }
-}
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -75,6 +165,13 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# API tokens expire after AUTH_TOKEN_TTL_HOURS. Each login gets its own token;
+# /api/auth/token/refresh/ replaces only the token it is called with
+AUTH_TOKEN_TTL_HOURS = config('AUTH_TOKEN_TTL_HOURS', default=24 * 30, cast=int)
+# Seconds a token-to-user resolution is cached
+AUTH_TOKEN_CACHE_TTL = config('AUTH_TOKEN_CACHE_TTL', default=60, cast=int)
+# Also create a Django session on login (token clients do not need one)
+AUTH_LOGIN_CREATES_SESSION = config('AUTH_LOGIN_CREATES_SESSION', default=False, cast=bool)
 
 CORS_ALLOW_CREDENTIALS = True
 
@@ -102,10 +199,36 @@ CORS_ALLOW_METHODS = [
 # Pokemon TCG API
 POKEMON_API_KEY = config('POKEMON_API_KEY', default='')
 
+# Language whose catalog copy is used for set totals and card metadata
+CATALOG_DEFAULT_LANGUAGE = config('CATALOG_DEFAULT_LANGUAGE', default='en')
+
+# TCGdex proxy (catalog.tcgdex): upstream base URL, per-process LRU size,
+# how long expired entries are served while refreshing, and the pooled session
+TCGDEX_API_BASE = config('TCGDEX_API_BASE', default='https://api.tcgdex.net/v2')
+TCGDEX_LRU_SIZE = config('TCGDEX_LRU_SIZE', default=1024, cast=int)
+TCGDEX_STALE_SECONDS = config('TCGDEX_STALE_SECONDS', default=7 * 24 * 3600, cast=int)
+TCGDEX_TIMEOUT = config('TCGDEX_TIMEOUT', default=10, cast=float)
+TCGDEX_POOL_SIZE = config('TCGDEX_POOL_SIZE', default=10, cast=int)
+
+# Seconds between checks whether a catalog import invalidated the in-memory search index
+SEARCH_INDEX_CHECK_INTERVAL = config('SEARCH_INDEX_CHECK_INTERVAL', default=30, cast=int)
+
+# Collection valuation (see collection.valuation for the default multipliers)
+VALUATION_CURRENCY = config('VALUATION_CURRENCY', default='USD')
+
+# Default staleness window (seconds) for public shared-dashboard snapshots;
+# users can override it with User.shared_snapshot_max_age
+SHARED_SNAPSHOT_MAX_AGE = config('SHARED_SNAPSHOT_MAX_AGE', default=60, cast=int)
+
 # Stripe settings
 STRIPE_PUBLIC_KEY = config('STRIPE_PUBLIC_KEY', default='')
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='')
 STRIPE_WEBHOOK_SECRET = config('STRIPE_WEBHOOK_SECRET', default='')
+# Point at a local fake Stripe server (e.g. stripe-mock on http://localhost:12111) in development
+STRIPE_API_BASE = config('STRIPE_API_BASE', default='')
+
+# Hours an active subscription keeps access after current_period_end while the renewal webhook is pending
+SUBSCRIPTION_GRACE_HOURS = config('SUBSCRIPTION_GRACE_HOURS', default=24, cast=int)
 
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -118,6 +241,12 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # Media files (user uploaded content)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Cache lifetime (seconds) for media that is not content-addressed
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=60 * 60, cast=int)
+# '' serves media from Python; 'x-sendfile' (Apache/Passenger) or 'x-accel-redirect' (nginx)
+# hands the file to the web server. X-Accel-Redirect needs an internal location at the prefix.
+MEDIA_SENDFILE = config('MEDIA_SENDFILE', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
 
 # Ensure the media directory exists
 os.makedirs(MEDIA_ROOT, exist_ok=True)
@@ -1,20 +1,15 @@
-
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from tcg_backend.views import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
     path('api/', include('collection.urls')),
     path('api/', include('subscriptions.urls')),
+    path('api/', include('catalog.urls')),
 
+    # Media files: conditional GET, byte ranges and optional X-Sendfile/X-Accel-Redirect offload
+    re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
 ]
-
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
-# Serve media files in production
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,5 +1,122 @@
+import mimetypes
+import os
+import re
 
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_http_methods
+
+# Media under these prefixes named by a hash of its content (with an optional
+# _<size> suffix) can be cached forever; legacy uploads there keep their
+# original names and may be overwritten in place
+IMMUTABLE_MEDIA_PREFIXES = ('profile_pictures/', 'card_images/')
+CONTENT_HASH_NAME_RE = re.compile(r'^[0-9a-f]{20,64}(_[a-z0-9]+)?\.[a-z0-9]+$')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_CHUNK_SIZE = 64 * 1024
+
+def is_immutable_media(path):
+    return path.startswith(IMMUTABLE_MEDIA_PREFIXES) and bool(CONTENT_HASH_NAME_RE.match(path.rsplit('/', 1)[-1]))
 
 def frontend(request):
     return render(request, 'index.html') # Adjust path as needed
+
+def _byte_range(header, size):
+    """(start, end) inclusive for a single `bytes=` range, None to ignore it, or False if unsatisfiable"""
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with ETag/Last-Modified revalidation and
+    single byte ranges. With MEDIA_SENDFILE set, the web server sends the bytes
+    (X-Sendfile for Apache/Passenger, X-Accel-Redirect for nginx) and the worker
+    only answers the headers.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path') from None
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404('File not found') from None
+    if not os.path.isfile(full_path):
+        raise Http404('File not found')
+
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    last_modified = int(stat.st_mtime)
+    cache_control = (
+        'public, max-age=31536000, immutable' if is_immutable_media(path)
+        else f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    )
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        not_modified['Cache-Control'] = cache_control
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    if settings.MEDIA_SENDFILE:
+        response = HttpResponse(content_type=content_type)
+        if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        else:
+            response['X-Sendfile'] = full_path
+    else:
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if 'HTTP_RANGE' in request.META and (not if_range or if_range == etag):
+            byte_range = _byte_range(request.META['HTTP_RANGE'], stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(full_path, start, end - start + 1), status=206, content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            # FileResponse hands the open file to wsgi.file_wrapper (sendfile) when the server supports it
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+            response['Content-Length'] = stat.st_size
+        response['Accept-Ranges'] = 'bytes'
+
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+    return response
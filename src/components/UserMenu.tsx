@@ -32,13 +32,15 @@ const UserMenu = () => {
 
   // Get the full URL for the profile picture if it exists
   const getProfilePictureUrl = () => {
-    if (!user?.profile_picture) return undefined;
+    // The small thumbnail is enough for the avatar; fall back to the original
+    const picture = user?.profile_thumbnails?.small?.webp || user?.profile_picture;
+    if (!picture) return undefined;
     // Check if it's already a full URL
-    if (user.profile_picture.startsWith('http')) {
-      return user.profile_picture;
+    if (picture.startsWith('http')) {
+      return picture;
     }
     // Otherwise, prepend the base URL
-    return `https://api.collectorshomebase.com${user.profile_picture}`;
+    return `https://api.collectorshomebase.com${picture}`;
   };
 
   return (
@@ -86,11 +86,11 @@ const CardDetail = () => {
         <div className="space-y-4">
           <div className="bg-card rounded-lg shadow-sm p-6">
             <img
-              src={card.images.small}
+              src={card.images.large}
               alt={card.name}
               className="w-full max-w-md mx-auto rounded-lg shadow-lg"
               onError={(e) => {
-                // If small image fails, try direct TCGdx URL with proper format
+                // If the cached image fails, try direct TCGdx URL with proper format
                 const serieId = card.set.serie?.id || 'unknown';
                 const setId = card.set.id;
                 const localId = card.localId || card.number;
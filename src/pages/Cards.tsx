@@ -7,7 +7,7 @@ import { Badge } from '@/components/ui/badge';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Pagination, PaginationContent, PaginationEllipsis, PaginationItem, PaginationLink, PaginationNext, PaginationPrevious } from '@/components/ui/pagination';
 import { pokemonApi } from '@/services/api';
-import { PokemonCard } from '@/types/api';
+import { PokemonCard, SearchSuggestion } from '@/types/api';
 import { Search, Grid, List, Heart, Plus } from 'lucide-react';
 import { useAuth } from '@/contexts/AuthContext';
 import { useTranslation } from 'react-i18next';
@@ -32,6 +32,7 @@ const Cards = () => {
   const [showWishlistDialog, setShowWishlistDialog] = useState(false);
   const [selectedLanguage, setSelectedLanguage] = useState('en');
   const { isAuthenticated } = useAuth();
+  const [suggestions, setSuggestions] = useState<SearchSuggestion[]>([]);
 
   // Language options for the filter
   const languageOptions = [
@@ -77,6 +78,24 @@ const Cards = () => {
     fetchCards(searchQuery, page);
   }, [searchQuery, sortBy, page, selectedLanguage]);
 
+  useEffect(() => {
+    if (!searchQuery.trim()) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    pokemonApi.suggest(searchQuery, selectedLanguage)
+      .then((results) => {
+        if (!cancelled) {
+          setSuggestions(results.filter((suggestion) => suggestion.type === 'card'));
+        }
+      })
+      .catch(() => setSuggestions([]));
+    return () => {
+      cancelled = true;
+    };
+  }, [searchQuery, selectedLanguage]);
+
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault();
     setPage(1);
@@ -215,7 +234,14 @@ const Cards = () => {
                 value={searchQuery}
                 onChange={(e) => setSearchQuery(e.target.value)}
                 className="pl-10"
+                list="card-name-suggestions"
+                autoComplete="off"
               />
+              <datalist id="card-name-suggestions">
+                {suggestions.map((suggestion) => (
+                  <option key={suggestion.name} value={suggestion.name} />
+                ))}
+              </datalist>
               {searchQuery && (
                 <button
                   type="button"
@@ -69,13 +69,13 @@ const Dashboard = () => {
       }
 
       try {
-        const collectionResponse = await backendApi.getCollection(token, { limit: '4', ordering: '-added_date' });
+        const collectionResponse = await backendApi.getCollection(token, { limit: '4', ordering: '-added_date', expand: 'card', card_language: i18n.language });
         
         // Fetch card data for recent collection items
         const collectionArray = Array.isArray(collectionResponse.results) ? collectionResponse.results : [];
         const collectionWithCards = await Promise.all(
           collectionArray.slice(0, 4).map(async (item) => {
-            const cardData = await fetchCardData(item.card_id);
+            const cardData = item.card ? pokemonApi.fromCatalogCard(item.card) : await fetchCardData(item.card_id);
             return { ...item, cardData };
           })
         );
@@ -96,13 +96,13 @@ const Dashboard = () => {
       }
 
       try {
-        const wishlistResponse = await backendApi.getWishlist(token, { limit: '4', ordering: '-added_date' });
+        const wishlistResponse = await backendApi.getWishlist(token, { limit: '4', ordering: '-added_date', expand: 'card', card_language: i18n.language });
         
         // Fetch card data for recent wishlist items
         const wishlistArray = Array.isArray(wishlistResponse.results) ? wishlistResponse.results : [];
         const wishlistWithCards = await Promise.all(
           wishlistArray.slice(0, 4).map(async (item) => {
-            const cardData = await fetchCardData(item.card_id);
+            const cardData = item.card ? pokemonApi.fromCatalogCard(item.card) : await fetchCardData(item.card_id);
             return { ...item, cardData };
           })
         );
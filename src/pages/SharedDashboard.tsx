@@ -49,8 +49,8 @@ const SharedDashboard = () => {
         setLoading(true);
         
         const [collectionResponse, wishlistResponse, analyticsResponse] = await Promise.all([
-          backendApi.getSharedCollection(userId, { limit: '4', ordering: '-added_date' }),
-          backendApi.getSharedWishlist(userId, { limit: '4', ordering: '-added_date' }),
+          backendApi.getSharedCollection(userId, { limit: '4', ordering: '-added_date', expand: 'card' }),
+          backendApi.getSharedWishlist(userId, { limit: '4', ordering: '-added_date', expand: 'card' }),
           backendApi.getSharedDashboardAnalytics(userId)
         ]);
 
@@ -63,7 +63,7 @@ const SharedDashboard = () => {
         const collectionWithCards = await Promise.all(
           collectionItems.slice(0, 4).map(async (item) => {
             try {
-              const cardData = await fetchCardData(item.card_id);
+              const cardData = item.card ? pokemonApi.fromCatalogCard(item.card) : await fetchCardData(item.card_id);
               return { ...item, cardData };
             } catch (error) {
               console.error(`Error fetching card data for ${item.card_id}:`, error);
@@ -81,7 +81,7 @@ const SharedDashboard = () => {
         const wishlistWithCards = await Promise.all(
           wishlistItems.slice(0, 4).map(async (item) => {
             try {
-              const cardData = await fetchCardData(item.card_id);
+              const cardData = item.card ? pokemonApi.fromCatalogCard(item.card) : await fetchCardData(item.card_id);
               return { ...item, cardData };
             } catch (error) {
               console.error(`Error fetching card data for ${item.card_id}:`, error);
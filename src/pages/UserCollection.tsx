@@ -4,9 +4,10 @@ import { useAuth } from '@/contexts/AuthContext';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Pagination, PaginationContent, PaginationItem, PaginationLink, PaginationNext, PaginationPrevious } from '@/components/ui/pagination';
 import { backendApi, pokemonApi } from '@/services/api';
-import { Collection, PokemonCard } from '@/types/api';
+import { Collection, CollectionFacets, PokemonCard } from '@/types/api';
 import { ArrowLeft, BarChart3, Trash2 } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
@@ -16,8 +17,12 @@ interface PaginatedResponse {
   next: string | null;
   previous: string | null;
   results: Collection[];
+  facets: CollectionFacets;
 }
 
+const FILTER_FACETS = ['condition', 'variant', 'language', 'graded'] as const;
+type FilterFacet = typeof FILTER_FACETS[number];
+
 interface CollectionWithCard extends Collection {
   cardData?: PokemonCard;
 }
@@ -31,6 +36,8 @@ const UserCollection = () => {
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
   const [totalCount, setTotalCount] = useState(0);
+  const [filters, setFilters] = useState<Partial<Record<FilterFacet, string>>>({});
+  const [facets, setFacets] = useState<CollectionFacets | null>(null);
 
   const fetchCardData = async (cardId: string): Promise<PokemonCard | null> => {
     try {
@@ -49,19 +56,23 @@ const UserCollection = () => {
       setLoading(true);
       const params: Record<string, string> = {
         page: page.toString(),
+        expand: 'card',
+        ...filters,
       };
 
-      const response: PaginatedResponse = await backendApi.getUserCollectionCards(token, params);
+      // Filtering and facet counts happen server-side, so large collections are never pulled whole
+      const response: PaginatedResponse = await backendApi.filterCollection(token, params);
       
       // Fetch card data for each collection item
       const collectionWithCards = await Promise.all(
         response.results.map(async (item) => {
-          const cardData = await fetchCardData(item.card_id);
+          const cardData = item.card ? pokemonApi.fromCatalogCard(item.card) : await fetchCardData(item.card_id);
           return { ...item, cardData };
         })
       );
 
       setCollection(collectionWithCards);
+      setFacets(response.facets);
       setTotalCount(response.count);
       setTotalPages(Math.ceil(response.count / 20)); // 20 items per page
     } catch (error) {
@@ -74,7 +85,20 @@ const UserCollection = () => {
 
   useEffect(() => {
     fetchCollection(currentPage);
-  }, [token, currentPage]);
+  }, [token, currentPage, filters]);
+
+  const handleFilterChange = (facet: FilterFacet, value: string) => {
+    setFilters(prev => {
+      const next = { ...prev };
+      if (value === 'all') {
+        delete next[facet];
+      } else {
+        next[facet] = value;
+      }
+      return next;
+    });
+    setCurrentPage(1);
+  };
 
   const handlePageChange = (page: number) => {
     setCurrentPage(page);
@@ -127,6 +151,35 @@ const UserCollection = () => {
         </p>
       </div>
 
+      {/* Filters with facet counts */}
+      {facets && (
+        <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
+          {FILTER_FACETS.map((facet) => (
+            <Select
+              key={facet}
+              value={filters[facet] ?? 'all'}
+              onValueChange={(value) => handleFilterChange(facet, value)}
+            >
+              <SelectTrigger>
+                <SelectValue placeholder={t(`collection.${facet}`)} />
+              </SelectTrigger>
+              <SelectContent>
+                <SelectItem value="all">
+                  {t(`collection.${facet}`)}: {t('common.all', { defaultValue: 'All' })}
+                </SelectItem>
+                {facets[facet].map(({ value, count }) => (
+                  <SelectItem key={String(value)} value={String(value)}>
+                    {facet === 'graded'
+                      ? (value ? t('common.yes', { defaultValue: 'Yes' }) : t('common.no', { defaultValue: 'No' }))
+                      : String(value).replace(/_/g, ' ')} ({count})
+                  </SelectItem>
+                ))}
+              </SelectContent>
+            </Select>
+          ))}
+        </div>
+      )}
+
       {/* Collection Cards */}
       <Card className="mb-8">
         <CardHeader>
@@ -49,6 +49,7 @@ const UserWishlist = () => {
       setLoading(true);
       const params: Record<string, string> = {
         page: page.toString(),
+        expand: 'card',
       };
 
       const response: PaginatedResponse = await backendApi.getUserWishlistCards(token, params);
@@ -56,7 +57,7 @@ const UserWishlist = () => {
       // Fetch card data for each wishlist item
       const wishlistWithCards = await Promise.all(
         response.results.map(async (item) => {
-          const cardData = await fetchCardData(item.card_id);
+          const cardData = item.card ? pokemonApi.fromCatalogCard(item.card) : await fetchCardData(item.card_id);
           return { ...item, cardData };
         })
       );
@@ -1,6 +1,8 @@
 // API service functions
+import { SearchSuggestion } from '@/types/api';
+
 const API_BASE_URL = 'http://localhost:8000/api';
-const TCGDEX_API_BASE = 'https://api.tcgdex.net/v2'; // Base URL without language, will be appended
+const TCGDEX_API_BASE = `${API_BASE_URL}/tcg`; // Backend TCGdex cache; language is appended per request
 
 // Language mapping for TCGdex API
 const getLanguageCode = (lang: string): string => {
@@ -12,6 +14,10 @@ const getLanguageCode = (lang: string): string => {
   }
 };
 
+// Card artwork resized and cached by the backend (small: 200px, medium: 400px, large: 600px wide)
+export const cardImageUrl = (cardId: string, langCode = 'en', size: 'small' | 'medium' | 'large' = 'small'): string =>
+  `${API_BASE_URL}/catalog/images/${langCode}/${encodeURIComponent(cardId)}/${size}/`;
+
 // TCGdex API calls (replacing Pokemon TCG API)
 export const pokemonApi = {
   // Helper to transform TCGdex card to match our existing structure
@@ -58,8 +64,10 @@ export const pokemonApi = {
       legalities: card.legal || {},
       nationalPokedexNumbers: card.dexId || [],
       images: {
-        small: card.image ? `${card.image}/high.png` : `https://assets.tcgdex.net/${langCode || 'en'}/${setData?.serie?.id || 'unknown'}/${setData?.id || 'unknown'}/${card.localId || card.id}/high.png`,
-        large: card.image ? `${card.image}/high.png` : `https://assets.tcgdex.net/${langCode || 'en'}/${setData?.serie?.id || 'unknown'}/${setData?.id || 'unknown'}/${card.localId || card.id}/high.png`,
+        // Resized WebP copies cached by the backend
+        small: cardImageUrl(card.id, langCode || card.language, 'small'),
+        medium: cardImageUrl(card.id, langCode || card.language, 'medium'),
+        large: cardImageUrl(card.id, langCode || card.language, 'large'),
       },
       illustrator: card.illustrator,
       regulationMark: card.regulationMark,
@@ -100,6 +108,44 @@ export const pokemonApi = {
     };
   },
 
+  // Search the backend's local catalog mirror; returns null when the catalog has no match
+  async getCatalogCards(params: Record<string, string>, language?: string) {
+    const page = parseInt(params.page || '1');
+    const pageSize = parseInt(params.pageSize || '30');
+    const langCode = language ? getLanguageCode(language) : 'en';
+    const searchParams = new URLSearchParams({
+      language: language || 'en',
+      page: String(page),
+      page_size: String(pageSize),
+    });
+    if (params.q && params.q.includes('set.id:')) {
+      searchParams.set('set', params.q.replace('set.id:', '').trim());
+    } else if (params.q && params.q.includes('name:')) {
+      searchParams.set('name', params.q.replace('name:', '').replace('*', '').trim());
+    }
+    if (params.orderBy) {
+      searchParams.set('ordering', params.orderBy);
+    }
+
+    const response = await fetch(`${API_BASE_URL}/catalog/cards/?${searchParams.toString()}`);
+    if (!response.ok) {
+      return null;
+    }
+    const result = await response.json();
+    if (!result.count) {
+      return null;
+    }
+
+    return {
+      data: result.results.map((card: any) =>
+        this.transformCard(card, card.set ? this.transformSet(card.set) : undefined, langCode)
+      ),
+      totalCount: result.count,
+      page,
+      pageSize,
+    };
+  },
+
   async getCards(params: Record<string, string> = {}, language?: string) {
     try {
       const page = parseInt(params.page || '1');
@@ -107,6 +153,16 @@ export const pokemonApi = {
       const langCode = language ? getLanguageCode(language) : 'en';
       const apiBase = `${TCGDEX_API_BASE}/${langCode}`;
 
+      // Prefer the indexed backend catalog; fall back to TCGdex when it hasn't been imported
+      try {
+        const catalogResult = await this.getCatalogCards(params, language);
+        if (catalogResult) {
+          return catalogResult;
+        }
+      } catch (error) {
+        console.warn('Catalog search unavailable, falling back to TCGdex:', error);
+      }
+
       // TCGdex doesn't support pagination parameters, so we fetch all cards and paginate client-side
 
       // If searching by set.id
@@ -245,6 +301,44 @@ export const pokemonApi = {
     }
   },
 
+  // Ranked card/set name completions from the backend search index (typo tolerant)
+  async suggest(query: string, language?: string, limit = 8): Promise<SearchSuggestion[]> {
+    const searchParams = new URLSearchParams({
+      q: query,
+      language: language || 'en',
+      limit: String(limit),
+    });
+    const response = await fetch(`${API_BASE_URL}/search/suggest/?${searchParams.toString()}`);
+    if (!response.ok) {
+      return [];
+    }
+    const result = await response.json();
+    return result.results;
+  },
+
+  // Card embedded by the backend (?expand=card) or returned by the batch endpoint
+  fromCatalogCard(card: any): any {
+    return this.transformCard(card, card.set ? this.transformSet(card.set) : undefined, card.language);
+  },
+
+  async getCardsBatch(ids: string[], language?: string) {
+    const searchParams = new URLSearchParams({ ids: ids.join(',') });
+    if (language) {
+      // The local catalog stores i18n codes ('zh'); 'zh-tw' is only TCGdex's name
+      searchParams.set('language', language);
+    }
+    const response = await fetch(`${API_BASE_URL}/catalog/cards/batch/?${searchParams.toString()}`);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch cards: ${response.statusText}`);
+    }
+    const result = await response.json();
+    const cards: Record<string, any> = {};
+    Object.entries(result.results).forEach(([id, card]) => {
+      cards[id] = this.fromCatalogCard(card);
+    });
+    return { data: cards, missing: result.missing as string[] };
+  },
+
   async getCard(id: string, language?: string) {
     try {
       const langCode = language ? getLanguageCode(language) : 'en';
@@ -363,6 +457,29 @@ export const backendApi = {
     return response.json();
   },
 
+  // Bulk upsert from a CSV (with header row) or NDJSON file
+  async importCollection(token: string, file: File) {
+    const isCsv = file.name.toLowerCase().endsWith('.csv') || file.type === 'text/csv';
+    const response = await fetch(`${API_BASE_URL}/collection/bulk/`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': isCsv ? 'text/csv' : 'application/x-ndjson',
+        'Authorization': `Token ${token}`,
+      },
+      body: file,
+    });
+    return response.json();
+  },
+
+  async exportCollection(token: string, format: 'csv' | 'ndjson' = 'csv') {
+    const response = await fetch(`${API_BASE_URL}/collection/export/${format}/`, {
+      headers: {
+        'Authorization': `Token ${token}`,
+      },
+    });
+    return response.blob();
+  },
+
   async getCollection(token: string, params: Record<string, string> = {}) {
     const searchParams = new URLSearchParams(params);
     const url = `${API_BASE_URL}/collection/${searchParams.toString() ? '?' + searchParams.toString() : ''}`;
@@ -493,6 +610,38 @@ export const backendApi = {
     return response.ok;
   },
 
+  // Apply many collection/wishlist/note changes in one request and one transaction
+  async batchMutate(token: string, operations: Array<{
+    op: 'create' | 'update' | 'delete';
+    type: 'collection' | 'wishlist' | 'note';
+    id?: number;
+    data?: Record<string, any>;
+  }>) {
+    const response = await fetch(`${API_BASE_URL}/batch/`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Token ${token}`,
+      },
+      body: JSON.stringify({ operations }),
+    });
+    return response.json();
+  },
+
+  // Filtered/sorted collection page with facet counts (condition, variant, language, graded, set, ...)
+  async filterCollection(token: string, params: Record<string, string> = {}) {
+    const searchParams = new URLSearchParams(params);
+    const response = await fetch(`${API_BASE_URL}/collection/filter/?${searchParams.toString()}`, {
+      headers: {
+        'Authorization': `Token ${token}`,
+      },
+    });
+    if (!response.ok) {
+      throw new Error(`Failed to filter collection: ${response.statusText}`);
+    }
+    return response.json();
+  },
+
   async getCollectionStats(token: string) {
     const response = await fetch(`${API_BASE_URL}/collection/stats/`, {
       headers: {
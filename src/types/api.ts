@@ -58,6 +58,7 @@ export interface PokemonCard {
   legalities: Legalities;
   images: {
     small: string;
+    medium?: string;
     large: string;
   };
   tcgplayer?: {
@@ -140,8 +141,12 @@ export interface User {
   last_name: string;
   date_joined: string;
   profile_picture?: string | null;
+  profile_thumbnails?: ProfileThumbnails;
 }
 
+// Processed profile picture thumbnails: size -> format -> URL
+export type ProfileThumbnails = Record<'small' | 'medium', { webp: string; jpeg: string }>;
+
 export interface Collection {
   id: number;
   user: number;
@@ -154,6 +159,7 @@ export interface Collection {
   notes: string;
   added_date: string;
   updated_date: string;
+  card?: any | null;
 }
 
 export interface Wishlist {
@@ -163,6 +169,7 @@ export interface Wishlist {
   priority: string;
   added_date: string;
   notes: string;
+  card?: any | null;
 }
 
 export interface CardNote {
@@ -192,6 +199,7 @@ export interface DashboardAnalytics {
   cards_remaining: number;
   plan_name: string;
   user_name?: string; // Added for shared dashboard functionality
+  profile_thumbnails?: ProfileThumbnails;
   sets_completed: {
     any_variant: number;
     regular_variants: number;
@@ -250,3 +258,24 @@ export interface RegisterRequest {
   email: string;
   password: string;
 }
+
+export interface SearchSuggestion {
+  type: 'card' | 'set';
+  name: string;
+  id: string | null;
+  count: number;
+  match: 'prefix' | 'fuzzy';
+}
+
+export interface FacetCount {
+  value: string | boolean;
+  count: number;
+}
+
+export interface CollectionFacets {
+  condition: FacetCount[];
+  variant: FacetCount[];
+  language: FacetCount[];
+  graded: FacetCount[];
+  set: FacetCount[];
+}